@@ -1,30 +1,44 @@
-import json
 import os
 from typing import Dict, Any
 
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from utils import json_fast
+
 # This is a placeholder for proper implementation
 # In a real implementation, you would:
 # 1. Get the task from the queue
 # 2. Process it using the agent system
 # 3. Update the task status
 
+class ProcessTaskRequest(BaseModel):
+    """Body of a process task request."""
+    
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
+    task_id: str = Field(min_length=1)
+
+# 400 response bodies, serialized once at import
+_INVALID_JSON_BODY = json_fast.dumps({"error": "Invalid JSON"})
+_MISSING_TASK_ID_BODY = json_fast.dumps({"error": "Missing task_id"})
+
+def _bad_request(error: ValidationError) -> Dict[str, Any]:
+    """Build the 400 response for a request body that failed validation."""
+    if any(err["type"] == "json_invalid" for err in error.errors()):
+        body = _INVALID_JSON_BODY
+    else:
+        body = _MISSING_TASK_ID_BODY
+    return {
+        "statusCode": 400,
+        "body": body
+    }
+
 def handler(request):
-    # Parse the request body
+    # Parse and validate the request body in one pass
     try:
-        body = json.loads(request.body)
-    except json.JSONDecodeError:
-        return {
-            "statusCode": 400,
-            "body": json.dumps({"error": "Invalid JSON"})
-        }
-    
-    # Get the task ID
-    task_id = body.get("task_id")
-    if not task_id:
-        return {
-            "statusCode": 400,
-            "body": json.dumps({"error": "Missing task_id"})
-        }
+        task_id = ProcessTaskRequest.model_validate_json(request.body).task_id
+    except ValidationError as e:
+        return _bad_request(e)
     
     # Process the task
     result = process_task(task_id)
@@ -32,11 +46,11 @@ def handler(request):
     # Return the result
     return {
         "statusCode": 200,
-        "body": json.dumps({
+        "body": json_fast.dumps({
             "status": "completed",
             "task_id": task_id,
             "result": result
-        })
+        }, default=str)
     }
 
 def process_task(task_id: str) -> Dict[str, Any]:
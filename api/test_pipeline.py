@@ -1,34 +1,50 @@
-import json
-import os
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from context.workspace.workspace_context import WorkspaceContext, WorkflowType
-from shortcut_agents.triage.triage_agent import process_webhook
+from api.webhook.handler import get_api_key
+from shortcut_agents.triage.triage_agent import triage_by_workflow
 from tools.shortcut.shortcut_tools import get_story_details
+from utils import json_fast
+from utils.logging.logger import init_logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging once at the entry point; no-op if handlers already exist
+init_logging()
 logger = logging.getLogger("test_pipeline")
 
-def get_api_key(workspace_id: str) -> str:
-    """
-    Get the API key for a specific workspace.
-    """
-    # Look for workspace-specific API key in environment variables
-    env_var_name = f"SHORTCUT_API_KEY_{workspace_id.upper()}"
-    api_key = os.environ.get(env_var_name)
+_REQUIRED_PARAMS = ["workspace_id", "story_id", "workflow_type"]
+_WORKFLOW_TYPES = ["enhance", "analyse"]
+
+# 400 response bodies, serialized once at import
+_INVALID_JSON_BODY = json_fast.dumps({"error": "Invalid JSON"})
+_INVALID_WORKFLOW_TYPE_BODY = json_fast.dumps({"error": "Invalid workflow_type", "valid_values": _WORKFLOW_TYPES})
+_MISSING_PARAMS_BODY = json_fast.dumps({"error": "Missing required parameters", "required": _REQUIRED_PARAMS})
+
+class PipelineTestRequest(BaseModel):
+    """Body of a test pipeline request."""
     
-    if not api_key:
-        # Fall back to generic API key
-        api_key = os.environ.get("SHORTCUT_API_KEY")
-        
-    if not api_key:
-        logger.error(f"No API key found for workspace: {workspace_id}")
-        raise ValueError(f"No API key found for workspace: {workspace_id}")
-        
-    return api_key
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
+    workspace_id: str = Field(min_length=1)
+    story_id: str = Field(min_length=1)
+    workflow_type: Literal["enhance", "analyse"]
+
+def _bad_request(error: ValidationError) -> Dict[str, Any]:
+    """Build the 400 response for a request body that failed validation."""
+    error_types = {err["type"] for err in error.errors()}
+    if "json_invalid" in error_types:
+        body = _INVALID_JSON_BODY
+    elif error_types == {"literal_error"}:
+        body = _INVALID_WORKFLOW_TYPE_BODY
+    else:
+        body = _MISSING_PARAMS_BODY
+    return {
+        "statusCode": 400,
+        "body": body
+    }
 
 async def handler(request):
     """
@@ -37,38 +53,12 @@ async def handler(request):
     This allows testing the full pipeline without a real webhook.
     It simulates a webhook event for the given parameters.
     """
-    # Parse the request body
+    # Parse and validate the request body in one pass
     try:
-        body = json.loads(request.body)
-    except json.JSONDecodeError:
-        return {
-            "statusCode": 400,
-            "body": json.dumps({"error": "Invalid JSON"})
-        }
-    
-    # Get the required parameters
-    workspace_id = body.get("workspace_id")
-    story_id = body.get("story_id")
-    workflow_type = body.get("workflow_type")
-    
-    if not workspace_id or not story_id or not workflow_type:
-        return {
-            "statusCode": 400,
-            "body": json.dumps({
-                "error": "Missing required parameters",
-                "required": ["workspace_id", "story_id", "workflow_type"]
-            })
-        }
-    
-    # Validate workflow type
-    if workflow_type not in ["enhance", "analyse"]:
-        return {
-            "statusCode": 400,
-            "body": json.dumps({
-                "error": "Invalid workflow_type",
-                "valid_values": ["enhance", "analyse"]
-            })
-        }
+        params = PipelineTestRequest.model_validate_json(request.body)
+    except ValidationError as e:
+        return _bad_request(e)
+    workspace_id, story_id, workflow_type = params.workspace_id, params.story_id, params.workflow_type
     
     # Run the test pipeline
     try:
@@ -77,16 +67,16 @@ async def handler(request):
         # Return the result
         return {
             "statusCode": 200,
-            "body": json.dumps({
+            "body": json_fast.dumps({
                 "status": "completed",
                 "result": result
-            })
+            }, default=str)
         }
     except Exception as e:
         logger.exception(f"Error running test pipeline: {str(e)}")
         return {
             "statusCode": 500,
-            "body": json.dumps({
+            "body": json_fast.dumps({
                 "status": "error",
                 "error": str(e)
             })
@@ -96,9 +86,10 @@ async def run_test_pipeline(workspace_id: str, story_id: str, workflow_type: str
     """
     Run a test pipeline for the given parameters.
     
-    This simulates a webhook event for a story with the specified workflow type.
+    This queues the specified workflow for the story, as the triage agent
+    would after a webhook adding the matching label.
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     logger.info(f"Running test pipeline for {workflow_type} on story {story_id}")
     
     try:
@@ -116,25 +107,14 @@ async def run_test_pipeline(workspace_id: str, story_id: str, workflow_type: str
         story_data = await get_story_details(story_id, api_key)
         context.set_story_data(story_data)
         
-        # Create a simulated webhook payload
-        # This simulates a label being added to the story
-        webhook_payload = {
-            "action": "update",
-            "id": int(story_id),
-            "changes": {
-                "labels": {
-                    "adds": [{"name": workflow_type}]
-                }
-            },
-            "primary_id": int(story_id),
-            "references": []
+        # The workflow is already known, so queue it directly instead of triaging a simulated webhook
+        result = {
+            "result": await triage_by_workflow(workflow_type, context),
+            "trace_id": f"Triage-{workspace_id}-{story_id}"
         }
         
-        # Process the webhook with the triage agent
-        result = await process_webhook(webhook_payload, context)
-        
         # Calculate processing time
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_ns) / 1_000_000_000
         logger.info(f"Test pipeline completed in {processing_time:.2f} seconds")
         
         return {
@@ -2,6 +2,6 @@
 Webhook handlers for the Shortcut Enhancement System.
 """
 
-from api.webhook.handler import handle_webhook
+from api.webhook.handler import enqueue_webhook, handle_webhook
 
-__all__ = ["handle_webhook"]
\ No newline at end of file
+__all__ = ["enqueue_webhook", "handle_webhook"]
\ No newline at end of file
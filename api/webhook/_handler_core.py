@@ -0,0 +1,175 @@
+"""
+Request handling shared by the webhook endpoints.
+
+Route modules stay thin wrappers around webhook_handler, so endpoint
+variants are selected by its options instead of by copying handlers.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+from api.webhook.handler import enqueue_webhook, handle_webhook, stream_validate, validate_webhook, verify_signature
+from utils import json_fast
+
+logger = logging.getLogger("webhook.endpoint")
+
+# Recent validation decisions keyed on (workspace ID, body hash), so retried
+# deliveries of a rejected webhook are skipped without parsing it again
+VALIDATION_CACHE_SIZE = 4096
+_VALIDATION_CACHE: "OrderedDict[Tuple[str, bytes], bool]" = OrderedDict()
+
+def _remember_validation(key: Tuple[str, bytes], is_valid: bool) -> None:
+    """Store a validation decision, evicting the least recently used one when full."""
+    _VALIDATION_CACHE[key] = is_valid
+    if len(_VALIDATION_CACHE) > VALIDATION_CACHE_SIZE:
+        _VALIDATION_CACHE.popitem(last=False)
+
+# Fixed responses, serialized once at import rather than on every request
+_UNAUTHORIZED_RESPONSE = {
+    "statusCode": 401,
+    "body": json_fast.dumps({"error": "Invalid signature"})
+}
+_SKIPPED_RESPONSE = {
+    "statusCode": 202,
+    "body": json_fast.dumps({"status": "skipped"})
+}
+_DEDUPED_RESPONSE = {
+    "statusCode": 202,
+    "body": json_fast.dumps({"status": "deduped"})
+}
+_INVALID_JSON_RESPONSE = {
+    "statusCode": 400,
+    "body": json_fast.dumps({"error": "Invalid JSON"})
+}
+_NOT_AN_OBJECT_RESPONSE = {
+    "statusCode": 400,
+    "body": json_fast.dumps({"error": "Webhook payload must be a JSON object"})
+}
+
+def _may_be_label_update(body: bytes) -> bool:
+    """
+    Check the raw body for the keys validate_webhook requires, without parsing it.
+    
+    Every webhook that passes validate_webhook contains an "action" key, an
+    "update" value and a "labels" or "label_ids" key, so a body missing any
+    of them can be skipped. Passing this check says nothing on its own.
+    
+    Args:
+        body: The raw request body as bytes
+        
+    Returns:
+        False if the webhook can be skipped without parsing
+    """
+    return b'"action"' in body and b'"update"' in body and (b'"labels"' in body or b'"label_ids"' in body)
+
+async def webhook_handler(request, *, enqueue: bool = True) -> Dict[str, Any]:
+    """
+    Handle a Shortcut webhook request.
+    
+    Args:
+        request: The serverless function request object
+        enqueue: Queue the webhook for the background worker and acknowledge
+            with 202; when False, or if the queue is unavailable, the webhook
+            is handled before responding
+        
+    Returns:
+        Response object for the serverless function
+    """
+    # Get the workspace ID from the path parameters
+    workspace_id = request.path.split('/')[-1]
+    
+    # Work on the raw bytes throughout; encode only if the runtime already decoded the body
+    raw_body = request.body
+    if isinstance(raw_body, str):
+        raw_body = raw_body.encode("utf-8")
+    elif isinstance(raw_body, memoryview):
+        raw_body = raw_body.tobytes()
+    
+    # Reject unsigned or forged requests before doing any JSON work
+    if not verify_signature(workspace_id, raw_body, request.headers.get('payload-signature')):
+        logger.warning("Rejecting webhook with invalid signature for workspace %s", workspace_id)
+        return dict(_UNAUTHORIZED_RESPONSE)
+    
+    # Most webhooks are not label updates; drop those before paying for a full parse
+    if not _may_be_label_update(raw_body):
+        logger.debug("Skipping webhook without label update markers for workspace %s", workspace_id)
+        return dict(_SKIPPED_RESPONSE)
+    
+    # Retries of a body already seen reuse its validation decision
+    cache_key = (workspace_id, hashlib.blake2b(raw_body, digest_size=8).digest())
+    cached_valid = _VALIDATION_CACHE.get(cache_key)
+    if cached_valid is False:
+        _VALIDATION_CACHE.move_to_end(cache_key)
+        return dict(_SKIPPED_RESPONSE)
+    
+    # Parse the request body; large bodies that cannot pass validation are rejected while streaming
+    try:
+        body = stream_validate(raw_body)
+    except json_fast.JSONDecodeError:
+        return dict(_INVALID_JSON_RESPONSE)
+    
+    if body is None:
+        _remember_validation(cache_key, False)
+        return dict(_SKIPPED_RESPONSE)
+    
+    if not isinstance(body, dict):
+        return dict(_NOT_AN_OBJECT_RESPONSE)
+    
+    if cached_valid is None:
+        cached_valid = validate_webhook(body, workspace_id)
+        _remember_validation(cache_key, cached_valid)
+    else:
+        _VALIDATION_CACHE.move_to_end(cache_key)
+    if not cached_valid:
+        return dict(_SKIPPED_RESPONSE)
+    
+    # Get request path and client IP for logging
+    request_path = request.path
+    client_ip = request.headers.get('x-forwarded-for') or request.headers.get('x-real-ip') or '127.0.0.1'
+    
+    if not enqueue:
+        return await _handle_now(workspace_id, body, request_path, client_ip)
+    
+    # Queue the webhook for the background worker and acknowledge immediately
+    try:
+        task_id = await enqueue_webhook(
+            workspace_id=workspace_id,
+            webhook_data=body,
+            request_path=request_path,
+            client_ip=client_ip
+        )
+    except Exception as e:
+        # Queue unavailable: process inline rather than dropping the webhook
+        logger.warning("Could not queue webhook, processing inline: %s", e)
+        return await _handle_now(workspace_id, body, request_path, client_ip)
+    
+    if task_id is None:
+        return dict(_DEDUPED_RESPONSE)
+    
+    return {
+        "statusCode": 202,
+        "body": json_fast.dumps({
+            "status": "accepted",
+            "task_id": task_id
+        })
+    }
+
+async def _handle_now(workspace_id: str, body: Dict[str, Any], request_path: str, client_ip: str) -> Dict[str, Any]:
+    """Handle a webhook before responding and return its 200 response."""
+    # Always triage inline: this path runs when the queue is unavailable or not wanted
+    result = await handle_webhook(
+        workspace_id=workspace_id,
+        webhook_data=body,
+        request_path=request_path,
+        client_ip=client_ip,
+        process_inline=True
+    )
+    return {
+        "statusCode": 200,
+        "body": json_fast.dumps({
+            "status": "accepted",
+            "result": result
+        }, default=str)
+    }
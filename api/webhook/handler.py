@@ -3,59 +3,135 @@ Webhook handler for Shortcut events.
 Processes incoming webhooks and routes them appropriately.
 """
 
+import io
 import os
-import json
 import time
-import uuid
-from typing import Dict, Any, Optional
+import hmac
+import hashlib
+import functools
+from typing import Dict, Any, Optional, Union
 
 from agents import trace as agent_trace
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
 from context.workspace.workspace_context import WorkspaceContext
+from shortcut_agents.base_agent import reload_openai_key_state
 from shortcut_agents.triage.triage_agent import process_webhook
 from utils.logging.logger import get_logger, trace_context
-from utils.logging.webhook import (
-    log_webhook_receipt,
-    log_webhook_validation,
-    log_webhook_processing_start,
-    log_webhook_processing_complete,
-    log_webhook_processing_error,
-    extract_story_id,
-    log_triage_decision
-)
+from utils.logging.webhook import begin_webhook_trace, extract_story_id
 from utils.queue.task_queue import task_queue, Task, TaskType, TaskPriority
 from utils.storage.local_storage import save_trace_info, get_trace_info
+from utils.circuit import CircuitBreaker, is_downstream_failure
+from utils.trace_id import new_trace_id
+from utils import json_fast
 
 # Create component logger
 logger = get_logger("webhook.handler")
 
+def _read_use_background() -> bool:
+    """Read the USE_BACKGROUND_PROCESSING setting (defaults to true)."""
+    return os.environ.get("USE_BACKGROUND_PROCESSING", "true").lower() in ("true", "1", "yes")
+
+# Queue triage for the background worker instead of running it inline; read once at import
+USE_BACKGROUND = _read_use_background()
+
+def reload_config() -> None:
+    """Re-read settings cached from the environment, e.g. after rotating API keys or in tests."""
+    global USE_BACKGROUND
+    USE_BACKGROUND = _read_use_background()
+    _get_api_key_cached.cache_clear()
+    reload_openai_key_state()
+
+# Fails inline triage fast while the LLM or Shortcut API keeps erroring
+_triage_breaker = CircuitBreaker("triage", failure_threshold=5, recovery_seconds=30)
+
+# Bodies at least this large are checked by streaming before a full parse
+STREAM_VALIDATE_MIN_BYTES = 64 * 1024
+
+# ijson prefixes of the values and keys validate_webhook looks at
+_ACTION_PREFIXES = frozenset(("action", "actions.item.action"))
+_CHANGES_PREFIXES = frozenset(("changes", "actions.item.changes"))
+_LABEL_CHANGE_KEYS = frozenset(("labels", "label_ids"))
+
+# How long an identical webhook for the same story is treated as a duplicate (milliseconds)
+WEBHOOK_DEDUP_TTL_MS = 5000
+
 def get_api_key(workspace_id: str) -> str:
     """
     Get the API key for a specific workspace.
     
+    Keys are read from the environment once per workspace ID and cached for
+    the life of the process. After rotating a key in a running process,
+    call reload_config() so the new key is picked up.
+    
     Args:
         workspace_id: The ID of the workspace
         
     Returns:
         The API key for the workspace
     """
-    # Normalize workspace ID to lowercase
-    workspace_id = workspace_id.lower()
+    return _get_api_key_cached(workspace_id)
+
+@functools.lru_cache(maxsize=128)
+def _get_api_key_cached(workspace_id: str) -> str:
+    """
+    Resolve a workspace's API key from the environment, once per workspace ID.
     
+    Failed lookups raise and are not cached. reload_config() clears the cache
+    after the environment changes, e.g. when keys rotate or in tests.
+    """
     # Look for workspace-specific API key in environment variables
-    env_var_name = f"SHORTCUT_API_KEY_{workspace_id.upper()}"
-    api_key = os.environ.get(env_var_name)
+    api_key = os.environ.get(f"SHORTCUT_API_KEY_{workspace_id.upper()}")
     
     if not api_key:
         # Fall back to generic API key
         api_key = os.environ.get("SHORTCUT_API_KEY")
         
     if not api_key:
+        # Normalize workspace ID to lowercase for the error
+        workspace_id = workspace_id.lower()
         logger.error(f"No API key found for workspace: {workspace_id}")
         raise ValueError(f"No API key found for workspace: {workspace_id}")
         
     return api_key
 
+@functools.lru_cache(maxsize=256)
+def _webhook_secret_env_var(workspace_id: str) -> str:
+    """Get the name of a workspace's webhook secret environment variable, built once per workspace ID."""
+    return f"SHORTCUT_WEBHOOK_SECRET_{workspace_id.upper()}"
+
+def verify_signature(workspace_id: str, body: Union[str, bytes], signature: Optional[str]) -> bool:
+    """
+    Verify the HMAC-SHA256 signature Shortcut sends with a webhook.
+    
+    Verification is skipped when no webhook secret is configured for the
+    workspace (SHORTCUT_WEBHOOK_SECRET_<WORKSPACE>, falling back to
+    SHORTCUT_WEBHOOK_SECRET), so unsigned setups keep working.
+    
+    Args:
+        workspace_id: The workspace ID from the URL
+        body: The raw request body
+        signature: Hex digest from the Payload-Signature header, if any
+        
+    Returns:
+        True if the signature matches or no secret is configured, False otherwise
+    """
+    secret = os.environ.get(_webhook_secret_env_var(workspace_id)) or os.environ.get("SHORTCUT_WEBHOOK_SECRET")
+    if not secret:
+        return True
+    if not signature:
+        return False
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
 def validate_webhook(data: Dict[str, Any], workspace_id: str) -> bool:
     """
     Validate a webhook payload.
@@ -71,43 +147,174 @@ def validate_webhook(data: Dict[str, Any], workspace_id: str) -> bool:
     if not isinstance(data, dict):
         logger.warning("Invalid webhook data: not a dictionary")
         return False
-        
-    # Check if it's a story update
-    if data.get("action") != "update":
-        action_found = False
-        if "actions" in data and data["actions"]:
-            for action in data["actions"]:
-                if action.get("action") == "update":
-                    action_found = True
-                    break
-        
-        if not action_found:
-            logger.info("Ignoring non-update webhook event")
-            return False
-        
-    # Check if there's a label change
-    label_change_found = False
     
-    # Check direct "changes" field (old format)
-    changes = data.get("changes", {})
-    if "labels" in changes:
-        label_change_found = True
+    # Top-level fields (old format) settle most webhooks without touching actions
+    is_update = data.get("action") == "update"
+    label_change_found = "labels" in (data.get("changes") or {})
     
-    # Check actions[].changes format (new format)
-    if "actions" in data and data["actions"]:
-        for action in data["actions"]:
-            action_changes = action.get("changes", {})
-            if "label_ids" in action_changes or "labels" in action_changes:
-                label_change_found = True
+    # Scan actions[] (new format) once for both an update and a label change
+    if not (is_update and label_change_found):
+        for action in data.get("actions") or ():
+            if not is_update:
+                is_update = action.get("action") == "update"
+            if not label_change_found:
+                action_changes = action.get("changes") or {}
+                label_change_found = "label_ids" in action_changes or "labels" in action_changes
+            if is_update and label_change_found:
                 break
     
+    if not is_update:
+        logger.info("Ignoring non-update webhook event")
+        return False
+    
     if not label_change_found:
         logger.info("Ignoring update without label changes")
         return False
         
     return True
 
-async def handle_webhook(workspace_id: str, webhook_data: Dict[str, Any], request_path: str = "", client_ip: str = "") -> Dict[str, Any]:
+def stream_validate(body: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+    """
+    Validate a raw webhook body, parsing it only if it can pass validate_webhook.
+    
+    Large bodies are scanned with ijson first, so a webhook without an update
+    action and a label change is rejected without building the full payload.
+    The scan stops as soon as both have been seen. Small bodies, and all
+    bodies when ijson is not installed, are parsed directly.
+    
+    Args:
+        body: The raw request body
+        
+    Returns:
+        The parsed payload, or None if the webhook can be skipped
+        
+    Raises:
+        JSONDecodeError: If the body is not valid JSON
+    """
+    if IJSON_AVAILABLE and len(body) >= STREAM_VALIDATE_MIN_BYTES:
+        raw = body.encode("utf-8") if isinstance(body, str) else body
+        is_update = label_change_found = False
+        try:
+            for prefix, event, value in ijson.parse(io.BytesIO(raw)):
+                if event == "string" and prefix in _ACTION_PREFIXES:
+                    is_update = is_update or value == "update"
+                elif event == "map_key" and prefix in _CHANGES_PREFIXES:
+                    label_change_found = label_change_found or value in _LABEL_CHANGE_KEYS
+                if is_update and label_change_found:
+                    break
+        except ijson.JSONError as e:
+            raise json_fast.JSONDecodeError(str(e), "", 0) from e
+        if not (is_update and label_change_found):
+            logger.info("Ignoring webhook without an update action and label changes")
+            return None
+    return json_fast.loads(body)
+
+async def claim_webhook(workspace_id: str, story_id: str, webhook_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Claim a webhook for processing, rejecting recent duplicates.
+    
+    Shortcut retries webhooks and can send identical events for one edit;
+    only the first copy seen within WEBHOOK_DEDUP_TTL_MS is claimed.
+    
+    Args:
+        workspace_id: The workspace ID from the URL
+        story_id: The story ID from the webhook
+        webhook_data: The webhook payload
+        
+    Returns:
+        The claim's Redis key for the first copy of the webhook, or None for a duplicate
+    """
+    canonical_body = json_fast.dumps_bytes(webhook_data, sort_keys=True)
+    body_hash = hashlib.blake2b(canonical_body, digest_size=8).hexdigest()
+    dedup_key = f"wh:dedup:{workspace_id}:{story_id}:{body_hash}"
+    redis = await task_queue.get_redis()
+    claimed = await redis.set(dedup_key, "1", nx=True, px=WEBHOOK_DEDUP_TTL_MS)
+    return dedup_key if claimed else None
+
+async def release_webhook(dedup_key: str) -> None:
+    """
+    Release a webhook claim so a retry of the webhook is processed.
+    
+    Errors are logged rather than raised; the claim then lapses after
+    WEBHOOK_DEDUP_TTL_MS.
+    
+    Args:
+        dedup_key: The key returned by claim_webhook
+    """
+    try:
+        redis = await task_queue.get_redis()
+        await redis.delete(dedup_key)
+    except Exception as e:
+        logger.warning(f"Could not release webhook claim {dedup_key}: {str(e)}")
+
+async def enqueue_webhook(workspace_id: str, webhook_data: Dict[str, Any], request_path: str = "", client_ip: str = "") -> Optional[str]:
+    """
+    Queue a webhook for the background worker without processing it.
+    
+    The worker runs the full handle_webhook pipeline, so the webhook
+    endpoint only pays for Redis round trips before acknowledging.
+    
+    Args:
+        workspace_id: The workspace ID from the URL
+        webhook_data: The webhook payload
+        request_path: The request path (for logging)
+        client_ip: The client IP address (for logging)
+        
+    Returns:
+        The ID of the queued task, or None if the webhook duplicates one queued moments ago
+        
+    Raises:
+        Exception: If the task could not be queued; the webhook's claim is released first
+    """
+    story_id = extract_story_id(webhook_data) or ""
+    dedup_key = await claim_webhook(workspace_id, story_id, webhook_data)
+    if dedup_key is None:
+        logger.info(f"Skipping duplicate webhook for story {story_id}")
+        return None
+    
+    task = Task(
+        workspace_id=workspace_id,
+        story_id=story_id,
+        task_type=TaskType.WEBHOOK,
+        priority=TaskPriority.HIGH,
+        payload={
+            "webhook_data": webhook_data,
+            "request_path": request_path,
+            "client_ip": client_ip,
+            "received_at": time.time()
+        }
+    )
+    try:
+        return await task_queue.add_task(task)
+    except Exception:
+        # Nothing was queued, so retries of this webhook must not be skipped as duplicates
+        await release_webhook(dedup_key)
+        raise
+
+def _respond(status: str, workspace_id: str, request_id: str, **fields: Any) -> Dict[str, Any]:
+    """
+    Build a handle_webhook result.
+    
+    Args:
+        status: Outcome of handling the webhook
+        workspace_id: The workspace ID from the URL
+        request_id: Request ID for correlation
+        **fields: Outcome-specific fields (reason, story_id, duration_ms, result)
+        
+    Returns:
+        Response data
+    """
+    response = {"status": status, "workspace_id": workspace_id, "request_id": request_id}
+    response.update(fields)
+    return response
+
+async def handle_webhook(
+    workspace_id: str,
+    webhook_data: Dict[str, Any],
+    request_path: str = "",
+    client_ip: str = "",
+    process_inline: Optional[bool] = None
+) -> Dict[str, Any]:
     """
     Main webhook handler function.
     
@@ -116,115 +323,102 @@ async def handle_webhook(workspace_id: str, webhook_data: Dict[str, Any], reques
         webhook_data: The webhook payload
         request_path: The request path (for logging)
         client_ip: The client IP address (for logging)
+        process_inline: Run triage in this call instead of queueing a triage
+            task; defaults to the USE_BACKGROUND_PROCESSING setting
         
     Returns:
         Response data
     """
-    start_time = time.time()
+    # Monotonic, integer nanosecond clock for durations
+    start_ns = time.perf_counter_ns()
+    
+    def elapsed_ms() -> int:
+        """Whole milliseconds since the webhook arrived."""
+        return (time.perf_counter_ns() - start_ns) // 1_000_000
     
-    # Log webhook receipt and get request ID for correlation
-    request_id = log_webhook_receipt(
+    # Record webhook receipt and get request ID for correlation; events are
+    # buffered and logged as one record when handling finishes
+    webhook_trace = begin_webhook_trace(
         workspace_id=workspace_id,
         path=request_path,
         client_ip=client_ip,
         headers={"Content-Type": "application/json"},
         data=webhook_data
     )
-    
-    # Extract story ID
-    story_id = extract_story_id(webhook_data)
+    request_id = webhook_trace.request_id
+    story_id = webhook_trace.story_id
     
     # Generate a unique trace ID for this webhook event
-    trace_id = f"trace_{uuid.uuid4().hex}"
+    trace_id = new_trace_id()
+    
+    # One metadata dict and workflow name, shared by the stored trace info and the SDK trace
+    workflow_name = f"Shortcut-{workspace_id}"
+    metadata = {
+        "story_id": story_id,
+        "webhook_type": webhook_data.get("action", "unknown"),
+        "client_ip": client_ip,
+        "request_path": request_path,
+        "request_id": request_id
+    }
     
     # Save trace information for cross-process correlation
     trace_info = {
         "trace_id": trace_id,
         "group_id": workspace_id,
-        "workflow_name": f"Shortcut-{workspace_id}",
-        "metadata": {
-            "story_id": story_id,
-            "webhook_type": webhook_data.get("action", "unknown"),
-            "client_ip": client_ip,
-            "request_path": request_path,
-            "request_id": request_id
-        }
+        "workflow_name": workflow_name,
+        "metadata": metadata
     }
     save_trace_info(workspace_id, story_id, trace_info)
     
     # Use Agent SDK trace if available, otherwise fall back to our internal trace context
     with agent_trace(
-        workflow_name=f"Shortcut-{workspace_id}",
+        workflow_name=workflow_name,
         trace_id=trace_id,
         group_id=workspace_id,  # Group traces by workspace
-        metadata={
-            "story_id": story_id,
-            "webhook_type": webhook_data.get("action", "unknown"),
-            "client_ip": client_ip,
-            "request_path": request_path,
-            "request_id": request_id
-        }
+        metadata=metadata
     ):
         # Also use our internal trace context for backward compatibility
         with trace_context(
             request_id=request_id,
             workspace_id=workspace_id,
             story_id=story_id
-        ):
+        ), webhook_trace:
             # Basic validation
             is_valid = validate_webhook(webhook_data, workspace_id)
-            log_webhook_validation(
-                request_id=request_id,
-                workspace_id=workspace_id,
-                story_id=story_id,
+            webhook_trace.validation(
                 is_valid=is_valid,
                 reason="Invalid or irrelevant webhook data" if not is_valid else None
             )
             
             if not is_valid:
                 # Calculate processing time
-                duration_ms = int((time.time() - start_time) * 1000)
+                duration_ms = elapsed_ms()
                 
-                return {
-                    "status": "skipped",
-                    "reason": "Invalid or irrelevant webhook data",
-                    "workspace_id": workspace_id,
-                    "request_id": request_id,
-                    "duration_ms": duration_ms
-                }
+                return _respond(
+                    "skipped", workspace_id, request_id,
+                    reason="Invalid or irrelevant webhook data",
+                    duration_ms=duration_ms
+                )
             
             # Verify story ID
             if not story_id:
                 # Log error
-                log_webhook_processing_error(
-                    request_id=request_id,
-                    workspace_id=workspace_id,
-                    story_id=None,
+                webhook_trace.processing_error(
                     error="Could not extract story ID",
-                    duration_ms=int((time.time() - start_time) * 1000)
+                    duration_ms=elapsed_ms()
                 )
                 
-                return {
-                    "status": "error",
-                    "reason": "Could not extract story ID",
-                    "workspace_id": workspace_id,
-                    "request_id": request_id
-                }
+                return _respond("error", workspace_id, request_id, reason="Could not extract story ID")
             
             try:
                 # Log processing start
-                log_webhook_processing_start(
-                    request_id=request_id,
-                    workspace_id=workspace_id,
-                    story_id=story_id
-                )
+                webhook_trace.processing_start()
                 
                 # Get API key for the workspace
                 api_key = get_api_key(workspace_id)
                 
                 # Check if we should use the background worker or process inline
-                # Default to background processing
-                use_background = os.environ.get("USE_BACKGROUND_PROCESSING", "true").lower() in ("true", "1", "yes")
+                use_background = USE_BACKGROUND if process_inline is None else not process_inline
                 
                 if use_background:
                     # Create a triage task in the queue
@@ -251,13 +445,7 @@ async def handle_webhook(workspace_id: str, webhook_data: Dict[str, Any], reques
                     }
                     
                     # Log the queued decision
-                    log_triage_decision(
-                        request_id=request_id,
-                        workspace_id=workspace_id,
-                        story_id=story_id,
-                        decision="queued",
-                        triage_result=result
-                    )
+                    webhook_trace.triage_decision(decision="queued", triage_result=result)
                 else:
                     # Process inline (original behavior)
                     # Create workspace context with request ID
@@ -270,73 +458,79 @@ async def handle_webhook(workspace_id: str, webhook_data: Dict[str, Any], reques
                     # Add request_id to context for correlation
                     context.request_id = request_id
                     
+                    # Shed load instead of waiting on a dependency that keeps failing
+                    if _triage_breaker.is_open():
+                        logger.warning(f"Triage circuit open, shedding webhook for story {story_id}")
+                        webhook_trace.triage_decision(
+                            decision="shed_load",
+                            triage_result={"reason": "Triage circuit open"}
+                        )
+                        return _respond(
+                            "shed_load", workspace_id, request_id,
+                            reason="Triage circuit open",
+                            story_id=story_id,
+                            duration_ms=elapsed_ms()
+                        )
+                    
                     # Process the webhook with the triage agent
                     logger.info(f"Processing webhook with triage agent (inline)")
-                    result = await process_webhook(webhook_data, context)
+                    # Only transport and API failures count against the breaker
+                    try:
+                        result = await process_webhook(webhook_data, context)
+                    except Exception as e:
+                        if is_downstream_failure(e):
+                            _triage_breaker.record_failure()
+                        else:
+                            _triage_breaker.record_inconclusive()
+                        raise
+                    if result.get("downstream_error"):
+                        _triage_breaker.record_failure()
+                    elif "error" in result:
+                        _triage_breaker.record_inconclusive()
+                    else:
+                        _triage_breaker.record_success()
                     
                     # Check if the result contains a handoff
                     if "handoff" in result and result["handoff"]:
                         logger.info(f"Triage agent handed off to another agent: {result['handoff'].get('target', 'unknown')}")
                         # The handoff has already been processed by the SDK, so we just need to log it
-                        log_triage_decision(
-                            request_id=request_id,
-                            workspace_id=workspace_id,
-                            story_id=story_id,
+                        webhook_trace.triage_decision(
                             decision=result.get("workflow", "handoff"),
                             triage_result=result
                         )
                     else:
                         # Log triage decision
-                        log_triage_decision(
-                            request_id=request_id,
-                            workspace_id=workspace_id,
-                            story_id=story_id,
+                        webhook_trace.triage_decision(
                             decision=result.get("workflow", "unknown"),
                             triage_result=result
                         )
             
                 # Calculate processing time
-                duration_ms = int((time.time() - start_time) * 1000)
+                duration_ms = elapsed_ms()
                 
                 # Log processing complete
-                log_webhook_processing_complete(
-                    request_id=request_id,
-                    workspace_id=workspace_id,
+                webhook_trace.processing_complete(result=result, duration_ms=duration_ms)
+                
+                return _respond(
+                    "processed", workspace_id, request_id,
                     story_id=story_id,
-                    result=result,
-                    duration_ms=duration_ms
+                    duration_ms=duration_ms,
+                    result=result
                 )
-                
-                return {
-                    "status": "processed",
-                    "workspace_id": workspace_id,
-                    "story_id": story_id,
-                    "request_id": request_id,
-                    "duration_ms": duration_ms,
-                    "result": result
-                }
             
             except Exception as e:
                 # Calculate processing time
-                duration_ms = int((time.time() - start_time) * 1000)
+                duration_ms = elapsed_ms()
                 
                 # Log error
-                log_webhook_processing_error(
-                    request_id=request_id,
-                    workspace_id=workspace_id,
-                    story_id=story_id,
-                    error=str(e),
-                    duration_ms=duration_ms
-                )
+                webhook_trace.processing_error(error=str(e), duration_ms=duration_ms)
                 
                 # Re-log as standard logger for compatibility
                 logger.exception(f"Error processing webhook: {str(e)}")
                 
-                return {
-                    "status": "error",
-                    "reason": str(e),
-                    "workspace_id": workspace_id,
-                    "story_id": story_id if story_id else None,
-                    "request_id": request_id,
-                    "duration_ms": duration_ms
-                }
\ No newline at end of file
+                return _respond(
+                    "error", workspace_id, request_id,
+                    reason=str(e),
+                    story_id=story_id if story_id else None,
+                    duration_ms=duration_ms
+                )
\ No newline at end of file
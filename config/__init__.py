@@ -9,22 +9,32 @@ from typing import Dict, Any, Optional
 # Determine the current environment
 ENV = os.environ.get("VERCEL_ENV", "development")
 
+# ENV does not change at runtime, so the checks below are resolved once
+_IS_DEVELOPMENT = ENV == "development"
+_IS_PRODUCTION = ENV == "production"
+
+# Configuration for the current environment, loaded on first use
+_cached_config: Optional[Dict[str, Any]] = None
+
 def is_development() -> bool:
     """Check if the system is running in development mode"""
-    return ENV == "development"
+    return _IS_DEVELOPMENT
 
 def is_production() -> bool:
     """Check if the system is running in production mode"""
-    return ENV == "production"
+    return _IS_PRODUCTION
 
 def get_config() -> Dict[str, Any]:
     """Get the configuration for the current environment"""
-    if is_production():
-        from config.production import config
-    else:
-        from config.development import config
+    global _cached_config
+    if _cached_config is None:
+        if _IS_PRODUCTION:
+            from config.production import config
+        else:
+            from config.development import config
+        _cached_config = config
     
-    return config
+    return _cached_config
 
 def get_value(key: str, default: Optional[Any] = None) -> Any:
     """
@@ -2,8 +2,15 @@
 Workspace context for managing Shortcut workspace state.
 """
 
+import time
 from enum import Enum
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+
+# How long a cached story is trusted before it is fetched again (seconds)
+STORY_CACHE_TTL = 15.0
+
+# Label names that select the analysis-only workflow
+_ANALYSE_LABELS = frozenset(("analyse", "analyze"))
 
 class WorkflowType(Enum):
     """Enum for different workflow types in the system"""
@@ -13,6 +20,16 @@ class WorkflowType(Enum):
 class WorkspaceContext:
     """Context object for Shortcut workspace interactions"""
     
+    # Fixed attribute set: no per-instance __dict__ and faster attribute access.
+    # triage_result and _trace_context are assigned by the triage agent and
+    # utils.tracing; they stay unset (hasattr() is False) until then.
+    __slots__ = (
+        "workspace_id", "api_key", "story_id", "story_data", "story_cache",
+        "_pending_label_ops", "workflow_type", "analysis_results",
+        "enhancement_results", "update_results", "_update_results_source",
+        "_parsed_input", "request_id", "trace_id", "triage_result", "_trace_context",
+    )
+    
     def __init__(self, workspace_id: str, api_key: str, story_id: Optional[str] = None):
         """
         Initialize the workspace context with basic information.
@@ -29,12 +46,23 @@ class WorkspaceContext:
         # Story data will be populated when needed
         self.story_data: Optional[Dict[str, Any]] = None
         
+        # Recently fetched stories: story_id -> (expiry time, story data)
+        self.story_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        
+        # Label edits deferred to the end of a multi-stage workflow: (labels_to_add, labels_to_remove)
+        self._pending_label_ops: List[Tuple[List[str], List[str]]] = []
+        
         # Workflow state
         self.workflow_type: Optional[WorkflowType] = None
         
         # Analysis and enhancement results
         self.analysis_results: Optional[Dict[str, Any]] = None
         self.enhancement_results: Optional[Dict[str, Any]] = None
+        self.update_results: Optional[Dict[str, Any]] = None
+        self._update_results_source: Any = None
+        
+        # Agent input as sent to the SDK and its decoded form, so guardrails parse it once
+        self._parsed_input: Optional[Tuple[Any, Any]] = None
         
         # Request tracking
         self.request_id: Optional[str] = None
@@ -47,6 +75,39 @@ class WorkspaceContext:
         # Extract the story ID if not already set
         if not self.story_id and 'id' in story_data:
             self.story_id = str(story_data['id'])
+        
+        # Let later stages reuse this fetch
+        if 'id' in story_data:
+            self.story_cache_put(str(story_data['id']), story_data)
+    
+    def story_cache_get(self, story_id: str) -> Optional[Dict[str, Any]]:
+        """Get a recently fetched story, or None if it is missing or expired"""
+        entry = self.story_cache.get(story_id)
+        if entry is None:
+            return None
+        expires_at, story = entry
+        if expires_at < time.monotonic():
+            del self.story_cache[story_id]
+            return None
+        return story
+    
+    def story_cache_put(self, story_id: str, story: Dict[str, Any]) -> None:
+        """Cache a fetched story for STORY_CACHE_TTL seconds"""
+        self.story_cache[story_id] = (time.monotonic() + STORY_CACHE_TTL, story)
+    
+    def story_cache_invalidate(self, story_id: str) -> None:
+        """Drop a cached story, e.g. after it has been modified"""
+        self.story_cache.pop(story_id, None)
+    
+    def queue_label_op(self, labels_to_add: List[str], labels_to_remove: List[str]) -> None:
+        """Defer a label edit so it can be applied together with later ones"""
+        self._pending_label_ops.append((labels_to_add, labels_to_remove))
+    
+    def take_pending_label_ops(self) -> List[Tuple[List[str], List[str]]]:
+        """Return the deferred label edits in order and clear them"""
+        ops = self._pending_label_ops
+        self._pending_label_ops = []
+        return ops
     
     def set_workflow_type(self, workflow_type: WorkflowType) -> None:
         """Set the workflow type based on the story tags"""
@@ -60,16 +121,16 @@ class WorkspaceContext:
         if not self.story_data or 'labels' not in self.story_data:
             return None
         
-        # Extract label names
-        labels = [label.get('name', '').lower() for label in self.story_data.get('labels', [])]
+        # One pass over the labels; enhance wins over analyse wherever it appears
+        workflow_type = None
+        for label in self.story_data.get('labels', ()):
+            name = label.get('name', '').lower()
+            if name == 'enhance':
+                return WorkflowType.ENHANCE
+            if name in _ANALYSE_LABELS:
+                workflow_type = WorkflowType.ANALYSE
         
-        # Check for workflow-specific labels
-        if 'enhance' in labels:
-            return WorkflowType.ENHANCE
-        elif 'analyse' in labels or 'analyze' in labels:
-            return WorkflowType.ANALYSE
-            
-        return None
+        return workflow_type
     
     def set_analysis_results(self, results: Dict[str, Any]) -> None:
         """Set the analysis results for the current story"""
@@ -87,6 +148,33 @@ class WorkspaceContext:
         """Get the enhancement results for the current story"""
         return self.enhancement_results
     
+    def set_update_results(self, results: Dict[str, Any], source: Any = None) -> None:
+        """Set the update results, remembering the result object they were built from"""
+        self.update_results = results
+        self._update_results_source = source
+    
+    def get_update_results(self) -> Optional[Dict[str, Any]]:
+        """Get the update results for the current story"""
+        return self.update_results
+    
+    def dumped_update_result(self, source: Any) -> Optional[Dict[str, Any]]:
+        """Get the already serialized form of an update result, if it was stored from that object"""
+        if self.update_results is not None and self._update_results_source is source:
+            return self.update_results.get("result")
+        return None
+    
+    def set_parsed_input(self, encoded: Any, data: Any) -> None:
+        """Remember the decoded form of the agent input that is sent to the SDK as encoded"""
+        self._parsed_input = (encoded, data)
+    
+    def get_parsed_input(self, encoded: Any) -> Optional[Any]:
+        """Get the decoded form of an agent input, if it was stored for that exact encoding"""
+        if self._parsed_input is not None:
+            stored, data = self._parsed_input
+            if stored is encoded or stored == encoded:
+                return data
+        return None
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert the context to a dictionary for storage"""
         return {
@@ -32,6 +32,7 @@ setup_openai_configuration()
 # Import webhook handler
 from api.webhook.handler import handle_webhook
 from api.test_pipeline import run_test_pipeline
+from tools.shortcut.shortcut_tools import close_http_session
 
 async def simulate_webhook(workspace_id: str, story_id: str, label: str = "enhance") -> Dict[str, Any]:
     """
@@ -116,6 +117,8 @@ async def main() -> None:
     except Exception as e:
         logger.exception(f"Error: {str(e)}")
         sys.exit(1)
+    finally:
+        await close_http_session()
 
 if __name__ == "__main__":
     # Run the async main function
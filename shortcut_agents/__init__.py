@@ -6,13 +6,17 @@ The agents are implemented using the OpenAI Agent SDK and follow a consistent
 pattern based on the BaseAgent class.
 """
 
-# Export agent factory functions
-from shortcut_agents.triage.triage_agent import create_triage_agent, process_webhook
-from shortcut_agents.analysis.analysis_agent import create_analysis_agent, process_analysis
-from shortcut_agents.update.update_agent import create_update_agent, process_update
-
-# Export base agent
-from shortcut_agents.base_agent import BaseAgent, BaseAgentHooks
+# Agent modules pull in the OpenAI Agent SDK, so exports are imported on first access
+_EXPORTS = {
+    'BaseAgent': 'shortcut_agents.base_agent',
+    'BaseAgentHooks': 'shortcut_agents.base_agent',
+    'create_triage_agent': 'shortcut_agents.triage.triage_agent',
+    'process_webhook': 'shortcut_agents.triage.triage_agent',
+    'create_analysis_agent': 'shortcut_agents.analysis.analysis_agent',
+    'process_analysis': 'shortcut_agents.analysis.analysis_agent',
+    'create_update_agent': 'shortcut_agents.update.update_agent',
+    'process_update': 'shortcut_agents.update.update_agent',
+}
 
 __all__ = [
     'BaseAgent',
@@ -23,4 +27,12 @@ __all__ = [
     'process_analysis',
     'create_update_agent',
     'process_update'
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    """Import an exported agent symbol from its module on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    return getattr(importlib.import_module(module_name), name)
\ No newline at end of file
@@ -8,7 +8,6 @@ import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from openai import OpenAI
 # Import RunContextWrapper directly from base_agent
 from shortcut_agents.base_agent import RunContextWrapper
 
@@ -16,7 +15,6 @@ from context.workspace.workspace_context import WorkspaceContext
 from shortcut_agents.analysis.models import ComponentScore
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("analysis_tools")
 
 
@@ -301,6 +299,7 @@ async def external_llm_analysis(
         api_key = ctx.context.api_key if hasattr(ctx, 'context') and hasattr(ctx.context, 'api_key') else None
         
         # Use environment OpenAI API key if not found in context
+        from openai import OpenAI
         client = OpenAI()
         
         # Select model based on configuration or override
@@ -6,31 +6,74 @@ implementing common patterns and best practices for the OpenAI Agent SDK.
 """
 
 import os
-import json
 import logging
 import time
 import importlib.util
+import importlib.metadata
 import sys
 from typing import Dict, Any, List, Optional, Type, TypeVar, Generic, Union, Callable
+from dataclasses import is_dataclass
 from datetime import datetime
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging (handler configuration is left to the application entry point)
 logger = logging.getLogger("base_agent")
 
+# Per-agent-type loggers, shared by every agent and hook instance
+_LOGGER_CACHE: Dict[str, logging.Logger] = {}
+
+def _get_logger(agent_type: str) -> logging.Logger:
+    """
+    Get the cached logger for an agent type.
+    
+    Args:
+        agent_type: Type of agent (triage, analysis, update, etc.)
+        
+    Returns:
+        Logger named "<agent_type>.agent"
+    """
+    agent_logger = _LOGGER_CACHE.get(agent_type)
+    if agent_logger is None:
+        agent_logger = _LOGGER_CACHE.setdefault(agent_type, logging.getLogger(f"{agent_type}.agent"))
+    return agent_logger
+
 # Check for mock agent flag
 USE_MOCK_AGENTS = os.environ.get("USE_MOCK_AGENTS", "false").lower() in ("true", "1", "yes")
 
 # Check for OpenAI API key
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+_HAS_OPENAI_KEY = OPENAI_API_KEY is not None
+
+def reload_openai_key_state() -> bool:
+    """
+    Re-read OPENAI_API_KEY from the environment (e.g. after a config reload).
+    
+    Returns:
+        True if an OpenAI API key is now set
+    """
+    global _HAS_OPENAI_KEY
+    _HAS_OPENAI_KEY = os.environ.get("OPENAI_API_KEY") is not None
+    return _HAS_OPENAI_KEY
+
+def has_openai_key() -> bool:
+    """
+    Check whether an OpenAI API key was set at import or the last reload.
+    
+    The key state is read once, so setting or removing OPENAI_API_KEY takes
+    effect only after a restart or reload_openai_key_state().
+    
+    Returns:
+        True if agents should call the OpenAI API
+    """
+    return _HAS_OPENAI_KEY
+
 if not OPENAI_API_KEY and not USE_MOCK_AGENTS:
     logger.warning("OPENAI_API_KEY not set, forcing mock implementation")
     USE_MOCK_AGENTS = True
 
-# OpenAI imports
+# OpenAI imports (the client itself is imported lazily by run_streaming)
 try:
-    import openai
-    from openai import OpenAI
+    if importlib.util.find_spec("openai") is None:
+        raise ImportError("No module named 'openai'")
     
     # Only try to import OpenAI Agent SDK if not using mocks
     if not USE_MOCK_AGENTS:
@@ -39,7 +82,7 @@ try:
             if importlib.util.find_spec("agents") is not None:
                 # Import from the OpenAI Agent SDK
                 from agents import (
-                    Agent, AgentHooks, Runner, ModelSettings, 
+                    Agent, AgentHooks, ModelSettings, 
                     GuardrailFunctionOutput, FunctionTool, Tool, 
                     input_guardrail, output_guardrail, Trace, 
                     Span, get_current_trace, trace, RunItem,
@@ -56,7 +99,7 @@ try:
                 FunctionOutputPair = dict
                 FunctionInputPair = dict
                 
-                logger.info(f"OpenAI version: {openai.__version__}")
+                logger.info(f"OpenAI version: {importlib.metadata.version('openai')}")
                 logger.info(f"OpenAI Agents SDK version found")
                 SDK_AVAILABLE = True
             else:
@@ -167,7 +210,7 @@ if USE_MOCK_AGENTS:
             self.tools = kwargs.get("tools", [])
             self.hooks = kwargs.get("hooks", None)
             self.simplified = kwargs.get("simplified", False)
-            self.logger = logging.getLogger(f"{agent_type}.agent")
+            self.logger = _get_logger(agent_type)
             
         async def run(self, input_data, context=None):
             """Run the agent."""
@@ -253,7 +296,7 @@ else:
             self.tools = kwargs.get("tools", [])
             self.hooks = kwargs.get("hooks", None)
             self.simplified = kwargs.get("simplified", False)
-            self.logger = logging.getLogger(f"{agent_type}.agent")
+            self.logger = _get_logger(agent_type)
             
         async def run(self, input_data, context=None):
             """Run the agent."""
@@ -325,16 +368,105 @@ if USE_MOCK_AGENTS:
     Runner = BaseAgentMock
     ThreadMessage = BaseAgentMock
 
+# Pydantic is used for structured outputs; TypeAdapter is pydantic v2 only
+from pydantic import BaseModel
+try:
+    from pydantic import TypeAdapter
+except ImportError:
+    TypeAdapter = None
+
 # Local imports
 from context.workspace.workspace_context import WorkspaceContext, WorkflowType
 from utils.tracing import prepare_handoff_context, restore_handoff_context
 from utils.storage.local_storage import local_storage
 from config import get_config, is_development, is_production
+from utils import json_fast
 
 # Type variable for the output type
 T = TypeVar('T')
 U = TypeVar('U')
 
+def _iso_now() -> str:
+    """
+    Get the current local time as an ISO 8601 string.
+    
+    Returns:
+        Timestamp string such as "2024-01-01T12:00:00.123456"
+    """
+    return datetime.now().isoformat()
+
+# SDK pieces only needed when an agent actually runs, imported on first use
+_Runner = None
+_RunConfig = None
+_OpenAI = None
+
+def _get_runner():
+    """Get the SDK Runner class (or the mock when the SDK is unavailable)."""
+    global _Runner
+    if _Runner is None:
+        if SDK_AVAILABLE:
+            from agents import Runner as _Runner
+        else:
+            _Runner = Runner
+    return _Runner
+
+def _get_run_config_class():
+    """Get the SDK RunConfig class."""
+    global _RunConfig
+    if _RunConfig is None:
+        from agents import RunConfig as _RunConfig
+    return _RunConfig
+
+def _get_openai_class():
+    """Get the OpenAI client class used for streaming runs."""
+    global _OpenAI
+    if _OpenAI is None:
+        from openai import OpenAI as _OpenAI
+    return _OpenAI
+
+# Shared OpenAI client so connections stay warm across streaming runs
+_OPENAI_CLIENT = None
+
+def _get_client():
+    """Get the shared OpenAI client, creating it on first use."""
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        _OPENAI_CLIENT = _get_openai_class()()
+    return _OPENAI_CLIENT
+
+def _make_model_settings(temperature: Optional[float]) -> ModelSettings:
+    """
+    Build a ModelSettings instance for the given configuration.
+    
+    ModelSettings is mutable, so every agent gets its own instance rather
+    than one shared through a cache.
+    
+    Args:
+        temperature: Sampling temperature, or None to use the model default
+        
+    Returns:
+        ModelSettings instance
+    """
+    if temperature is None:
+        return ModelSettings()
+    return ModelSettings(temperature=temperature)
+
+# Function call parameters that are redacted before logging
+_SENSITIVE_KEYS = frozenset({"api_key", "token", "password", "secret", "authorization", "bearer"})
+
+def _extract_output(items) -> Any:
+    """
+    Get the value of the first output_type item in a run response.
+    
+    Args:
+        items: Response items produced by an agent run
+        
+    Returns:
+        The structured output value, or None if there is none
+    """
+    # output_type items always carry a value, so no hasattr probe is needed
+    return next((item.value for item in items if item.type == "output_type"), None)
+
 class BaseAgentHooks(AgentHooks, Generic[T]):
     """
     Standard lifecycle hooks for all agents.
@@ -353,44 +485,41 @@ class BaseAgentHooks(AgentHooks, Generic[T]):
         """
         self.agent_type = agent_type
         self.agent_name = agent_name
-        self.logger = logging.getLogger(f"{agent_type}.agent")
+        self.logger = _get_logger(agent_type)
     
     async def pre_generation(self, context, agent, input_items):
         """Hook that runs before the agent generates a response."""
-        self.logger.info(f"Starting {self.agent_name} processing")
+        self.logger.info("Starting %s processing", self.agent_name)
         
         # Extract context data if available
         if hasattr(context, "context") and isinstance(context.context, WorkspaceContext):
             workspace_context = context.context
-            story_id = getattr(workspace_context, "story_id", "unknown")
-            workspace_id = getattr(workspace_context, "workspace_id", "unknown")
+            story_id = workspace_context.story_id
+            workspace_id = workspace_context.workspace_id
             
             self.logger.info(
-                f"Processing {self.agent_type} for story {story_id} in workspace {workspace_id}",
+                "Processing %s for story %s in workspace %s",
+                self.agent_type, story_id, workspace_id,
                 extra={"story_id": story_id, "workspace_id": workspace_id}
             )
             
             # Restore trace context if it exists
             trace_ctx = restore_handoff_context(workspace_context)
             if trace_ctx:
-                self.logger.info(f"Restored trace context from previous agent")
+                self.logger.info("Restored trace context from previous agent")
         
         return input_items
     
     async def post_generation(self, context, agent, response):
         """Hook that runs after the agent generates a response."""
-        self.logger.info(f"Completed {self.agent_name} processing")
+        self.logger.info("Completed %s processing", self.agent_name)
         
         # Extract and store results if available
         if hasattr(context, "context") and isinstance(context.context, WorkspaceContext):
             workspace_context = context.context
             
             # Extract the result from the response
-            result = None
-            for item in response.items:
-                if item.type == "output_type" and hasattr(item, "value"):
-                    result = item.value
-                    break
+            result = _extract_output(response.items)
             
             if result:
                 # Process the result (can be overridden by subclasses)
@@ -403,33 +532,46 @@ class BaseAgentHooks(AgentHooks, Generic[T]):
     
     async def pre_function_call(self, context, function_call):
         """Hook that runs before a function is called."""
-        function_name = getattr(function_call, 'name', 'unknown')
+        # Skip redaction and message formatting entirely when INFO is disabled
+        if not self.logger.isEnabledFor(logging.INFO):
+            return function_call
         
         # Redact sensitive parameters in logs
-        safe_params = {}
-        if hasattr(function_call, 'parameters'):
-            for key, value in function_call.parameters.items():
-                if key.lower() in ["api_key", "token", "password", "secret"]:
-                    safe_params[key] = "[REDACTED]"
-                else:
-                    safe_params[key] = value
+        try:
+            function_name = function_call.name
+            parameters = function_call.parameters
+        except AttributeError:
+            function_name = getattr(function_call, 'name', 'unknown')
+            parameters = getattr(function_call, 'parameters', None) or {}
+        
+        safe_params = {
+            key: ("[REDACTED]" if key.lower() in _SENSITIVE_KEYS else value)
+            for key, value in parameters.items()
+        }
         
         self.logger.info(
-            f"Calling function: {function_name}",
+            "Calling function: %s", function_name,
             extra={"parameters": safe_params, "agent": self.agent_type}
         )
         return function_call
     
     async def post_function_call(self, context, function_output):
         """Hook that runs after a function is called."""
-        function_name = getattr(function_output, 'name', 'unknown')
+        if not self.logger.isEnabledFor(logging.INFO):
+            return function_output
+        
+        try:
+            function_name = function_output.name
+            output = function_output.output
+        except AttributeError:
+            function_name = getattr(function_output, 'name', 'unknown')
+            output = getattr(function_output, 'output', None)
         
         # Get output type without exposing sensitive data
-        output = getattr(function_output, 'output', None)
         output_type = type(output).__name__ if output is not None else 'None'
         
         self.logger.info(
-            f"Function completed: {function_name}",
+            "Function completed: %s", function_name,
             extra={"output_type": output_type, "agent": self.agent_type}
         )
         return function_output
@@ -446,26 +588,30 @@ class BaseAgentHooks(AgentHooks, Generic[T]):
             result: The agent execution result
         """
         # Default implementation just logs the result type
-        result_type = type(result).__name__
-        self.logger.info(f"Agent produced result of type: {result_type}")
+        self.logger.info("Agent produced result of type: %s", type(result).__name__)
 
     async def post_message(self, context, agent, message: ThreadMessage) -> ThreadMessage:
         """Hook that runs after a message is added to the thread."""
         # Log message creation without exposing content
-        self.logger.info(
-            f"Added message to thread",
-            extra={"agent": self.agent_type, "message_id": getattr(message, "id", "unknown")}
-        )
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Added message to thread",
+                extra={"agent": self.agent_type, "message_id": getattr(message, "id", "unknown")}
+            )
         return message
     
     async def post_step(self, context, run_step: RunStep):
         """Hook that runs after each step of agent execution."""
         # Log step execution at debug level to avoid noise
-        step_type = getattr(run_step, "step_type", "unknown")
-        self.logger.debug(
-            f"Executed agent step: {step_type}",
-            extra={"agent": self.agent_type, "step_type": step_type}
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            try:
+                step_type = run_step.step_type
+            except AttributeError:
+                step_type = "unknown"
+            self.logger.debug(
+                "Executed agent step: %s", step_type,
+                extra={"agent": self.agent_type, "step_type": step_type}
+            )
         return run_step
 
 
@@ -516,13 +662,48 @@ class BaseAgent(Generic[T, U]):
         self.tools = tools or []
         self.model_override = model_override
         
-        self.logger = logging.getLogger(f"{agent_type}.agent")
+        self.logger = _get_logger(agent_type)
         self._agent = None
+        self._agent_model: Optional[str] = None
+        
+        # Precompiled serializer for results of output_class (pydantic v2 models and dataclasses)
+        self._output_adapter = None
+        if TypeAdapter is not None and isinstance(output_class, type) and (
+            issubclass(output_class, BaseModel) or is_dataclass(output_class)
+        ):
+            self._output_adapter = TypeAdapter(output_class)
+        
+        # Wrap guardrails for the SDK once; they only depend on constructor args
+        if SDK_AVAILABLE:
+            self._sdk_input_guardrails = [InputGuardrail(g) for g in self.input_guardrails]
+            self._sdk_output_guardrails = [OutputGuardrail(g) for g in self.output_guardrails]
+        else:
+            self._sdk_input_guardrails = []
+            self._sdk_output_guardrails = []
+        
+        # Resolved model name, memoized by get_model()
+        self._model: Optional[str] = None
+        self._model_resolved_for: Optional[str] = None
     
     def get_model(self) -> str:
         """
         Get the appropriate model for this agent.
         
+        The resolved model is cached on the instance and only recomputed
+        when model_override changes.
+        
+        Returns:
+            Model name based on configuration or override
+        """
+        if self._model is None or self._model_resolved_for != self.model_override:
+            self._model = self._resolve_model()
+            self._model_resolved_for = self.model_override
+        return self._model
+    
+    def _resolve_model(self) -> str:
+        """
+        Resolve the model name from override, environment, or configuration.
+        
         Returns:
             Model name based on configuration or override
         """
@@ -550,62 +731,50 @@ class BaseAgent(Generic[T, U]):
             Configured OpenAI Agent instance
         """
         model = self.get_model()
-        self.logger.info(f"Creating {self.agent_name} with model: {model}")
         
-        # Format guardrails for the SDK
-        formatted_guardrails = []
-        for guardrail in self.input_guardrails:
-            formatted_guardrails.append({
-                "tag": guardrail.__name__,
-                "function": guardrail
-            })
+        # Reuse the agent built on a previous call unless the model changed
+        if self._agent is not None and self._agent_model == model:
+            return self._agent
         
-        for guardrail in self.output_guardrails:
-            formatted_guardrails.append({
-                "tag": guardrail.__name__,
-                "function": guardrail
-            })
+        self.logger.info(f"Creating {self.agent_name} with model: {model}")
         
         # Create agent hooks instance
         hooks = self.hooks_class(self.agent_type, self.agent_name)
         
-        # Create agent with OpenAI Agent SDK - with correct parameters based on SDK version
-        
-        # Create input and output guardrails according to SDK
-        input_guardrails = []
-        output_guardrails = []
-        
-        for guardrail in self.input_guardrails:
-            input_guardrails.append(InputGuardrail(guardrail))
-            
-        for guardrail in self.output_guardrails:
-            output_guardrails.append(OutputGuardrail(guardrail))
-        
-        # Create model settings based on model type
-        model_settings = ModelSettings()  # Always initialize with a valid ModelSettings object
-        if "o3-mini" not in model.lower() and "o3" not in model.lower() and "gpt-4o" not in model.lower():
-            # Only use temperature for models that support it
-            model_settings = ModelSettings(
-                temperature=0.2,  # Lower temperature for consistent outputs
-            )
-        
         # Create agent with correct parameters
         agent = Agent(
             name=self.agent_name,
             instructions=self.system_message,
             model=model,
-            model_settings=model_settings,
+            model_settings=self._build_model_settings(model),
             tools=self.tools,
             hooks=hooks,
-            input_guardrails=input_guardrails,
-            output_guardrails=output_guardrails,
+            input_guardrails=self._sdk_input_guardrails,
+            output_guardrails=self._sdk_output_guardrails,
             output_type=self.output_class,  # Use the class directly, not OutputType wrapper
             handoffs=[]  # Empty list, we'll implement handoffs differently
         )
         
         self._agent = agent
+        self._agent_model = model
         return agent
     
+    def _build_model_settings(self, model: str) -> ModelSettings:
+        """
+        Build model settings appropriate for the given model.
+        
+        Args:
+            model: Model name the agent will run with
+            
+        Returns:
+            ModelSettings instance for the model
+        """
+        model_lower = model.lower()
+        if "o3-mini" not in model_lower and "o3" not in model_lower and "gpt-4o" not in model_lower:
+            # Only use temperature for models that support it
+            return _make_model_settings(0.2)  # Lower temperature for consistent outputs
+        return _make_model_settings(None)
+    
     async def run(
         self, 
         input_data: U, 
@@ -629,6 +798,12 @@ class BaseAgent(Generic[T, U]):
         
         self.logger.info(f"Running {self.agent_name} for story {story_id}")
         
+        # For environments without OpenAI API key, use simplified logic
+        # (checked before opening a trace or building the agent)
+        if not _HAS_OPENAI_KEY:
+            self.logger.warning("OpenAI API key not found, using simplified execution")
+            return await self.run_simplified(input_data, workspace_context)
+        
         # Create trace for the agent process - SDK version
         with trace(
             workflow_name=f"{self.agent_name} Execution",
@@ -640,29 +815,26 @@ class BaseAgent(Generic[T, U]):
                 "agent_type": self.agent_type
             }
         ):
-            # Create the agent if not already created
-            if not self._agent:
-                self._agent = self.create_agent()
-            
-            # For environments without OpenAI API key, use simplified logic
-            if os.environ.get("OPENAI_API_KEY") is None:
-                self.logger.warning("OpenAI API key not found, using simplified execution")
-                return await self.run_simplified(input_data, workspace_context)
+            # Create the agent (reused across runs once built)
+            self.create_agent()
             
             try:
                 # Prepare input for the agent (convert to string if needed)
                 input_json = input_data
                 if not isinstance(input_data, str):
-                    input_json = json.dumps(input_data)
+                    input_json = json_fast.dumps(input_data)
+                    # Let guardrails reuse the dict instead of re-parsing the JSON
+                    workspace_context.set_parsed_input(input_json, input_data)
                 
                 # Run the agent with the OpenAI Agent SDK
                 self.logger.info(f"Running {self.agent_name} with OpenAI Agent SDK")
                 
                 # For triage agent specifically, log the full webhook payload to help with debugging
                 if self.agent_type == "triage":
-                    self.logger.info(f"Processing webhook payload: {json.dumps(input_data)[:1000]}")
+                    self.logger.info(f"Processing webhook payload: {input_json[:1000]}")
                 
                 # Check for any Promise-related issues before attempting to run
+                Runner = _get_runner()
                 if getattr(Runner, "run", None) is None:
                     self.logger.warning("Runner.run method is None, falling back to simplified execution")
                     return await self.run_simplified(input_data, workspace_context)
@@ -672,7 +844,7 @@ class BaseAgent(Generic[T, U]):
                     return await self.run_streaming(input_json, workspace_context)
                 else:
                     # Regular execution - adjusted for SDK run() parameters
-                    from agents import RunConfig
+                    RunConfig = _get_run_config_class()
                     
                     # Create a run configuration
                     run_config = RunConfig(
@@ -707,12 +879,7 @@ class BaseAgent(Generic[T, U]):
                         return result_dict
                     # Fallback for other response structures (like our mock implementation)
                     elif hasattr(result, "items"):
-                        agent_result = None
-                        for item in result.items:
-                            if item.type == "output_type" and hasattr(item, "value"):
-                                agent_result = item.value
-                                break
-                        
+                        agent_result = _extract_output(result.items)
                         if agent_result:
                             # Process the result
                             result_dict = self._process_result(agent_result, workspace_context)
@@ -753,7 +920,7 @@ class BaseAgent(Generic[T, U]):
         
         # Use the thread system for streaming responses
         try:
-            client = OpenAI()
+            client = _get_client()
             
             # Create a thread
             thread = await client.beta.threads.create()
@@ -773,15 +940,13 @@ class BaseAgent(Generic[T, U]):
                 instructions=self.system_message,
             )
             
-            # Stream the run steps
-            stream_chunks = []
+            # Drain the run stream; chunks are consumed as they arrive rather
+            # than buffered, since only the final message is used below
             async for chunk in client.beta.threads.runs.stream(
                 thread_id=thread.id,
                 run_id=run.id
             ):
-                if hasattr(chunk, "data") and chunk.data:
-                    stream_chunks.append(chunk.data)
-                    # Could send this chunk to a client in a real streaming scenario
+                pass
             
             # Get the final messages
             messages = await client.beta.threads.messages.list(
@@ -793,16 +958,16 @@ class BaseAgent(Generic[T, U]):
                 if msg.role == "assistant":
                     content = msg.content[0].text.value if msg.content else ""
                     try:
-                        result_dict = json.loads(content)
+                        result_dict = json_fast.loads(content)
                         return self._process_result(result_dict, workspace_context)
-                    except json.JSONDecodeError:
+                    except json_fast.JSONDecodeError:
                         # If the content is not valid JSON, return it as is
                         return {
                             "status": "success",
                             "agent": self.agent_type,
                             "result": content,
                             "streaming": True,
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": _iso_now()
                         }
             
             # No assistant message found
@@ -849,30 +1014,19 @@ class BaseAgent(Generic[T, U]):
             Dictionary with processed results
         """
         # Convert result to dict if needed
-        result_dict = result
-        if not isinstance(result, dict):
-            # Support for Pydantic v2
-            if hasattr(result, "model_dump") and callable(result.model_dump):
-                result_dict = result.model_dump()
-            # Support for Pydantic v1
-            elif hasattr(result, "dict") and callable(result.dict):
-                result_dict = result.dict()
-            # Fallback for regular classes 
-            elif hasattr(result, "__dict__"):
-                result_dict = vars(result)
+        result_dict = self._dump_result(result)
         
         # Add metadata
         metadata = {
             "agent": self.agent_type,
             "model": self.get_model(),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_now(),
             "request_id": workspace_context.request_id,
             "workspace_id": workspace_context.workspace_id,
             "story_id": workspace_context.story_id
         }
         
         # Store in local storage for persistence
-        storage_key = f"{self.agent_type}:{workspace_context.workspace_id}:{workspace_context.story_id}"
         local_storage.save_task(
             workspace_context.workspace_id,
             workspace_context.story_id,
@@ -890,6 +1044,36 @@ class BaseAgent(Generic[T, U]):
             "metadata": metadata
         }
     
+    def _dump_result(self, result: Any) -> Any:
+        """
+        Convert an agent result to a plain dict.
+        
+        Instances of output_class go through the precompiled TypeAdapter;
+        anything else uses the generic model_dump/dict/vars fallbacks.
+        
+        Args:
+            result: The agent execution result
+            
+        Returns:
+            The result as a dict (or unchanged if it cannot be converted)
+        """
+        if isinstance(result, dict):
+            return result
+        
+        if self._output_adapter is not None and isinstance(result, self.output_class):
+            return self._output_adapter.dump_python(result)
+        
+        # Support for Pydantic v2
+        if hasattr(result, "model_dump") and callable(result.model_dump):
+            return result.model_dump()
+        # Support for Pydantic v1
+        if hasattr(result, "dict") and callable(result.dict):
+            return result.dict()
+        # Fallback for regular classes 
+        if hasattr(result, "__dict__"):
+            return vars(result)
+        return result
+    
     def _create_error_result(self, error_message: str, workspace_context: WorkspaceContext) -> Dict[str, Any]:
         """
         Create a standardized error result.
@@ -907,5 +1091,5 @@ class BaseAgent(Generic[T, U]):
             "error": error_message,
             "workspace_id": workspace_context.workspace_id,
             "story_id": workspace_context.story_id,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }
\ No newline at end of file
@@ -2,6 +2,8 @@
 Triage Agent for the Shortcut Enhancement System.
 """
 
-from shortcut_agents.triage.triage_agent import create_triage_agent, process_webhook
+from shortcut_agents.triage.triage_agent import (
+    create_triage_agent, process_webhook, triage_by_workflow
+)
 
-__all__ = ["create_triage_agent", "process_webhook"]
\ No newline at end of file
+__all__ = ["create_triage_agent", "process_webhook", "triage_by_workflow"]
\ No newline at end of file
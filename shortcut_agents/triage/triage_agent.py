@@ -7,18 +7,19 @@ This implementation follows OpenAI Agent SDK best practices for handoffs, guardr
 
 import logging
 import datetime
+import functools
 import time
 import uuid
-import json
 import os
 import traceback
-from typing import Dict, Any, List, Optional, Union
+import threading
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
 
 from pydantic import BaseModel, Field
 
 # Import OpenAI Agent SDK components
 from agents import (
-    Agent, Runner, ModelSettings, function_tool, trace, RunConfig,
+    Agent, Runner, ModelSettings, function_tool,
     input_guardrail, output_guardrail, GuardrailFunctionOutput
 )
 
@@ -35,6 +36,9 @@ from utils.tracing import prepare_handoff_context, restore_handoff_context, reco
 # Import storage utilities
 from utils.storage.local_storage import local_storage
 
+# Import error classification for circuit breakers
+from utils.circuit import is_downstream_failure
+
 # Set up logging
 logger = logging.getLogger("triage_agent")
 
@@ -71,6 +75,26 @@ class TriageOutput(BaseModel):
     workspace_id: Optional[str] = Field(None, description="The ID of the workspace")
     reason: Optional[str] = Field(None, description="Reason for not processing")
     next_steps: List[str] = Field(default_factory=list, description="Next steps to take")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the output to a plain dict.
+        
+        Reads the six known fields directly instead of going through the
+        generic model_dump() machinery.
+        
+        Returns:
+            Dictionary with the triage output fields
+        """
+        values = self.__dict__
+        return {
+            "processed": values["processed"],
+            "workflow": values["workflow"],
+            "story_id": values["story_id"],
+            "workspace_id": values["workspace_id"],
+            "reason": values["reason"],
+            "next_steps": list(values["next_steps"])
+        }
 
 
 class TriageAgentHooks(BaseAgentHooks[TriageOutput]):
@@ -84,26 +108,18 @@ class TriageAgentHooks(BaseAgentHooks[TriageOutput]):
             workspace_context: The workspace context
             result: The triage result
         """
-        # Convert result to dictionary
-        if hasattr(result, "model_dump") and callable(result.model_dump):
-            result_dict = result.model_dump()
-        elif hasattr(result, "dict") and callable(result.dict):
-            result_dict = result.dict()
-        else:
-            result_dict = vars(result)
-            
         # Store the result in the workspace context
-        workspace_context.triage_result = result_dict
+        workspace_context.triage_result = result.to_dict()
         
         # Set workflow type if applicable
         if result.workflow == "enhance":
             workspace_context.set_workflow_type(WorkflowType.ENHANCE)
-            logger.info(f"Setting workflow type to ENHANCE for story {result.story_id}")
+            logger.info("Setting workflow type to ENHANCE for story %s", result.story_id)
         elif result.workflow in ["analyse", "analyze"]:
             workspace_context.set_workflow_type(WorkflowType.ANALYSE)
-            logger.info(f"Setting workflow type to ANALYSE for story {result.story_id}")
+            logger.info("Setting workflow type to ANALYSE for story %s", result.story_id)
             
-        logger.info(f"Stored triage results in workspace context: {result.workflow}")
+        logger.info("Stored triage results in workspace context: %s", result.workflow)
 
 
 # Input validation guardrail
@@ -212,6 +228,23 @@ async def validate_triage_output(ctx, agent, output_data: TriageOutput) -> Guard
     )
 
 
+# Function tools are stateless wrappers, so every TriageAgent shares these
+_TRIAGE_AGENT_TOOLS = (
+    function_tool(
+        func=get_story_details,
+        description_override="Get details about a Shortcut story"
+    ),
+    function_tool(
+        func=queue_enhancement_task,
+        description_override="Queue a story for enhancement processing"
+    ),
+    function_tool(
+        func=queue_analysis_task,
+        description_override="Queue a story for analysis processing"
+    )
+)
+
+
 class TriageAgent(BaseAgent[TriageOutput, Dict[str, Any]]):
     """
     Agent responsible for triaging incoming webhooks from Shortcut.
@@ -220,22 +253,6 @@ class TriageAgent(BaseAgent[TriageOutput, Dict[str, Any]]):
     def __init__(self):
         """Initialize the Triage Agent."""
         
-        # Create tools list using function_tool from the agents package
-        tools = [
-            function_tool(
-                func=get_story_details,
-                description_override="Get details about a Shortcut story"
-            ),
-            function_tool(
-                func=queue_enhancement_task,
-                description_override="Queue a story for enhancement processing"
-            ),
-            function_tool(
-                func=queue_analysis_task,
-                description_override="Queue a story for analysis processing"
-            )
-        ]
-        
         # Import the analysis and update agents for handoffs
         from shortcut_agents.analysis.analysis_agent import AnalysisAgent
         from shortcut_agents.update.update_agent import UpdateAgent
@@ -250,7 +267,7 @@ class TriageAgent(BaseAgent[TriageOutput, Dict[str, Any]]):
             input_guardrails=[validate_webhook_input],
             output_guardrails=[validate_triage_output],
             allowed_handoffs=["Analysis Agent", "Update Agent"],
-            tools=tools,
+            tools=list(_TRIAGE_AGENT_TOOLS),
             model_override=None
         )
         
@@ -277,7 +294,7 @@ class TriageAgent(BaseAgent[TriageOutput, Dict[str, Any]]):
         if result.processed and result.workflow:
             try:
                 if result.workflow == "enhance":
-                    logger.info(f"Handing off to Update Agent for enhancement")
+                    logger.info("Handing off to Update Agent for enhancement")
                     
                     # Import the update agent creator function
                     from shortcut_agents.update.update_agent import create_update_agent
@@ -312,7 +329,7 @@ class TriageAgent(BaseAgent[TriageOutput, Dict[str, Any]]):
                     }
                     
                 elif result.workflow in ["analyse", "analyze"]:
-                    logger.info(f"Handing off to Analysis Agent for analysis")
+                    logger.info("Handing off to Analysis Agent for analysis")
                     
                     # Import the analysis agent creator function
                     from shortcut_agents.analysis.analysis_agent import create_analysis_agent
@@ -346,7 +363,7 @@ class TriageAgent(BaseAgent[TriageOutput, Dict[str, Any]]):
                         }
                     }
             except Exception as e:
-                logger.error(f"Error during handoff: {str(e)}")
+                logger.error("Error during handoff: %s", e)
                 # Continue with no handoff
         
         # No handoff needed
@@ -382,23 +399,25 @@ class TriageAgent(BaseAgent[TriageOutput, Dict[str, Any]]):
             # Check for labels in the story data
             labels = []
             if hasattr(workspace_context, "story_data") and workspace_context.story_data:
-                story_labels = workspace_context.story_data.get("labels", [])
+                story_labels = workspace_context.story_data.get("labels") or ()
                 for label in story_labels:
-                    label_name = label.get("name", "").lower()
-                    logger.info(f"Found label in story data: {label_name}")
+                    label_name = _lower(label.get("name") or "")
+                    logger.info("Found label in story data: %s", label_name)
                     labels.append(label_name)
             
             # Log all found labels
-            logger.info(f"All labels found (lowercase): {labels}")
+            logger.info("All labels found (lowercase): %s", labels)
             
             # Determine workflow based on labels
             workflow = None
-            if "enhance" in labels:
+            handler = _match_label_handler(labels)
+            workflow_type = handler[0] if handler is not None else None
+            if workflow_type is WorkflowType.ENHANCE:
                 logger.info("Found 'enhance' label - selecting enhancement workflow")
                 workflow = "enhance"
                 workspace_context.workflow_type = WorkflowType.ENHANCE
                 logger.info("Setting workflow type to ENHANCE in context")
-            elif "analyse" in labels or "analyze" in labels:
+            elif workflow_type is WorkflowType.ANALYSE:
                 logger.info("Found 'analyse' or 'analyze' label - selecting analysis workflow")
                 workflow = "analyse"
                 workspace_context.workflow_type = WorkflowType.ANALYSE
@@ -423,17 +442,17 @@ class TriageAgent(BaseAgent[TriageOutput, Dict[str, Any]]):
             if result.processed and result.workflow:
                 try:
                     handoff_result = await self.process_and_handoff(result, workspace_context)
-                    logger.info(f"Handoff successful: {handoff_result}")
+                    logger.info("Handoff successful: %s", handoff_result)
                     return handoff_result
                 except Exception as e:
-                    logger.error(f"Error during handoff: {str(e)}")
+                    logger.error("Error during handoff: %s", e)
                     # Continue with no handoff
             
             # Create a standard response
             return {
                 "status": "success",
                 "agent": "triage",
-                "result": result.dict() if hasattr(result, "dict") else vars(result),
+                "result": result.to_dict(),
                 "metadata": {
                     "agent": "triage",
                     "model": self.get_model(),
@@ -444,13 +463,14 @@ class TriageAgent(BaseAgent[TriageOutput, Dict[str, Any]]):
                 }
             }
         except Exception as e:
-            logger.error(f"Error in simplified triage: {str(e)}")
+            logger.error("Error in simplified triage: %s", e)
             return self._create_error_result(str(e), workspace_context)
 
 
 # Function to get the appropriate model for triage
+@functools.lru_cache(maxsize=1)
 def get_triage_model() -> str:
-    """Get the appropriate model for the triage agent."""
+    """Get the appropriate model for the triage agent (resolved once per process)."""
     # Try environment variable first
     model = os.environ.get("MODEL_TRIAGE")
     if model:
@@ -460,51 +480,16 @@ def get_triage_model() -> str:
     return "gpt-3.5-turbo"
 
 
-def create_triage_agent() -> Agent:
+def _build_triage_agent() -> Agent:
     """
-    Create a triage agent using the OpenAI Agent SDK.
+    Build a new triage agent using the OpenAI Agent SDK.
     
     Returns:
         Agent instance
     """
-    # Import tools here to avoid circular imports
-    from tools.shortcut.shortcut_tools import get_story_details
-    
-    # Create function tools for the agent
-    tools = [
-        function_tool(
-            func=wrapped_get_story_details,
-            description_override="Get details of a story from Shortcut"
-        ),
-        function_tool(
-            func=wrapped_queue_analysis_task,
-            description_override="Queue a story for analysis"
-        ),
-        function_tool(
-            func=wrapped_queue_enhancement_task,
-            description_override="Queue a story for enhancement"
-        )
-    ]
-    
-    # Create analysis agent for handoff
-    from shortcut_agents.analysis.analysis_agent import create_analysis_agent
-    analysis_agent = Agent(
-        name="Analysis Agent",
-        instructions="You analyze Shortcut stories for quality and provide recommendations.",
-        handoff_description="Specialist agent for analyzing story quality"
-    )
-    
-    # Create update agent for handoff
-    from shortcut_agents.update.update_agent import create_update_agent
-    update_agent = Agent(
-        name="Update Agent",
-        instructions="You enhance Shortcut stories based on analysis results.",
-        handoff_description="Specialist agent for enhancing story content"
-    )
-    
     # Get the model to use
     model = get_triage_model()
-    logger.info(f"Using model {model} for triage agent")
+    logger.info("Using model %s for triage agent", model)
     
     # Create model settings
     model_settings = ModelSettings()
@@ -523,7 +508,7 @@ def create_triage_agent() -> Agent:
         instructions=TRIAGE_SYSTEM_MESSAGE,
         model=model,
         model_settings=model_settings,
-        tools=tools,
+        tools=list(_TRIAGE_FUNCTION_TOOLS),
         output_type=TriageOutput,
         # Disable handoffs to prevent duplicate processing
         handoffs=[]  # Empty list means no handoffs
@@ -532,6 +517,29 @@ def create_triage_agent() -> Agent:
     return agent
 
 
+# Shared triage agent, built on first use by create_triage_agent()
+_TRIAGE_AGENT_SINGLETON: Optional[Agent] = None
+_TRIAGE_AGENT_LOCK = threading.Lock()
+
+
+def create_triage_agent() -> Agent:
+    """
+    Get the triage agent, building it on first use.
+    
+    The agent only depends on process-wide configuration, so a single
+    instance is shared by every webhook.
+    
+    Returns:
+        Agent instance
+    """
+    global _TRIAGE_AGENT_SINGLETON
+    if _TRIAGE_AGENT_SINGLETON is None:
+        with _TRIAGE_AGENT_LOCK:
+            if _TRIAGE_AGENT_SINGLETON is None:
+                _TRIAGE_AGENT_SINGLETON = _build_triage_agent()
+    return _TRIAGE_AGENT_SINGLETON
+
+
 # Create a custom wrapper for the queue_analysis_task function to ensure API key is passed correctly
 async def wrapped_queue_analysis_task(workspace_id: str, story_id: str, api_key: str = None) -> Dict[str, Any]:
     """
@@ -548,7 +556,7 @@ async def wrapped_queue_analysis_task(workspace_id: str, story_id: str, api_key:
     # Log the API key being used (masked for security)
     if api_key:
         api_key_snippet = api_key[:4] + "..." + api_key[-4:] if len(api_key) > 8 else "***masked***"
-        logger.info(f"Using provided API key starting with {api_key_snippet} for workspace {workspace_id}")
+        logger.info("Using provided API key starting with %s for workspace %s", api_key_snippet, workspace_id)
     else:
         # If no API key is provided, try to get it from environment variables
         env_var_name = f"SHORTCUT_API_KEY_{workspace_id.upper()}"
@@ -558,9 +566,9 @@ async def wrapped_queue_analysis_task(workspace_id: str, story_id: str, api_key:
         
         if api_key:
             api_key_snippet = api_key[:4] + "..." + api_key[-4:] if len(api_key) > 8 else "***masked***"
-            logger.info(f"Using environment API key starting with {api_key_snippet} for workspace {workspace_id}")
+            logger.info("Using environment API key starting with %s for workspace %s", api_key_snippet, workspace_id)
         else:
-            logger.warning(f"No API key provided for workspace {workspace_id}")
+            logger.warning("No API key provided for workspace %s", workspace_id)
             raise ValueError(f"No API key provided for workspace {workspace_id}")
     
     # Call the original function with the correct API key
@@ -583,7 +591,7 @@ async def wrapped_queue_enhancement_task(workspace_id: str, story_id: str, api_k
     # Log the API key being used (masked for security)
     if api_key:
         api_key_snippet = api_key[:4] + "..." + api_key[-4:] if len(api_key) > 8 else "***masked***"
-        logger.info(f"Using provided API key starting with {api_key_snippet} for workspace {workspace_id}")
+        logger.info("Using provided API key starting with %s for workspace %s", api_key_snippet, workspace_id)
     else:
         # If no API key is provided, try to get it from environment variables
         env_var_name = f"SHORTCUT_API_KEY_{workspace_id.upper()}"
@@ -593,9 +601,9 @@ async def wrapped_queue_enhancement_task(workspace_id: str, story_id: str, api_k
         
         if api_key:
             api_key_snippet = api_key[:4] + "..." + api_key[-4:] if len(api_key) > 8 else "***masked***"
-            logger.info(f"Using environment API key starting with {api_key_snippet} for workspace {workspace_id}")
+            logger.info("Using environment API key starting with %s for workspace %s", api_key_snippet, workspace_id)
         else:
-            logger.warning(f"No API key provided for workspace {workspace_id}")
+            logger.warning("No API key provided for workspace %s", workspace_id)
             raise ValueError(f"No API key provided for workspace {workspace_id}")
     
     # Call the original function with the correct API key
@@ -617,22 +625,309 @@ async def wrapped_get_story_details(story_id: str, api_key: str = None) -> Dict[
     # Log the API key being used (masked for security)
     if api_key:
         api_key_snippet = api_key[:4] + "..." + api_key[-4:] if len(api_key) > 8 else "***masked***"
-        logger.info(f"Using provided API key starting with {api_key_snippet} for story {story_id}")
+        logger.info("Using provided API key starting with %s for story %s", api_key_snippet, story_id)
     else:
         # If no API key is provided, try to get it from environment variables
         api_key = os.environ.get("SHORTCUT_API_KEY")
         
         if api_key:
             api_key_snippet = api_key[:4] + "..." + api_key[-4:] if len(api_key) > 8 else "***masked***"
-            logger.info(f"Using environment API key starting with {api_key_snippet} for story {story_id}")
+            logger.info("Using environment API key starting with %s for story %s", api_key_snippet, story_id)
         else:
-            logger.warning(f"No API key provided for story {story_id}")
+            logger.warning("No API key provided for story %s", story_id)
             raise ValueError(f"No API key provided for story {story_id}")
     
     # Call the original function with the correct API key
     return await get_story_details(story_id, api_key)
 
 
+# Function tools for the standalone triage agent, built once at import
+_TRIAGE_FUNCTION_TOOLS = (
+    function_tool(
+        func=wrapped_get_story_details,
+        description_override="Get details of a story from Shortcut"
+    ),
+    function_tool(
+        func=wrapped_queue_analysis_task,
+        description_override="Queue a story for analysis"
+    ),
+    function_tool(
+        func=wrapped_queue_enhancement_task,
+        description_override="Queue a story for enhancement"
+    )
+)
+
+
+# Label -> (workflow, queueing function, update type), matched case-insensitively.
+# Labels are matched exactly, so each label costs one hash lookup no matter
+# how many triggers are registered here.
+_LABEL_HANDLERS: Dict[str, Tuple[WorkflowType, Callable[..., Any], str]] = {
+    "enhance": (WorkflowType.ENHANCE, queue_enhancement_task, "enhancement"),
+    "analyse": (WorkflowType.ANALYSE, queue_analysis_task, "analysis"),
+    "analyze": (WorkflowType.ANALYSE, queue_analysis_task, "analysis"),
+}
+
+# Agent that takes over each workflow, as in TriageAgent.process_and_handoff
+_NEXT_AGENTS: Dict[WorkflowType, str] = {
+    WorkflowType.ENHANCE: "Update Agent",
+    WorkflowType.ANALYSE: "Analysis Agent",
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _lower(name: str) -> str:
+    """Lowercase a label name, caching the handful of names real workspaces use."""
+    return name.lower()
+
+
+def _match_label_handler(label_names: Iterable[str]) -> Optional[Tuple[WorkflowType, Callable[..., Any], str]]:
+    """
+    Find the label handler triggered by a set of lowercased label names.
+    
+    Enhancement takes precedence over analysis, so the scan stops at the
+    first enhance label.
+    
+    Args:
+        label_names: Lowercased label names
+        
+    Returns:
+        The matching _LABEL_HANDLERS entry, or None if no trigger label is present
+    """
+    found = None
+    for name in label_names:
+        handler = _LABEL_HANDLERS.get(name)
+        if handler is None:
+            continue
+        if handler[0] is WorkflowType.ENHANCE:
+            return handler
+        if found is None:
+            found = handler
+    return found
+
+
+def _rejection(reason: str, workspace_context: WorkspaceContext, **extra: Any) -> Dict[str, Any]:
+    """
+    Build the result for a webhook that was not processed.
+    
+    Args:
+        reason: Why the webhook was not processed
+        workspace_context: Workspace context
+        **extra: Additional result fields
+        
+    Returns:
+        Triage result dictionary
+    """
+    return {
+        "processed": False,
+        "reason": reason,
+        "workspace_id": workspace_context.workspace_id,
+        "story_id": workspace_context.story_id,
+        **extra
+    }
+
+
+def _has_label_changes(webhook_data: Dict[str, Any]) -> bool:
+    """
+    Check whether a webhook carries any label changes at all.
+    
+    Only dict lookups are done, so most irrelevant events (comments,
+    workflow moves, estimate changes) can be rejected before any parsing.
+    
+    Args:
+        webhook_data: Webhook data to inspect
+        
+    Returns:
+        True if the webhook changes labels in either supported format
+    """
+    if "labels" in (webhook_data.get("changes") or {}):
+        return True
+    for action in webhook_data.get("actions") or ():
+        action_changes = action.get("changes")
+        if action_changes and ("labels" in action_changes or "label_ids" in action_changes):
+            return True
+    return False
+
+
+def _extract_labels_v1(webhook_data: Dict[str, Any]) -> Iterator[str]:
+    """
+    Lazily yield the lowercased names of labels added by a legacy webhook.
+    
+    Legacy payloads carry a top-level "changes.labels.adds" list of label
+    objects.
+    
+    Args:
+        webhook_data: Webhook data to inspect
+        
+    Yields:
+        Added label names (lowercased)
+    """
+    changes = webhook_data.get("changes")
+    if changes:
+        labels_change = changes.get("labels")
+        if labels_change:
+            for label in labels_change.get("adds") or ():
+                if isinstance(label, dict):
+                    yield _lower(label.get("name") or "")
+
+
+def _extract_labels_v2(webhook_data: Dict[str, Any]) -> Iterator[str]:
+    """
+    Lazily yield the lowercased names of labels added by an actions webhook.
+    
+    Added labels arrive in "actions[].changes" either as names or as IDs
+    that are resolved through the "references" section. Names are yielded
+    in webhook order so callers can stop at the first match.
+    
+    Args:
+        webhook_data: Webhook data to inspect
+        
+    Yields:
+        Added label names (lowercased)
+    """
+    # Label ID -> name map, built on first use (stays None if no references were sent)
+    label_id_to_name = None
+    references = webhook_data.get("references")
+    
+    for action in webhook_data["actions"] or ():
+        action_changes = action.get("changes")
+        if not action_changes:
+            continue
+        
+        # Label IDs, with names provided in the references section
+        label_ids_change = action_changes.get("label_ids")
+        if label_ids_change:
+            label_id_adds = label_ids_change.get("adds")
+            if label_id_adds:
+                if references is not None:
+                    if label_id_to_name is None:
+                        label_id_to_name = {
+                            ref.get("id"): ref.get("name")
+                            for ref in references or ()
+                            if ref.get("entity_type") == "label"
+                        }
+                    for label_id_obj in label_id_adds:
+                        key = label_id_obj.get("id") if isinstance(label_id_obj, dict) else label_id_obj
+                        name = label_id_to_name.get(key)
+                        if name:
+                            yield _lower(name)
+                else:
+                    for label_id_obj in label_id_adds:
+                        if isinstance(label_id_obj, dict):
+                            name = label_id_obj.get("name")
+                            if name:
+                                yield _lower(name)
+        
+        # Also check direct labels field
+        labels_change = action_changes.get("labels")
+        if labels_change:
+            for label in labels_change.get("adds") or ():
+                if isinstance(label, dict):
+                    yield _lower(label.get("name") or "")
+
+
+def _label_extractor(webhook_data: Dict[str, Any]) -> Callable[[Dict[str, Any]], Iterator[str]]:
+    """
+    Pick the label extractor for a webhook's payload shape.
+    
+    Args:
+        webhook_data: Webhook data to inspect
+        
+    Returns:
+        _extract_labels_v2 for "actions" payloads, _extract_labels_v1 otherwise
+    """
+    return _extract_labels_v2 if "actions" in webhook_data else _extract_labels_v1
+
+
+async def triage_by_labels(webhook_data: Dict[str, Any], workspace_context: WorkspaceContext) -> Optional[Dict[str, Any]]:
+    """
+    Triage a webhook directly from its added labels, without the LLM.
+    
+    When an "enhance", "analyse" or "analyze" label was added the decision
+    is unambiguous, so the matching task is queued immediately.
+    
+    Args:
+        webhook_data: Webhook data to process
+        workspace_context: Workspace context
+        
+    Returns:
+        Triage decision, a rejection if the webhook has no story ID, or None
+        if the labels don't determine a workflow
+    """
+    extractor = _label_extractor(webhook_data)
+    handler = _match_label_handler(extractor(webhook_data))
+    if handler is None:
+        return None
+    
+    story_id = workspace_context.story_id or str(webhook_data.get("id") or webhook_data.get("primary_id") or "")
+    if not story_id:
+        # Never queue a task that no agent could act on
+        logger.warning("Label fast path: %s label added but no story ID in webhook", handler[0].value)
+        return _rejection("Could not extract story ID", workspace_context)
+    
+    logger.info("Label fast path: %s workflow triggered for story %s", handler[0].value, story_id)
+    return await _queue_workflow(handler, story_id, workspace_context)
+
+
+async def triage_by_workflow(workflow_type: str, workspace_context: WorkspaceContext) -> Dict[str, Any]:
+    """
+    Queue a known workflow for the context's story, skipping webhook triage.
+    
+    For callers that already know the workflow, such as the test pipeline,
+    so no webhook payload has to be built and classified.
+    
+    Args:
+        workflow_type: Workflow label ("enhance", "analyse" or "analyze")
+        workspace_context: Workspace context with the story ID set
+        
+    Returns:
+        Triage decision, as triage_by_labels would return it
+        
+    Raises:
+        ValueError: If the workflow type is not recognized or no story ID is set
+    """
+    handler = _LABEL_HANDLERS.get(workflow_type.lower())
+    if handler is None:
+        raise ValueError(f"Unknown workflow type: {workflow_type}")
+    if not workspace_context.story_id:
+        raise ValueError("Workspace context has no story ID")
+    return await _queue_workflow(handler, workspace_context.story_id, workspace_context)
+
+
+async def _queue_workflow(
+    handler: Tuple[WorkflowType, Callable[..., Any], str],
+    story_id: str,
+    workspace_context: WorkspaceContext
+) -> Dict[str, Any]:
+    """
+    Queue the task for a matched label handler and record the triage decision.
+    
+    Args:
+        handler: The _LABEL_HANDLERS entry to run
+        story_id: ID of the story to process
+        workspace_context: Workspace context
+        
+    Returns:
+        Triage decision
+    """
+    workflow, queue_task, update_type = handler
+    task_info = await queue_task(workspace_context.workspace_id, story_id, workspace_context.api_key)
+    workspace_context.set_workflow_type(workflow)
+    
+    decision = {
+        "processed": True,
+        "workflow": workflow.value,
+        "story_id": story_id,
+        "workspace_id": workspace_context.workspace_id,
+        "reason": None,
+        "next_steps": [f"Queued {update_type} task"],
+        "task_info": task_info,
+        "next_agent": _NEXT_AGENTS[workflow],
+        "update_type": update_type
+    }
+    workspace_context.triage_result = decision
+    return decision
+
+
 async def process_webhook(webhook_data: Dict[str, Any], workspace_context: WorkspaceContext) -> Dict[str, Any]:
     """
     Process a webhook using the triage agent.
@@ -644,17 +939,32 @@ async def process_webhook(webhook_data: Dict[str, Any], workspace_context: Works
     Returns:
         Processing result
     """
-    logger.info("Processing webhook with triage agent")
+    # Cheap existence check before any parsing or agent setup
+    if not _has_label_changes(webhook_data):
+        return {"result": _rejection("No label changes", workspace_context)}
+    
+    # Checked once; INFO is usually filtered out in production
+    _info_on = logger.isEnabledFor(logging.INFO)
+    if _info_on:
+        logger.info("Processing webhook with triage agent")
     
     try:
-        # Create the triage agent
+        # Decide from the added labels when possible, skipping the LLM round-trip
+        triage_decision = await triage_by_labels(webhook_data, workspace_context)
+        if triage_decision is not None:
+            return {
+                "result": triage_decision,
+                "trace_id": f"Triage-{workspace_context.workspace_id}-{workspace_context.story_id}"
+            }
+        
+        # Reuse the shared triage agent
         agent = create_triage_agent()
         
         # Get API key for the workspace
         api_key = workspace_context.api_key
-        if api_key:
+        if api_key and _info_on:
             api_key_snippet = api_key[:4] + "..." + api_key[-4:] if len(api_key) > 8 else "***masked***"
-            logger.info(f"Using API key starting with {api_key_snippet} for workspace {workspace_context.workspace_id}")
+            logger.info("Using API key starting with %s for workspace %s", api_key_snippet, workspace_context.workspace_id)
         
         # Create a trace for the triage agent
         trace_id = f"Triage-{workspace_context.workspace_id}-{workspace_context.story_id}"
@@ -668,13 +978,15 @@ async def process_webhook(webhook_data: Dict[str, Any], workspace_context: Works
         }
         
         # Run the agent
-        logger.info("Running triage agent using OpenAI Agent SDK without handoffs")
+        if _info_on:
+            logger.info("Running triage agent using OpenAI Agent SDK without handoffs")
         try:
             # Try with trace_id parameter
             result = await Runner.run(agent, webhook_data, context=context, trace_id=trace_id)
         except TypeError:
             # Fall back to running without trace_id if not supported
-            logger.info("Falling back to running without trace_id parameter")
+            if _info_on:
+                logger.info("Falling back to running without trace_id parameter")
             result = await Runner.run(agent, webhook_data, context=context)
             
         # Extract the final output
@@ -682,22 +994,22 @@ async def process_webhook(webhook_data: Dict[str, Any], workspace_context: Works
             triage_decision = result.final_output
             
             # Log the triage decision
-            logger.info(f"Triage decision: {triage_decision.get('workflow', 'skip processing')}")
+            if _info_on:
+                logger.info("Triage decision: %s", triage_decision.get('workflow', 'skip processing'))
         else:
-            triage_decision = {"processed": False, "reason": "No output from triage agent"}
+            triage_decision = _rejection("No output from triage agent", workspace_context)
         
         return {
             "result": triage_decision,
             "trace_id": trace_id
         }
     except Exception as e:
-        logger.error(f"Error processing webhook with triage agent: {str(e)}")
+        logger.error("Error processing webhook with triage agent: %s", e)
         logger.error(traceback.format_exc())
         
-        # Return a simple result for error cases
-        return {
-            "result": {
-                "processed": False,
-                "reason": f"Error: {str(e)}"
-            }
-        }
\ No newline at end of file
+        # Return a simple result for error cases; "downstream_error" flags
+        # transport and API failures for the caller's circuit breaker
+        result = {"result": _rejection(f"Error: {str(e)}", workspace_context), "error": str(e)}
+        if is_downstream_failure(e):
+            result["downstream_error"] = True
+        return result
@@ -2,6 +2,12 @@
 Update Agent for applying changes to Shortcut stories.
 """
 
-from shortcut_agents.update.update_agent import create_update_agent, process_update
+__all__ = ["create_update_agent", "process_update"]
 
-__all__ = ["create_update_agent", "process_update"]
\ No newline at end of file
+
+def __getattr__(name):
+    """Import the Update Agent on first access so importing the package stays cheap."""
+    if name in __all__:
+        from shortcut_agents.update import update_agent
+        return getattr(update_agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -2,21 +2,50 @@
 Data models for the Update Agent.
 """
 
+import dataclasses
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Literal, Union, Any
+from typing import Annotated, List, Dict, Optional, Literal, Union, Any
 
 
 # Import the Analysis model from the analysis module instead of duplicating it
 from shortcut_agents.analysis.models import AnalysisResult
 
 
-class EnhancementResult(BaseModel):
+def _slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ (dataclass(slots=True) needs Python 3.10+).
+    
+    Args:
+        cls: Class already processed by @dataclass
+        
+    Returns:
+        Equivalent dataclass whose instances have no __dict__
+    """
+    field_names = tuple(f.name for f in dataclasses.fields(cls))
+    cls_dict = {k: v for k, v in cls.__dict__.items() if k not in field_names}
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    cls_dict["__slots__"] = field_names
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+# Internal result records are plain slotted dataclasses: they are built by our
+# own code, so they skip pydantic's per-field validation on construction.
+# Field descriptions are kept via Annotated so the agent's output schema is unchanged.
+
+@_slotted
+@dataclasses.dataclass
+class EnhancementResult:
     """Enhancement results from the Enhancement Agent."""
     
-    enhanced_title: Optional[str] = Field(None, description="Enhanced story title")
-    enhanced_description: Optional[str] = Field(None, description="Enhanced story description")
-    enhanced_acceptance_criteria: Optional[str] = Field(None, description="Enhanced acceptance criteria")
-    changes_made: List[str] = Field(..., description="List of changes made during enhancement")
+    changes_made: Annotated[List[str], Field(description="List of changes made during enhancement")]
+    enhanced_title: Annotated[Optional[str], Field(description="Enhanced story title")] = None
+    enhanced_description: Annotated[Optional[str], Field(description="Enhanced story description")] = None
+    enhanced_acceptance_criteria: Annotated[Optional[str], Field(description="Enhanced acceptance criteria")] = None
+    
+    def model_dump(self) -> Dict[str, Any]:
+        """Convert the result to a dict (mirrors the pydantic API used by callers)."""
+        return dataclasses.asdict(self)
 
 
 class UpdateInput(BaseModel):
@@ -29,15 +58,21 @@ class UpdateInput(BaseModel):
     enhancement_result: Optional[EnhancementResult] = Field(None, description="Enhancement results if update_type is 'enhancement'")
 
 
-class UpdateResult(BaseModel):
+@_slotted
+@dataclasses.dataclass
+class UpdateResult:
     """Output from the Update Agent."""
     
-    success: bool = Field(..., description="Whether the update was successful")
-    story_id: str = Field(..., description="ID of the updated story")
-    workspace_id: str = Field(..., description="ID of the workspace containing the story")
-    update_type: Literal["analysis", "enhancement"] = Field(..., description="Type of update performed")
-    fields_updated: List[str] = Field(..., description="List of fields that were updated")
-    tags_added: List[str] = Field(..., description="Tags added to the story")
-    tags_removed: List[str] = Field(..., description="Tags removed from the story")
-    comment_added: bool = Field(..., description="Whether a comment was added")
-    error_message: Optional[str] = Field(None, description="Error message if the update failed")
\ No newline at end of file
+    success: Annotated[bool, Field(description="Whether the update was successful")]
+    story_id: Annotated[str, Field(description="ID of the updated story")]
+    workspace_id: Annotated[str, Field(description="ID of the workspace containing the story")]
+    update_type: Annotated[Literal["analysis", "enhancement"], Field(description="Type of update performed")]
+    fields_updated: Annotated[List[str], Field(description="List of fields that were updated")]
+    tags_added: Annotated[List[str], Field(description="Tags added to the story")]
+    tags_removed: Annotated[List[str], Field(description="Tags removed from the story")]
+    comment_added: Annotated[bool, Field(description="Whether a comment was added")]
+    error_message: Annotated[Optional[str], Field(description="Error message if the update failed")] = None
+    
+    def model_dump(self) -> Dict[str, Any]:
+        """Convert the result to a dict (mirrors the pydantic API used by callers)."""
+        return dataclasses.asdict(self)
@@ -4,9 +4,9 @@ Tools for the Update Agent.
 
 import logging
 from typing import List, Dict, Any, Optional
-import json
 
 from tools.shortcut.shortcut_tools import update_story, add_comment, get_story_details
+from utils import json_fast
 
 # Set up logging
 logger = logging.getLogger("update_agent.tools")
@@ -51,14 +51,14 @@ async def update_story_content(
         fields_updated.append("acceptance_criteria")
     
     if not update_data:
-        logger.warning(f"No content updates provided for story {story_id}")
+        logger.warning("No content updates provided for story %s", story_id)
         return {"message": "No updates provided", "fields_updated": []}
     
     try:
         # Update the story
         updated_story = await update_story(story_id, api_key, update_data)
         
-        logger.info(f"Updated story {story_id} with fields: {', '.join(fields_updated)}")
+        logger.info("Updated story %s with fields: %s", story_id, ', '.join(fields_updated))
         
         return {
             "story": updated_story,
@@ -66,7 +66,7 @@ async def update_story_content(
             "success": True
         }
     except Exception as e:
-        logger.error(f"Error updating story content: {str(e)}")
+        logger.error("Error updating story content: %s", e)
         return {
             "error": str(e),
             "fields_updated": [],
@@ -93,12 +93,46 @@ async def update_story_labels(
         Updated story data with label changes
     """
     # For better UX, use the term "tag" in logs instead of "label"
-    logger.info(f"Updating tags for story {story_id}: adding {labels_to_add}, removing {labels_to_remove}")
+    logger.info("Updating tags for story %s: adding %s, removing %s", story_id, labels_to_add, labels_to_remove)
     
     try:
         # First, get the current story to get existing labels
         story_data = await get_story_details(story_id, api_key)
-        current_labels = story_data.get("labels", [])
+    except Exception as e:
+        logger.error("Error updating story labels: %s", e)
+        return {
+            "error": str(e),
+            "added_labels": [],
+            "removed_labels": [],
+            "success": False
+        }
+    
+    return await apply_label_changes(
+        story_id, api_key, story_data.get("labels", []), labels_to_add, labels_to_remove
+    )
+
+
+async def apply_label_changes(
+    story_id: str,
+    api_key: str,
+    current_labels: List[Dict[str, Any]],
+    labels_to_add: List[str],
+    labels_to_remove: List[str]
+) -> Dict[str, Any]:
+    """
+    Update the labels on a Shortcut story whose current labels are already known.
+    
+    Args:
+        story_id: ID of the story to update
+        api_key: Shortcut API key
+        current_labels: Labels currently on the story
+        labels_to_add: List of label names to add
+        labels_to_remove: List of label names to remove
+        
+    Returns:
+        Updated story data with label changes
+    """
+    try:
         current_label_names = [label["name"] for label in current_labels]
         
         # Add new labels that aren't already present
@@ -117,7 +151,8 @@ async def update_story_labels(
         }
         
         # Log the update data for debugging
-        logger.info(f"Label update data: {json.dumps(update_data)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Label update data: %s", json_fast.dumps(update_data))
         
         # Update the story
         updated_story = await update_story(story_id, api_key, update_data)
@@ -129,7 +164,7 @@ async def update_story_labels(
             "success": True
         }
     except Exception as e:
-        logger.error(f"Error updating story labels: {str(e)}")
+        logger.error("Error updating story labels: %s", e)
         return {
             "error": str(e),
             "added_labels": [],
@@ -166,14 +201,14 @@ async def add_update_comment(
         # Add the comment
         comment_result = await add_comment(story_id, api_key, formatted_comment)
         
-        logger.info(f"Added {update_type} comment to story {story_id}")
+        logger.info("Added %s comment to story %s", update_type, story_id)
         
         return {
             "comment": comment_result,
             "success": True
         }
     except Exception as e:
-        logger.error(f"Error adding comment to story: {str(e)}")
+        logger.error("Error adding comment to story: %s", e)
         return {
             "error": str(e),
             "success": False
@@ -7,19 +7,37 @@ analysis or enhancement results, managing tags, and providing status updates.
 This version is refactored to use the BaseAgent implementation.
 """
 
+import asyncio
 import logging
 import datetime
+import functools
+import os
+import threading
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 
-from shortcut_agents.base_agent import BaseAgent, BaseAgentHooks, FunctionTool
+from shortcut_agents.base_agent import BaseAgent, BaseAgentHooks, FunctionTool, _get_runner, has_openai_key
+from shortcut_agents.guardrail import input_guardrail, output_guardrail, GuardrailFunctionOutput
 from shortcut_agents.update.models import UpdateResult, AnalysisResult, EnhancementResult
+from shortcut_agents.update.tools import (
+    update_story_content,
+    update_story_labels,
+    apply_label_changes,
+    add_update_comment,
+    format_analysis_comment,
+    format_enhancement_comment
+)
 from tools.shortcut.shortcut_tools import get_story_details
 from context.workspace.workspace_context import WorkspaceContext
+from config import get_config
+from utils import json_fast
 
 # Set up logging
 logger = logging.getLogger("update_agent")
 
+# Timestamps are recorded in UTC
+_UTC = datetime.timezone.utc
+
 # Update Agent system message
 UPDATE_SYSTEM_MESSAGE = """
 You are the Update Agent for the Shortcut Enhancement System. Your role is to apply changes to stories
@@ -62,13 +80,166 @@ class UpdateAgentHooks(BaseAgentHooks[UpdateResult]):
             # Fallback
             result_dict = vars(result)
             
-        # Store the update results in workspace context
+        # Store the update results in workspace context (UpdateAgent reuses this dict)
         workspace_context.set_update_results({
             "result": result_dict,
-            "timestamp": datetime.datetime.now().isoformat()
-        })
+            "timestamp": datetime.datetime.now(_UTC).isoformat()
+        }, source=result)
+        
+        logger.info("Stored update results for story %s", workspace_context.story_id)
+
+
+# Fields every update request must carry, and the update types the agent handles
+_REQUIRED_FIELDS = frozenset({"story_id", "workspace_id", "update_type"})
+_VALID_UPDATE_TYPES = frozenset({"analysis", "enhancement"})
+
+
+def _invalid(error_message: str) -> GuardrailFunctionOutput:
+    """Build a guardrail result that trips on a validation failure."""
+    logger.error(error_message)
+    return GuardrailFunctionOutput(
+        output_info={"valid": False, "message": error_message},
+        tripwire_triggered=True
+    )
+
+
+def get_parsed_input(ctx: Any, input_data: Any) -> Optional[Any]:
+    """
+    Get the already decoded form of an agent input from the run context.
+    
+    Args:
+        ctx: The SDK run context wrapper
+        input_data: The input as received from the SDK
         
-        logger.info(f"Stored update results for story {workspace_context.story_id}")
+    Returns:
+        The decoded input, or None if it has not been decoded for this run
+    """
+    workspace_context = getattr(ctx, "context", None)
+    if isinstance(workspace_context, WorkspaceContext):
+        return workspace_context.get_parsed_input(input_data)
+    return None
+
+
+@input_guardrail
+async def validate_update_input(ctx, agent, input_data):
+    """
+    Validate the update input data.
+    
+    Only update requests (inputs carrying an update_type) are checked; other
+    inputs, such as enhancement generation from the worker, pass through.
+    """
+    data = get_parsed_input(ctx, input_data)
+    if data is None:
+        try:
+            data = json_fast.loads(input_data) if isinstance(input_data, (str, bytes)) else input_data
+        except json_fast.JSONDecodeError:
+            return _invalid("Invalid JSON in input data")
+        workspace_context = getattr(ctx, "context", None)
+        if isinstance(workspace_context, WorkspaceContext):
+            workspace_context.set_parsed_input(input_data, data)
+    
+    if isinstance(data, dict) and "update_type" in data:
+        missing_fields = _REQUIRED_FIELDS - data.keys()
+        if missing_fields:
+            return _invalid(f"Missing required fields: {', '.join(sorted(missing_fields))}")
+        
+        update_type = data["update_type"]
+        if update_type not in _VALID_UPDATE_TYPES:
+            return _invalid(f"Invalid update_type: {update_type}, must be one of {sorted(_VALID_UPDATE_TYPES)}")
+    
+    return GuardrailFunctionOutput(
+        output_info={"valid": True, "message": "Input validation successful"},
+        tripwire_triggered=False
+    )
+
+
+@output_guardrail
+async def validate_update_output(ctx, agent, output):
+    """Validate the update output data."""
+    if isinstance(output, UpdateResult) and output.update_type not in _VALID_UPDATE_TYPES:
+        return _invalid(f"Invalid update_type in output: {output.update_type}")
+    
+    return GuardrailFunctionOutput(
+        output_info={"valid": True, "message": "Output validation successful"},
+        tripwire_triggered=False
+    )
+
+
+# Function tools for the Update Agent, built on first use by _get_update_tools()
+_UPDATE_TOOLS: Optional[Tuple[Any, ...]] = None
+
+
+def _get_update_tools() -> Tuple[Any, ...]:
+    """
+    Build the Update Agent's function tools once, importing the SDK helper lazily.
+    
+    Returns:
+        Tuple of function tools shared by every Update Agent
+    """
+    global _UPDATE_TOOLS
+    if _UPDATE_TOOLS is not None:
+        return _UPDATE_TOOLS
+    
+    try:
+        from agents import function_tool
+    
+        tools = (
+            function_tool(
+                func=get_story_details,  # Fixed: get_story -> get_story_details
+                description_override="Get details of a Shortcut story"
+            ),
+            function_tool(
+                func=update_story_content,
+                description_override="Update the content of a Shortcut story (title, description, acceptance criteria)"
+            ),
+            function_tool(
+                func=update_story_labels,
+                description_override="Update the labels/tags on a Shortcut story"
+            ),
+            function_tool(
+                func=add_update_comment,
+                description_override="Add a comment to a Shortcut story with update information"
+            ),
+            function_tool(
+                func=format_analysis_comment,
+                description_override="Format analysis results into a structured comment"
+            ),
+            function_tool(
+                func=format_enhancement_comment,
+                description_override="Format enhancement results into a structured comment"
+            )
+        )
+    except ImportError:
+        # Fallback to direct FunctionTool initialization
+        tools = (
+            FunctionTool(
+                function=get_story_details,  # Fixed: get_story -> get_story_details
+                description="Get details of a Shortcut story"
+            ),
+            FunctionTool(
+                function=update_story_content,
+                description="Update the content of a Shortcut story (title, description, acceptance criteria)"
+            ),
+            FunctionTool(
+                function=update_story_labels,
+                description="Update the labels/tags on a Shortcut story"
+            ),
+            FunctionTool(
+                function=add_update_comment,
+                description="Add a comment to a Shortcut story with update information"
+            ),
+            FunctionTool(
+                function=format_analysis_comment,
+                description="Format analysis results into a structured comment"
+            ),
+            FunctionTool(
+                function=format_enhancement_comment,
+                description="Format enhancement results into a structured comment"
+            )
+        )
+    
+    _UPDATE_TOOLS = tools
+    return tools
 
 
 # Simplified implementation of the Update Agent using the BaseAgent
@@ -79,102 +250,6 @@ class UpdateAgent(BaseAgent[UpdateResult, Dict[str, Any]]):
     
     def __init__(self):
         """Initialize the Update Agent."""
-        
-        # Import tools here to avoid circular imports
-        from shortcut_agents.update.tools import (
-            update_story_content,
-            update_story_labels,
-            add_update_comment,
-            format_analysis_comment,
-            format_enhancement_comment
-        )
-        
-        # Input validation function
-        from shortcut_agents.guardrail import input_guardrail, GuardrailFunctionOutput
-        
-        @input_guardrail
-        async def validate_update_input(ctx, agent, input_data):
-            """Validate the update input data."""
-            # Implementation similar to previous version
-            # ...
-            return GuardrailFunctionOutput(
-                output_info={"valid": True, "message": "Input validation successful"},
-                tripwire_triggered=False
-            )
-        
-        # Output validation function
-        from shortcut_agents.guardrail import output_guardrail
-        
-        @output_guardrail
-        async def validate_update_output(ctx, agent, output):
-            """Validate the update output data."""
-            # Implementation similar to previous version
-            # ...
-            return GuardrailFunctionOutput(
-                output_info={"valid": True, "message": "Output validation successful"},
-                tripwire_triggered=False
-            )
-        
-        # Import function_tool from agents if available
-        try:
-            from agents import function_tool, Runner, trace
-            
-            # Create tools list using function_tool
-            tools = [
-                function_tool(
-                    func=get_story_details,  # Fixed: get_story -> get_story_details
-                    description_override="Get details of a Shortcut story"
-                ),
-                function_tool(
-                    func=update_story_content,
-                    description_override="Update the content of a Shortcut story (title, description, acceptance criteria)"
-                ),
-                function_tool(
-                    func=update_story_labels,
-                    description_override="Update the labels/tags on a Shortcut story"
-                ),
-                function_tool(
-                    func=add_update_comment,
-                    description_override="Add a comment to a Shortcut story with update information"
-                ),
-                function_tool(
-                    func=format_analysis_comment,
-                    description_override="Format analysis results into a structured comment"
-                ),
-                function_tool(
-                    func=format_enhancement_comment,
-                    description_override="Format enhancement results into a structured comment"
-                )
-            ]
-        except ImportError:
-            # Fallback to direct FunctionTool initialization
-            tools = [
-                FunctionTool(
-                    function=get_story_details,  # Fixed: get_story -> get_story_details
-                    description="Get details of a Shortcut story"
-                ),
-                FunctionTool(
-                    function=update_story_content,
-                    description="Update the content of a Shortcut story (title, description, acceptance criteria)"
-                ),
-                FunctionTool(
-                    function=update_story_labels,
-                    description="Update the labels/tags on a Shortcut story"
-                ),
-                FunctionTool(
-                    function=add_update_comment,
-                    description="Add a comment to a Shortcut story with update information"
-                ),
-                FunctionTool(
-                    function=format_analysis_comment,
-                    description="Format analysis results into a structured comment"
-                ),
-                FunctionTool(
-                    function=format_enhancement_comment,
-                    description="Format enhancement results into a structured comment"
-                )
-            ]
-        
         # Initialize the base agent
         super().__init__(
             agent_type="update",
@@ -185,10 +260,26 @@ class UpdateAgent(BaseAgent[UpdateResult, Dict[str, Any]]):
             input_guardrails=[validate_update_input],
             output_guardrails=[validate_update_output],
             allowed_handoffs=[],  # Update Agent is typically the final agent
-            tools=tools,
+            tools=list(_get_update_tools()),
             model_override=None
         )
     
+    def _process_result(self, result: Any, workspace_context: WorkspaceContext) -> Dict[str, Any]:
+        """
+        Process the update result, reusing the dict stored by UpdateAgentHooks.
+        
+        Args:
+            result: The agent execution result
+            workspace_context: Workspace context
+            
+        Returns:
+            Dictionary with processed results
+        """
+        result_dict = workspace_context.dumped_update_result(result)
+        if result_dict is not None:
+            result = result_dict
+        return super()._process_result(result, workspace_context)
+    
     async def run_simplified(self, input_data: Dict[str, Any], workspace_context: WorkspaceContext) -> Dict[str, Any]:
         """
         Run a simplified version of the update agent for development/testing.
@@ -242,34 +333,92 @@ class UpdateAgent(BaseAgent[UpdateResult, Dict[str, Any]]):
         return self._process_result(result, workspace_context)
 
 
+@functools.lru_cache(maxsize=1)
+def _config_update_model() -> str:
+    """Get the Update Agent model from configuration (resolved once per process)."""
+    return get_config().get("models", {}).get("update", "gpt-3.5-turbo")
+
+
+def get_update_model() -> str:
+    """Get the model to use for the Update Agent from the environment or configuration."""
+    # The environment override stays dynamic; only the config lookup is cached
+    return os.environ.get("MODEL_UPDATE") or _config_update_model()
+
+
+# Shared Update Agents keyed by model name, built on first use by create_update_agent()
+_AGENT_SINGLETONS: Dict[str, UpdateAgent] = {}
+_AGENT_SINGLETONS_LOCK = threading.Lock()
+
+
 # Convenience function to create an update agent
 def create_update_agent() -> UpdateAgent:
     """
-    Create and configure the Update Agent.
+    Get the Update Agent for the configured model, building it on first use.
+    
+    The agent holds no per-request state, so one instance per model is
+    shared by every update.
     
     Returns:
         Configured Update Agent
     """
-    return UpdateAgent()
+    model = get_update_model()
+    agent = _AGENT_SINGLETONS.get(model)
+    if agent is None:
+        with _AGENT_SINGLETONS_LOCK:
+            agent = _AGENT_SINGLETONS.get(model)
+            if agent is None:
+                agent = UpdateAgent()
+                _AGENT_SINGLETONS[model] = agent
+    return agent
 
 
 # Function for processing updates (main entry point)
 async def process_update(
     workspace_context: WorkspaceContext,
     update_type: str,
-    update_data: Dict[str, Any]
+    update_data: Dict[str, Any],
+    flush_labels: bool = True
 ) -> Dict[str, Any]:
     """
     Process a story update using the Update Agent with proper tracing.
     
+    Without an OpenAI API key the update is applied directly instead. Like the
+    other agents, this checks the key state read at startup; see has_openai_key().
+    
     Args:
         workspace_context: Workspace context with API key and IDs
         update_type: Type of update to perform ("analysis" or "enhancement")
         update_data: Data for the update
+        flush_labels: Apply label edits now, together with any deferred ones.
+            Pass False from intermediate pipeline stages to defer this
+            update's label edit to the final stage.
         
     Returns:
         Update result dictionary
     """
+    # For local development without the agent API, apply the update directly
+    if not has_openai_key():
+        logger.warning("OpenAI API key not found, using simplified update process")
+        labels = _UPDATE_LABELS.get(update_type, _UPDATE_LABELS["enhancement"])
+        if flush_labels:
+            labels = _merge_label_ops(workspace_context.take_pending_label_ops() + [labels])
+        else:
+            workspace_context.queue_label_op(*labels)
+            labels = ([], [])
+        
+        story_id = workspace_context.story_id
+        result = await process_update_development(
+            story_id,
+            workspace_context.workspace_id,
+            workspace_context.api_key,
+            update_type,
+            update_data,
+            story=workspace_context.story_cache_get(story_id),
+            labels=labels
+        )
+        workspace_context.story_cache_invalidate(story_id)
+        return result
+    
     # Create the agent
     update_agent = create_update_agent()
     
@@ -285,10 +434,14 @@ async def process_update(
     else:  # enhancement
         input_data["enhancement_result"] = update_data
     
+    # Encode the input once for the SDK; the input guardrail reuses the dict
+    input_json = json_fast.dumps(input_data)
+    workspace_context.set_parsed_input(input_json, input_data)
+    
     # Run the agent with proper tracing configuration
-    result = await Runner.run(
+    result = await _get_runner().run(
         starting_agent=update_agent,
-        input=input_data,
+        input=input_json,
         context=workspace_context,
         run_config={
             "workflow_name": f"Update-{workspace_context.workspace_id}-{workspace_context.story_id}",
@@ -303,5 +456,187 @@ async def process_update(
         }
     )
     
+    # The agent manages this update's labels itself; apply any edits deferred by earlier stages
+    if flush_labels:
+        pending = workspace_context.take_pending_label_ops()
+        if pending:
+            labels_to_add, labels_to_remove = _merge_label_ops(pending)
+            await update_story_labels(
+                workspace_context.story_id, workspace_context.api_key,
+                labels_to_add=labels_to_add,
+                labels_to_remove=labels_to_remove
+            )
+    
     # Return final output as dictionary
-    return result.final_output
\ No newline at end of file
+    return result.final_output
+
+
+# Label edits made by each update type: (labels_to_add, labels_to_remove)
+_UPDATE_LABELS: Dict[str, Tuple[List[str], List[str]]] = {
+    "analysis": (["analysed"], ["analyse"]),
+    "enhancement": (["enhanced"], ["enhance"]),
+}
+
+
+def _merge_label_ops(ops: Sequence[Tuple[List[str], List[str]]]) -> Tuple[List[str], List[str]]:
+    """
+    Fold a sequence of label edits into one equivalent edit.
+    
+    Args:
+        ops: (labels_to_add, labels_to_remove) pairs in the order they were made
+        
+    Returns:
+        A single (labels_to_add, labels_to_remove) pair with the same effect
+    """
+    to_add: List[str] = []
+    to_remove: List[str] = []
+    for labels_to_add, labels_to_remove in ops:
+        removed = set(labels_to_remove)
+        to_add = list(dict.fromkeys(
+            [label for label in to_add if label not in removed] +
+            [label for label in labels_to_add if label not in removed]
+        ))
+        added = set(to_add)
+        to_remove = [label for label in dict.fromkeys(to_remove + list(labels_to_remove)) if label not in added]
+    return to_add, to_remove
+
+
+def _call_result(result: Any) -> Dict[str, Any]:
+    """Turn an exception returned by asyncio.gather into a failed tool result."""
+    if isinstance(result, BaseException):
+        logger.error("Update call failed: %s", result)
+        return {"error": str(result), "success": False}
+    return result
+
+
+def _label_update(
+    story_id: str,
+    api_key: str,
+    story: Optional[Dict[str, Any]],
+    labels_to_add: List[str],
+    labels_to_remove: List[str]
+):
+    """Build the label update coroutine, reusing the story's known labels when available."""
+    if not labels_to_add and not labels_to_remove:
+        return _no_label_changes()
+    if story is not None:
+        return apply_label_changes(story_id, api_key, story.get("labels", []), labels_to_add, labels_to_remove)
+    return update_story_labels(story_id, api_key, labels_to_add=labels_to_add, labels_to_remove=labels_to_remove)
+
+
+async def _no_label_changes() -> Dict[str, Any]:
+    """Result for an update whose label edits were deferred."""
+    return {"added_labels": [], "removed_labels": [], "success": True}
+
+
+async def _do_analysis(story_id: str, api_key: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the analysis comment and report the non-label parts of the result."""
+    formatted_comment = await format_analysis_comment(update_data)
+    comment_result = await add_update_comment(story_id, api_key, "analysis", formatted_comment)
+    comment_added = comment_result.get("success", False)
+    return {"success": comment_added, "fields_updated": [], "comment_added": comment_added}
+
+
+async def _do_enhancement(story_id: str, api_key: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Update the story content, add the enhancement comment and report the non-label parts of the result."""
+    formatted_comment = await format_enhancement_comment(update_data)
+    content_result, comment_result = map(_call_result, await asyncio.gather(
+        update_story_content(
+            story_id, api_key,
+            title=update_data.get("enhanced_title") or None,
+            description=update_data.get("enhanced_description") or None,
+            acceptance_criteria=update_data.get("enhanced_acceptance_criteria") or None
+        ),
+        add_update_comment(story_id, api_key, "enhancement", formatted_comment),
+        return_exceptions=True
+    ))
+    comment_added = comment_result.get("success", False)
+    return {
+        "success": content_result.get("success", False) and comment_added,
+        "fields_updated": content_result.get("fields_updated", []),
+        "comment_added": comment_added
+    }
+
+
+# Fields shared by every failed update result; empty tuples so the template is never mutated
+_FAILURE_TEMPLATE: Dict[str, Any] = {
+    "success": False,
+    "fields_updated": (),
+    "tags_added": (),
+    "tags_removed": (),
+    "comment_added": False
+}
+
+
+# Non-label work for each update type
+_UPDATE_HANDLERS = {
+    "analysis": _do_analysis,
+    "enhancement": _do_enhancement,
+}
+
+
+async def process_update_development(
+    story_id: str,
+    workspace_id: str,
+    api_key: str,
+    update_type: str,
+    update_data: Dict[str, Any],
+    story: Optional[Dict[str, Any]] = None,
+    labels: Optional[Tuple[List[str], List[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Process a story update in development mode (simplified implementation).
+    
+    The content, comment and label updates touch independent parts of the
+    story, so they are sent concurrently and share the pooled HTTP session.
+    
+    Args:
+        story_id: ID of the story to update
+        workspace_id: ID of the workspace containing the story
+        api_key: Shortcut API key
+        update_type: Type of update to perform ("analysis" or "enhancement")
+        update_data: Data for the update (analysis or enhancement results)
+        story: Recently fetched story data, used to skip re-fetching its labels
+        labels: (labels_to_add, labels_to_remove) to apply instead of the
+            update type's default edit; empty lists skip the label update
+        
+    Returns:
+        Update result dictionary
+    """
+    logger.info("Processing %s update in development mode", update_type)
+    labels_to_add, labels_to_remove = labels or _UPDATE_LABELS.get(update_type, _UPDATE_LABELS["enhancement"])
+    if update_type not in _UPDATE_HANDLERS:
+        update_type = "enhancement"
+    
+    try:
+        # The label edit is independent of the content and comment updates, so run it alongside them
+        parts, label_result = await asyncio.gather(
+            _UPDATE_HANDLERS[update_type](story_id, api_key, update_data),
+            _label_update(story_id, api_key, story, labels_to_add, labels_to_remove),
+            return_exceptions=True
+        )
+        if isinstance(parts, BaseException):
+            raise parts
+        label_result = _call_result(label_result)
+        
+        return {
+            "success": parts["success"] and label_result.get("success", False),
+            "story_id": story_id,
+            "workspace_id": workspace_id,
+            "update_type": update_type,
+            "fields_updated": parts["fields_updated"],
+            "tags_added": label_result.get("added_labels", []),
+            "tags_removed": label_result.get("removed_labels", []),
+            "comment_added": parts["comment_added"],
+            "error_message": None
+        }
+    
+    except Exception as e:
+        logger.error("Error in development update process: %s", e)
+        return {
+            **_FAILURE_TEMPLATE,
+            "error_message": str(e),
+            "story_id": story_id,
+            "workspace_id": workspace_id,
+            "update_type": update_type
+        }
\ No newline at end of file
@@ -3,11 +3,12 @@ Unit tests for the BaseAgent class.
 """
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, AsyncMock
 from typing import Dict, Any, Optional
 
 from context.workspace.workspace_context import WorkspaceContext
-from shortcut_agents.base_agent import BaseAgent, BaseAgentHooks
+from shortcut_agents.base_agent import BaseAgent, BaseAgentHooks, _make_model_settings
 
 class TestAgentHooks(BaseAgentHooks):
     """Test implementation of agent hooks for testing."""
@@ -201,4 +202,14 @@ async def test_choose_model():
         
         agent = TestAgent()
         model = agent._choose_model("test", fallback="gpt-3.5-turbo")
-        assert model == "gpt-3.5-turbo"
\ No newline at end of file
+        assert model == "gpt-3.5-turbo"
+
+def test_model_settings_are_not_shared():
+    """Test that each call builds its own mutable ModelSettings instance."""
+    # The mock used without an OpenAI key rejects keyword arguments, so stand in a plain settings type
+    with patch("shortcut_agents.base_agent.ModelSettings", SimpleNamespace):
+        first = _make_model_settings(0.2)
+        second = _make_model_settings(0.2)
+    
+    assert first is not second
+    assert first.temperature == second.temperature == 0.2
@@ -0,0 +1,163 @@
+"""
+Unit tests for the triage agent's label fast path.
+"""
+
+import pytest
+from unittest.mock import patch, AsyncMock
+from typing import Dict, Any
+
+from context.workspace.workspace_context import WorkspaceContext, WorkflowType
+from shortcut_agents.triage import triage_agent
+from shortcut_agents.triage.triage_agent import (
+    _extract_labels_v1,
+    _extract_labels_v2,
+    _label_extractor,
+    _match_label_handler,
+    process_webhook,
+    triage_by_labels,
+)
+
+@pytest.fixture
+def context():
+    """Create a test workspace context without a story ID."""
+    return WorkspaceContext(workspace_id="test-workspace", api_key="test-api-key")
+
+@pytest.fixture
+def queue_tasks():
+    """Patch the label handlers' queueing functions."""
+    enhancement = AsyncMock(return_value={"task_id": "enhance-task"})
+    analysis = AsyncMock(return_value={"task_id": "analysis-task"})
+    handlers = {
+        "enhance": (WorkflowType.ENHANCE, enhancement, "enhancement"),
+        "analyse": (WorkflowType.ANALYSE, analysis, "analysis"),
+        "analyze": (WorkflowType.ANALYSE, analysis, "analysis"),
+    }
+    with patch.dict(triage_agent._LABEL_HANDLERS, handlers):
+        yield enhancement, analysis
+
+def v1_webhook(*names: str, **fields: Any) -> Dict[str, Any]:
+    """Build a legacy webhook adding labels by name."""
+    return {
+        "action": "update",
+        "changes": {"labels": {"adds": [{"name": name} for name in names]}},
+        **fields
+    }
+
+def test_match_label_handler_prefers_enhance():
+    """Test that an enhance label wins over an analysis label seen first."""
+    handler = _match_label_handler(iter(["bug", "analyse", "enhance"]))
+    assert handler[0] is WorkflowType.ENHANCE
+
+def test_match_label_handler_matches_both_analysis_spellings():
+    """Test that "analyse" and "analyze" trigger the analysis workflow."""
+    assert _match_label_handler(["analyse"])[0] is WorkflowType.ANALYSE
+    assert _match_label_handler(["analyze"])[0] is WorkflowType.ANALYSE
+
+def test_match_label_handler_ignores_other_labels():
+    """Test that only exact trigger labels match."""
+    assert _match_label_handler(["bug", "enhancement", "needs-analysis"]) is None
+    assert _match_label_handler([]) is None
+
+def test_extract_labels_v1_lowercases_added_names():
+    """Test that legacy payloads yield lowercased added label names."""
+    webhook = v1_webhook("Enhance", "Bug")
+    webhook["changes"]["labels"]["adds"].append("not-a-label-object")
+    assert list(_extract_labels_v1(webhook)) == ["enhance", "bug"]
+
+def test_extract_labels_v1_without_label_changes():
+    """Test that legacy payloads without label adds yield nothing."""
+    assert list(_extract_labels_v1({"changes": {"labels": {"removes": [{"name": "enhance"}]}}})) == []
+    assert list(_extract_labels_v1({"action": "update"})) == []
+
+def test_extract_labels_v2_resolves_label_ids_through_references():
+    """Test that label IDs are resolved to names using the references section."""
+    webhook = {
+        "actions": [
+            {"action": "update", "changes": {"label_ids": {"adds": [101, {"id": 102}, 999]}}}
+        ],
+        "references": [
+            {"id": 101, "entity_type": "label", "name": "Analyse"},
+            {"id": 102, "entity_type": "label", "name": "Enhance"},
+            {"id": 999, "entity_type": "workflow-state", "name": "Done"},
+        ]
+    }
+    assert list(_extract_labels_v2(webhook)) == ["analyse", "enhance"]
+
+def test_extract_labels_v2_without_references_uses_inline_names():
+    """Test that label ID objects carrying names work without references."""
+    webhook = {
+        "actions": [
+            {"changes": {"label_ids": {"adds": [{"id": 102, "name": "Enhance"}, 103]}}},
+            {"changes": {"labels": {"adds": [{"name": "Analyze"}]}}},
+            {"action": "update"}
+        ]
+    }
+    assert list(_extract_labels_v2(webhook)) == ["enhance", "analyze"]
+
+def test_label_extractor_selects_by_payload_shape():
+    """Test that actions payloads use the v2 extractor and others use v1."""
+    assert _label_extractor({"actions": []}) is _extract_labels_v2
+    assert _label_extractor(v1_webhook("enhance")) is _extract_labels_v1
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("label,workflow,next_agent,update_type", [
+    ("enhance", "enhance", "Update Agent", "enhancement"),
+    ("analyse", "analyse", "Analysis Agent", "analysis"),
+])
+async def test_triage_by_labels_queues_workflow(context, queue_tasks, label, workflow, next_agent, update_type):
+    """Test that a trigger label queues its task and names the agent that takes over."""
+    decision = await triage_by_labels(v1_webhook(label, id=12345), context)
+
+    assert decision["processed"] is True
+    assert decision["workflow"] == workflow
+    assert decision["story_id"] == "12345"
+    assert decision["next_agent"] == next_agent
+    assert decision["update_type"] == update_type
+    assert context.triage_result is decision
+
+@pytest.mark.asyncio
+async def test_triage_by_labels_without_trigger_label(context, queue_tasks):
+    """Test that webhooks without a trigger label are left to the LLM."""
+    assert await triage_by_labels(v1_webhook("bug", id=12345), context) is None
+    for queue_task in queue_tasks:
+        queue_task.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_triage_by_labels_rejects_missing_story_id(context, queue_tasks):
+    """Test that a trigger label without a story ID is rejected instead of queued."""
+    decision = await triage_by_labels(v1_webhook("enhance"), context)
+
+    assert decision["processed"] is False
+    assert decision["reason"] == "Could not extract story ID"
+    for queue_task in queue_tasks:
+        queue_task.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_process_webhook_rejects_webhook_without_label_changes(context, queue_tasks):
+    """Test that webhooks without label changes are rejected before triage."""
+    result = await process_webhook({"action": "update", "changes": {"name": {}}, "id": 12345}, context)
+
+    assert result["result"]["processed"] is False
+    assert result["result"]["reason"] == "No label changes"
+
+@pytest.mark.asyncio
+async def test_process_webhook_flags_downstream_errors(context, queue_tasks):
+    """Test that transport failures are flagged for the circuit breaker."""
+    enhancement, _ = queue_tasks
+    enhancement.side_effect = ConnectionResetError("Connection reset by peer")
+
+    result = await process_webhook(v1_webhook("enhance", id=12345), context)
+
+    assert result["result"]["processed"] is False
+    assert result["downstream_error"] is True
+
+@pytest.mark.asyncio
+async def test_process_webhook_does_not_flag_local_errors(context, queue_tasks):
+    """Test that local errors are reported without the downstream flag."""
+    enhancement, _ = queue_tasks
+    enhancement.side_effect = ValueError("bad task")
+
+    result = await process_webhook(v1_webhook("enhance", id=12345), context)
+
+    assert result["error"] == "bad task"
+    assert "downstream_error" not in result
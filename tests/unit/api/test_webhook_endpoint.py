@@ -0,0 +1,211 @@
+"""
+Unit tests for the shared webhook endpoint handler.
+"""
+
+import hmac
+import hashlib
+import pytest
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from typing import Dict, Optional
+
+from api.webhook import _handler_core
+from api.webhook._handler_core import webhook_handler, _may_be_label_update
+from utils import json_fast
+
+LABEL_UPDATE_BODY = b'{"action":"update","id":12345,"changes":{"labels":{"adds":[{"name":"enhance"}]}}}'
+
+def make_request(body: bytes, headers: Optional[Dict[str, str]] = None, workspace_id: str = "workspace1"):
+    """Create a serverless request object for a webhook delivery."""
+    return SimpleNamespace(path=f"/api/webhook/{workspace_id}", body=body, headers=headers or {})
+
+def sign(secret: str, body: bytes) -> str:
+    """Compute the Payload-Signature header Shortcut sends for a body."""
+    return hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+@pytest.fixture(autouse=True)
+def no_webhook_secret(monkeypatch):
+    """Run without webhook secrets unless a test configures one."""
+    monkeypatch.delenv("SHORTCUT_WEBHOOK_SECRET", raising=False)
+    monkeypatch.delenv("SHORTCUT_WEBHOOK_SECRET_WORKSPACE1", raising=False)
+
+@pytest.fixture
+def enqueue():
+    """Patch the queue so accepted webhooks get a fixed task ID."""
+    with patch.object(_handler_core, "enqueue_webhook", AsyncMock(return_value="task-1")) as mock:
+        yield mock
+
+@pytest.mark.parametrize("body", [
+    LABEL_UPDATE_BODY,
+    b'{"actions":[{"action":"update","changes":{"label_ids":{"adds":[1]}}}]}',
+])
+def test_prefilter_passes_label_updates(body):
+    """Test that bodies with an update action and label changes pass the byte prefilter."""
+    assert _may_be_label_update(body)
+
+@pytest.mark.parametrize("body", [
+    b'{"action":"create","id":12345,"changes":{"labels":{}}}',
+    b'{"action":"update","id":12345,"changes":{"name":{"new":"Renamed"}}}',
+    b'{"id":12345,"changes":{"labels":{}},"status":"update"}',
+    b'',
+])
+def test_prefilter_rejects_bodies_without_markers(body):
+    """Test that bodies missing an action key, update value or label key are dropped."""
+    assert not _may_be_label_update(body)
+
+@pytest.mark.asyncio
+async def test_webhook_handler_skips_prefiltered_body_without_parsing(enqueue):
+    """Test that a webhook failing the prefilter is skipped before JSON parsing."""
+    request = make_request(b'{"action":"create","id":12345}')
+    with patch.object(_handler_core, "stream_validate") as stream_validate:
+        response = await webhook_handler(request)
+
+    assert response["statusCode"] == 202
+    assert json_fast.loads(response["body"]) == {"status": "skipped"}
+    stream_validate.assert_not_called()
+    enqueue.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_webhook_handler_accepts_signed_webhook(monkeypatch, enqueue):
+    """Test that a correctly signed label update is queued."""
+    monkeypatch.setenv("SHORTCUT_WEBHOOK_SECRET_WORKSPACE1", "test-secret")
+    request = make_request(LABEL_UPDATE_BODY, {"payload-signature": sign("test-secret", LABEL_UPDATE_BODY)})
+
+    response = await webhook_handler(request)
+
+    assert response["statusCode"] == 202
+    assert json_fast.loads(response["body"]) == {"status": "accepted", "task_id": "task-1"}
+    enqueue.assert_awaited_once()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [
+    {},
+    {"payload-signature": "0" * 64},
+    {"payload-signature": sign("other-secret", LABEL_UPDATE_BODY)},
+])
+async def test_webhook_handler_rejects_bad_signature(monkeypatch, enqueue, headers):
+    """Test that missing or forged signatures get a 401 before any processing."""
+    monkeypatch.setenv("SHORTCUT_WEBHOOK_SECRET_WORKSPACE1", "test-secret")
+
+    response = await webhook_handler(make_request(LABEL_UPDATE_BODY, headers))
+
+    assert response["statusCode"] == 401
+    assert json_fast.loads(response["body"]) == {"error": "Invalid signature"}
+    enqueue.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_webhook_handler_unauthorized_response_is_not_shared(monkeypatch, enqueue):
+    """Test that callers mutating a 401 response do not change the next one."""
+    monkeypatch.setenv("SHORTCUT_WEBHOOK_SECRET_WORKSPACE1", "test-secret")
+
+    first = await webhook_handler(make_request(LABEL_UPDATE_BODY))
+    first["statusCode"] = 500
+    second = await webhook_handler(make_request(LABEL_UPDATE_BODY))
+
+    assert second["statusCode"] == 401
+
+@pytest.mark.asyncio
+async def test_webhook_handler_reports_duplicate(enqueue):
+    """Test that a webhook claimed moments ago is acknowledged as deduped."""
+    enqueue.return_value = None
+
+    response = await webhook_handler(make_request(LABEL_UPDATE_BODY))
+
+    assert response["statusCode"] == 202
+    assert json_fast.loads(response["body"]) == {"status": "deduped"}
+
+@pytest.mark.asyncio
+async def test_webhook_handler_processes_inline_when_queue_fails(enqueue):
+    """Test that a webhook is handled before responding if it cannot be queued."""
+    enqueue.side_effect = ConnectionError("Redis unavailable")
+    with patch.object(_handler_core, "handle_webhook", AsyncMock(return_value={"status": "processed"})) as handle:
+        response = await webhook_handler(make_request(LABEL_UPDATE_BODY))
+
+    assert response["statusCode"] == 200
+    handle.assert_awaited_once()
+    assert handle.await_args.kwargs["process_inline"] is True
+
+@pytest.mark.asyncio
+async def test_webhook_handler_without_enqueue_processes_inline(enqueue):
+    """Test that enqueue=False triages before responding instead of queueing a triage task."""
+    with patch.object(_handler_core, "handle_webhook", AsyncMock(return_value={"status": "processed"})) as handle:
+        response = await webhook_handler(make_request(LABEL_UPDATE_BODY), enqueue=False)
+
+    assert response["statusCode"] == 200
+    assert handle.await_args.kwargs["process_inline"] is True
+    enqueue.assert_not_awaited()
+
+@pytest.fixture
+def validation_cache(monkeypatch):
+    """Start each cache test with an empty validation cache."""
+    monkeypatch.setattr(_handler_core, "_VALIDATION_CACHE", OrderedDict())
+    return _handler_core._VALIDATION_CACHE
+
+@pytest.fixture
+def validate():
+    """Spy on validate_webhook while keeping its behavior."""
+    with patch.object(_handler_core, "validate_webhook", wraps=_handler_core.validate_webhook) as spy:
+        yield spy
+
+# Passes the byte prefilter but fails validate_webhook: "labels" is not a changes key
+NOT_A_LABEL_CHANGE_BODY = b'{"action":"update","id":12345,"changes":{"name":{"new":"labels"}}}'
+
+@pytest.mark.asyncio
+async def test_validation_cache_hit_skips_revalidation(validation_cache, validate, enqueue):
+    """Test that a retried invalid webhook is skipped from the cache without parsing."""
+    first = await webhook_handler(make_request(NOT_A_LABEL_CHANGE_BODY))
+    with patch.object(_handler_core, "stream_validate") as stream_validate:
+        second = await webhook_handler(make_request(NOT_A_LABEL_CHANGE_BODY))
+
+    assert json_fast.loads(first["body"]) == json_fast.loads(second["body"]) == {"status": "skipped"}
+    validate.assert_called_once()
+    stream_validate.assert_not_called()
+    enqueue.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_validation_cache_hit_for_valid_webhook(validation_cache, validate, enqueue):
+    """Test that a retried valid webhook is queued again without revalidating."""
+    await webhook_handler(make_request(LABEL_UPDATE_BODY))
+    response = await webhook_handler(make_request(LABEL_UPDATE_BODY))
+
+    assert response["statusCode"] == 202
+    validate.assert_called_once()
+    assert enqueue.await_count == 2
+
+@pytest.mark.asyncio
+async def test_validation_cache_misses_other_bodies_and_workspaces(validation_cache, validate, enqueue):
+    """Test that a cached decision applies only to the same body in the same workspace."""
+    await webhook_handler(make_request(NOT_A_LABEL_CHANGE_BODY))
+
+    other_workspace = await webhook_handler(make_request(NOT_A_LABEL_CHANGE_BODY, workspace_id="workspace2"))
+    other_body = await webhook_handler(make_request(LABEL_UPDATE_BODY))
+
+    assert json_fast.loads(other_workspace["body"]) == {"status": "skipped"}
+    assert json_fast.loads(other_body["body"]) == {"status": "accepted", "task_id": "task-1"}
+    assert validate.call_count == 3
+    assert len(validation_cache) == 3
+
+@pytest.mark.asyncio
+async def test_validation_cache_evicts_least_recently_used(monkeypatch, validation_cache, validate, enqueue):
+    """Test that the cache stays bounded and evicts the least recently used decision."""
+    monkeypatch.setattr(_handler_core, "VALIDATION_CACHE_SIZE", 2)
+    bodies = [
+        b'{"action":"update","id":%d,"changes":{"name":{"new":"labels"}}}' % story_id
+        for story_id in (1, 2, 3)
+    ]
+
+    await webhook_handler(make_request(bodies[0]))
+    await webhook_handler(make_request(bodies[1]))
+    # Touch the first body so the second becomes least recently used
+    await webhook_handler(make_request(bodies[0]))
+    await webhook_handler(make_request(bodies[2]))
+    assert len(validation_cache) == 2
+    assert validate.call_count == 3
+
+    # The first body is still cached; the evicted second one is validated again
+    await webhook_handler(make_request(bodies[0]))
+    assert validate.call_count == 3
+    await webhook_handler(make_request(bodies[1]))
+    assert validate.call_count == 4
+    assert len(validation_cache) == 2
@@ -0,0 +1,250 @@
+"""
+Unit tests for the webhook handler.
+"""
+
+import asyncio
+import hmac
+import hashlib
+import pytest
+from unittest.mock import patch, AsyncMock
+from typing import Dict, Any
+
+from api.webhook import handler
+from api.webhook.handler import enqueue_webhook, handle_webhook, verify_signature
+from shortcut_agents import base_agent
+from shortcut_agents.base_agent import has_openai_key
+from utils.circuit import CircuitBreaker
+from utils.queue.task_queue import Task, TaskType
+
+@pytest.fixture
+def webhook_data() -> Dict[str, Any]:
+    """Create a webhook payload that adds a label to a story."""
+    return {
+        "action": "update",
+        "id": 12345,
+        "changes": {
+            "labels": {
+                "adds": [{"name": "enhance"}]
+            }
+        }
+    }
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    """Configure a Shortcut API key, clear the cached lookups and skip webhook log files."""
+    monkeypatch.setenv("SHORTCUT_API_KEY", "test-api-key")
+    monkeypatch.setattr("utils.logging.webhook.DETAILED_WEBHOOK_LOGS", False)
+    handler.reload_config()
+    yield
+    handler.reload_config()
+
+@pytest.mark.asyncio
+async def test_handle_webhook_queues_triage_task(webhook_data):
+    """Test that the background path writes a triage task before reporting it queued."""
+    with patch.object(handler.task_queue, "add_task", AsyncMock(side_effect=lambda task: task.task_id)) as add_task:
+        result = await handle_webhook("workspace1", webhook_data, process_inline=False)
+
+    add_task.assert_awaited_once()
+    task = add_task.await_args.args[0]
+    assert isinstance(task, Task)
+    assert task.task_type == TaskType.TRIAGE
+    assert task.story_id == "12345"
+    assert task.payload["webhook_data"] == webhook_data
+
+    assert result["status"] == "processed"
+    assert result["result"]["status"] == "queued"
+    assert result["result"]["task_id"] == task.task_id
+
+def sign(secret: str, body: bytes) -> str:
+    """Compute the Payload-Signature header Shortcut sends for a body."""
+    return hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+@pytest.fixture
+def webhook_secret(monkeypatch):
+    """Configure a webhook secret for workspace1 only."""
+    monkeypatch.delenv("SHORTCUT_WEBHOOK_SECRET", raising=False)
+    monkeypatch.setenv("SHORTCUT_WEBHOOK_SECRET_WORKSPACE1", "test-secret")
+    return "test-secret"
+
+def test_verify_signature_accepts_valid_signature(webhook_secret):
+    """Test that a body signed with the workspace secret is accepted."""
+    body = b'{"action":"update","id":12345}'
+    assert verify_signature("workspace1", body, sign(webhook_secret, body))
+
+def test_verify_signature_accepts_str_body_and_uppercase_hex(webhook_secret):
+    """Test that decoded bodies and uppercase, padded signatures are accepted."""
+    body = '{"action":"update","id":12345}'
+    signature = sign(webhook_secret, body.encode("utf-8")).upper()
+    assert verify_signature("workspace1", body, f" {signature} ")
+
+def test_verify_signature_rejects_tampered_body(webhook_secret):
+    """Test that a signature does not cover a modified body."""
+    signature = sign(webhook_secret, b'{"action":"update","id":12345}')
+    assert not verify_signature("workspace1", b'{"action":"update","id":54321}', signature)
+
+def test_verify_signature_rejects_wrong_secret(webhook_secret):
+    """Test that a body signed with another secret is rejected."""
+    body = b'{"action":"update","id":12345}'
+    assert not verify_signature("workspace1", body, sign("other-secret", body))
+
+@pytest.mark.parametrize("signature", [None, ""])
+def test_verify_signature_rejects_missing_header(webhook_secret, signature):
+    """Test that an unsigned request is rejected once a secret is configured."""
+    assert not verify_signature("workspace1", b'{"action":"update"}', signature)
+
+def test_verify_signature_falls_back_to_shared_secret(monkeypatch):
+    """Test that SHORTCUT_WEBHOOK_SECRET applies to workspaces without their own secret."""
+    monkeypatch.delenv("SHORTCUT_WEBHOOK_SECRET_WORKSPACE2", raising=False)
+    monkeypatch.setenv("SHORTCUT_WEBHOOK_SECRET", "shared-secret")
+    body = b'{"action":"update"}'
+    assert verify_signature("workspace2", body, sign("shared-secret", body))
+    assert not verify_signature("workspace2", body, None)
+
+def test_verify_signature_skipped_without_secret(monkeypatch):
+    """Test that verification is skipped when no secret is configured."""
+    monkeypatch.delenv("SHORTCUT_WEBHOOK_SECRET", raising=False)
+    monkeypatch.delenv("SHORTCUT_WEBHOOK_SECRET_WORKSPACE3", raising=False)
+    assert verify_signature("workspace3", b'{"action":"update"}', None)
+    assert verify_signature("workspace3", b'{"action":"update"}', "not-a-signature")
+
+@pytest.fixture
+def breaker():
+    """Give the handler a fresh triage circuit breaker."""
+    fresh = CircuitBreaker("triage", failure_threshold=2, recovery_seconds=30)
+    with patch.object(handler, "_triage_breaker", fresh):
+        yield fresh
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error,failures", [
+    (asyncio.TimeoutError(), 1),
+    (ConnectionResetError(), 1),
+    (ValueError("bad payload"), 0),
+    (KeyError("workflow"), 0),
+])
+async def test_inline_triage_counts_only_downstream_exceptions(webhook_data, breaker, error, failures):
+    """Test that only transport and API exceptions count against the triage breaker."""
+    with patch.object(handler, "process_webhook", AsyncMock(side_effect=error)):
+        result = await handle_webhook("workspace1", webhook_data, process_inline=True)
+
+    assert result["status"] == "error"
+    assert breaker.failures == failures
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("triage_result,failures", [
+    ({"result": {"processed": False}, "error": "Connection reset", "downstream_error": True}, 1),
+    ({"result": {"processed": False}, "error": "'workflow'"}, 0),
+])
+async def test_inline_triage_counts_only_downstream_error_results(webhook_data, breaker, triage_result, failures):
+    """Test that error results count against the breaker only when flagged as downstream."""
+    with patch.object(handler, "process_webhook", AsyncMock(return_value=triage_result)):
+        await handle_webhook("workspace1", webhook_data, process_inline=True)
+
+    assert breaker.failures == failures
+
+@pytest.mark.asyncio
+async def test_inline_triage_sheds_load_while_breaker_open(webhook_data, breaker):
+    """Test that webhooks are shed without calling triage once the breaker opens."""
+    breaker.record_failure()
+    breaker.record_failure()
+    with patch.object(handler, "process_webhook", AsyncMock()) as process:
+        result = await handle_webhook("workspace1", webhook_data, process_inline=True)
+
+    assert result["status"] == "shed_load"
+    process.assert_not_awaited()
+
+def test_get_api_key_prefers_workspace_key(monkeypatch):
+    """Test that a workspace-specific key wins over the shared one."""
+    monkeypatch.setenv("SHORTCUT_API_KEY_WORKSPACE1", "workspace-key")
+    assert handler.get_api_key("workspace1") == "workspace-key"
+
+def test_reload_config_picks_up_rotated_key(monkeypatch):
+    """Test that a rotated key is served after reload_config() clears the cache."""
+    monkeypatch.setenv("SHORTCUT_API_KEY_WORKSPACE1", "old-key")
+    assert handler.get_api_key("workspace1") == "old-key"
+
+    monkeypatch.setenv("SHORTCUT_API_KEY_WORKSPACE1", "new-key")
+    assert handler.get_api_key("workspace1") == "old-key"
+
+    handler.reload_config()
+    assert handler.get_api_key("workspace1") == "new-key"
+
+def test_reload_config_refreshes_openai_key_state(monkeypatch):
+    """Test that reload_config() picks up an OpenAI key set after startup."""
+    # Restored after the environment, so later tests see the original key state
+    monkeypatch.setattr(base_agent, "_HAS_OPENAI_KEY", base_agent._HAS_OPENAI_KEY)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    handler.reload_config()
+    assert not has_openai_key()
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai-key")
+    assert not has_openai_key()
+
+    handler.reload_config()
+    assert has_openai_key()
+
+def test_get_api_key_raises_without_any_key(monkeypatch):
+    """Test that a missing key raises instead of caching a failure."""
+    monkeypatch.delenv("SHORTCUT_API_KEY", raising=False)
+    monkeypatch.delenv("SHORTCUT_API_KEY_UNKNOWN", raising=False)
+    handler.reload_config()
+
+    with pytest.raises(ValueError):
+        handler.get_api_key("unknown")
+
+    monkeypatch.setenv("SHORTCUT_API_KEY", "late-key")
+    assert handler.get_api_key("unknown") == "late-key"
+
+class FakeDedupRedis:
+    """In-memory stand-in for the Redis commands the webhook claim uses."""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        return 1 if self.values.pop(key, None) is not None else 0
+
+@pytest.fixture
+def dedup_redis():
+    """Point the task queue's Redis connection at an in-memory fake."""
+    redis = FakeDedupRedis()
+    with patch.object(handler.task_queue, "get_redis", AsyncMock(return_value=redis)):
+        yield redis
+
+@pytest.mark.asyncio
+async def test_enqueue_webhook_skips_duplicate(webhook_data, dedup_redis):
+    """Test that an identical webhook is queued only once."""
+    with patch.object(handler.task_queue, "add_task", AsyncMock(return_value="task-1")) as add_task:
+        first = await enqueue_webhook("workspace1", webhook_data)
+        second = await enqueue_webhook("workspace1", dict(webhook_data))
+
+    assert first == "task-1"
+    assert second is None
+    add_task.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_enqueue_webhook_claims_per_workspace(webhook_data, dedup_redis):
+    """Test that the same payload for another workspace is not a duplicate."""
+    with patch.object(handler.task_queue, "add_task", AsyncMock(return_value="task-1")) as add_task:
+        await enqueue_webhook("workspace1", webhook_data)
+        await enqueue_webhook("workspace2", webhook_data)
+
+    assert add_task.await_count == 2
+
+@pytest.mark.asyncio
+async def test_enqueue_webhook_releases_claim_when_queueing_fails(webhook_data, dedup_redis):
+    """Test that a failed enqueue releases its claim so a retry is queued."""
+    failing = AsyncMock(side_effect=ConnectionError("Redis unavailable"))
+    with patch.object(handler.task_queue, "add_task", failing):
+        with pytest.raises(ConnectionError):
+            await enqueue_webhook("workspace1", webhook_data)
+
+    assert dedup_redis.values == {}
+
+    with patch.object(handler.task_queue, "add_task", AsyncMock(return_value="task-2")):
+        assert await enqueue_webhook("workspace1", webhook_data) == "task-2"
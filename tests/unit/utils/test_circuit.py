@@ -0,0 +1,121 @@
+"""
+Unit tests for the circuit breaker.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+from utils import circuit
+from utils.circuit import CircuitBreaker, is_downstream_failure
+
+class FakeClock:
+    """Monotonic clock the tests advance by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the breaker's clock with a fake one."""
+    fake = FakeClock()
+    monkeypatch.setattr(circuit, "time", SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+@pytest.fixture
+def breaker(clock):
+    """Create a breaker that opens after three failures for ten seconds."""
+    return CircuitBreaker("test", failure_threshold=3, recovery_seconds=10)
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    """Record enough consecutive failures to open the breaker."""
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+def test_breaker_stays_closed_below_threshold(breaker):
+    """Test that fewer failures than the threshold keep the breaker closed."""
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.is_open()
+
+def test_success_resets_consecutive_failures(breaker):
+    """Test that only consecutive failures open the breaker."""
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.is_open()
+
+def test_breaker_cycles_closed_open_half_open_closed(breaker, clock):
+    """Test the full cycle from closed through open and half-open back to closed."""
+    open_breaker(breaker)
+    assert breaker.is_open()
+
+    # Still open until the recovery period has passed
+    clock.now += 9.9
+    assert breaker.is_open()
+
+    # Half-open: exactly one trial call is let through
+    clock.now += 0.1
+    assert not breaker.is_open()
+    assert breaker.is_open()
+
+    # A successful trial closes the breaker
+    breaker.record_success()
+    assert not breaker.is_open()
+    assert breaker.failures == 0
+
+def test_failed_trial_reopens_breaker(breaker, clock):
+    """Test that a failed half-open trial opens the breaker for another recovery period."""
+    open_breaker(breaker)
+    clock.now += 10
+    assert not breaker.is_open()
+
+    breaker.record_failure()
+    assert breaker.is_open()
+    clock.now += 9.9
+    assert breaker.is_open()
+    clock.now += 0.1
+    assert not breaker.is_open()
+
+def test_inconclusive_trial_frees_trial_slot(breaker, clock):
+    """Test that an inconclusive trial lets the next call probe without closing the breaker."""
+    open_breaker(breaker)
+    clock.now += 10
+    assert not breaker.is_open()
+    assert breaker.is_open()
+
+    breaker.record_inconclusive()
+    assert breaker.failures == breaker.failure_threshold
+    assert not breaker.is_open()
+
+def test_inconclusive_keeps_failure_count(breaker):
+    """Test that inconclusive calls neither add to nor reset the failure count."""
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_inconclusive()
+    breaker.record_failure()
+    assert breaker.is_open()
+
+@pytest.mark.parametrize("error", [
+    asyncio.TimeoutError(),
+    ConnectionResetError(),
+    ConnectionRefusedError(),
+])
+def test_transport_errors_are_downstream_failures(error):
+    """Test that timeouts and connection errors count against a breaker."""
+    assert is_downstream_failure(error)
+
+@pytest.mark.parametrize("error", [
+    ValueError("No API key found for workspace: test"),
+    KeyError("workflow"),
+    TypeError("unexpected keyword argument"),
+    Exception("Failed to parse triage output"),
+])
+def test_local_errors_are_not_downstream_failures(error):
+    """Test that bugs and bad input do not count against a breaker."""
+    assert not is_downstream_failure(error)
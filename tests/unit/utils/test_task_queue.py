@@ -0,0 +1,114 @@
+"""
+Unit tests for the Redis task queue.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+from typing import Dict, Any, List, Tuple
+
+from utils.queue.task_queue import Task, TaskQueueManager, TaskType, TaskPriority
+
+class FakePipeline:
+    """Records pipelined commands and applies them to a FakeRedis on execute."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands: List[Tuple[str, tuple, dict]] = []
+
+    def set(self, *args, **kwargs):
+        self.commands.append(("set", args, kwargs))
+        return self
+
+    def zadd(self, *args, **kwargs):
+        self.commands.append(("zadd", args, kwargs))
+        return self
+
+    async def execute(self):
+        if self.redis.fail:
+            raise ConnectionError("Redis unavailable")
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands add_task and get_task use."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.values: Dict[str, Any] = {}
+        self.sorted_sets: Dict[str, Dict[str, float]] = {}
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+    async def set(self, key, value):
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def zadd(self, key, mapping, nx=False):
+        members = self.sorted_sets.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            if nx and member in members:
+                continue
+            members[member] = score
+            added += 1
+        return added
+
+@pytest.fixture
+def task():
+    """Create a test triage task."""
+    return Task(
+        workspace_id="test-workspace",
+        story_id="12345",
+        task_type=TaskType.TRIAGE,
+        priority=TaskPriority.HIGH,
+        payload={"webhook_data": {"id": 12345}, "request_id": "req-1"}
+    )
+
+def make_queue(redis: FakeRedis) -> TaskQueueManager:
+    """Create a task queue manager backed by a fake Redis."""
+    queue = TaskQueueManager(redis_url="redis://test")
+    queue.get_redis = AsyncMock(return_value=redis)
+    return queue
+
+@pytest.mark.asyncio
+async def test_add_task_writes_task_and_queues_it(task):
+    """Test that an added task is stored and queued before its ID is returned."""
+    redis = FakeRedis()
+    queue = make_queue(redis)
+
+    task_id = await queue.add_task(task)
+
+    assert task_id == task.task_id
+    assert redis.sorted_sets["task_queue:pending"] == {task_id: TaskPriority.HIGH}
+
+    stored = await queue.get_task(task_id)
+    assert stored is not None
+    assert stored.story_id == "12345"
+    assert stored.payload == {"webhook_data": {"id": 12345}, "request_id": "req-1"}
+
+@pytest.mark.asyncio
+async def test_add_task_does_not_requeue_existing_task(task):
+    """Test that adding the same task twice keeps its original queue entry."""
+    redis = FakeRedis()
+    queue = make_queue(redis)
+
+    await queue.add_task(task)
+    redis.sorted_sets["task_queue:pending"][task.task_id] = 1
+    await queue.add_task(task)
+
+    assert redis.sorted_sets["task_queue:pending"] == {task.task_id: 1}
+
+@pytest.mark.asyncio
+async def test_add_task_raises_when_write_fails(task):
+    """Test that a failed write propagates instead of returning a task ID."""
+    redis = FakeRedis(fail=True)
+    queue = make_queue(redis)
+
+    with pytest.raises(ConnectionError):
+        await queue.add_task(task)
+
+    assert redis.values == {}
+    assert redis.sorted_sets == {}
@@ -11,8 +11,9 @@ import time
 import asyncio
 import aiohttp
 
+from utils import json_fast
+
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("shortcut_tools")
 
 # Mock data for local development
@@ -31,6 +32,63 @@ MOCK_STORY = {
     "requested_by_id": "user-123"
 }
 
+# Connection pool size for the shared HTTP session
+HTTP_CONNECTION_LIMIT = 100
+
+# How long idle keep-alive connections and DNS lookups are reused (seconds)
+HTTP_KEEPALIVE_TIMEOUT = 75
+HTTP_DNS_CACHE_TTL = 300
+
+# Upper bound on a single Shortcut API call, so a stalled connection cannot hold a webhook open (seconds)
+HTTP_REQUEST_TIMEOUT = 30
+
+# Shared session, bound to the event loop that created it
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session for Shortcut API calls.
+    
+    The session is created lazily on first use so TCP/TLS connections are
+    kept alive and reused across requests. A new session is created if the
+    previous one was closed or belongs to a different event loop.
+    
+    Returns:
+        The shared aiohttp.ClientSession
+    """
+    global _http_session, _http_session_loop
+    
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL
+        )
+        _http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT),
+            json_serialize=json_fast.dumps
+        )
+        _http_session_loop = loop
+    
+    return _http_session
+
+async def close_http_session() -> None:
+    """Close the shared aiohttp session, if one is open on the running loop."""
+    global _http_session, _http_session_loop
+    
+    session = _http_session
+    if session is None:
+        return
+    
+    _http_session = None
+    if _http_session_loop is asyncio.get_running_loop() and not session.closed:
+        await session.close()
+    _http_session_loop = None
+
 def is_development_mode() -> bool:
     """Check if the system is running in development mode"""
     return os.environ.get("VERCEL_ENV", "development") == "development" and not os.environ.get("USE_REAL_SHORTCUT", "").lower() in ("true", "1", "yes")
@@ -54,23 +112,28 @@ class RealShortcutClient:
         logger.info(f"Using API key starting with {api_key_snippet} for story {story_id}")
         logger.info(f"Request URL: {url}")
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Error getting story {story_id}: {response.status} {error_text}")
-                    logger.error(f"Headers used: Content-Type=application/json, API key length: {len(self.api_key)} chars")
-                    # Test with a direct synchronous request to compare
-                    try:
-                        import requests
-                        test_response = requests.get(url, headers={"Shortcut-Token": self.api_key})
-                        logger.info(f"Direct test request status: {test_response.status_code}")
-                    except Exception as test_err:
-                        logger.error(f"Direct test also failed: {str(test_err)}")
-                    
-                    raise Exception(f"Failed to get story: {response.status}")
+        session = get_http_session()
+        async with session.get(url, headers=self.headers) as response:
+            if response.status == 200:
+                return await response.json(loads=json_fast.loads)
+            else:
+                error_text = await response.text()
+                logger.error(f"Error getting story {story_id}: {response.status} {error_text}")
+                logger.error(f"Headers used: Content-Type=application/json, API key length: {len(self.api_key)} chars")
+                # Test with a direct synchronous request to compare
+                try:
+                    import requests
+                    # requests blocks, so keep it off the event loop
+                    test_response = await asyncio.to_thread(
+                        requests.get, url,
+                        headers={"Shortcut-Token": self.api_key},
+                        timeout=HTTP_REQUEST_TIMEOUT
+                    )
+                    logger.info(f"Direct test request status: {test_response.status_code}")
+                except Exception as test_err:
+                    logger.error(f"Direct test also failed: {str(test_err)}")
+                
+                raise Exception(f"Failed to get story: {response.status}")
     
     async def update_story(self, story_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a story"""
@@ -80,18 +143,18 @@ class RealShortcutClient:
         url = f"{self.base_url}/stories/{story_id}"
         
         # Log the exact data being sent
-        logger.info(f"Sending update to Shortcut API: {json.dumps(data)}")
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, headers=self.headers, json=data) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    logger.info(f"Successfully updated story {story_id}")
-                    return result
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Error updating story {story_id}: {response.status} {error_text}")
-                    raise Exception(f"Failed to update story: {response.status} - {error_text}")
+        logger.info(f"Sending update to Shortcut API: {json_fast.dumps(data)}")
+        
+        session = get_http_session()
+        async with session.put(url, headers=self.headers, json=data) as response:
+            if response.status == 200:
+                result = await response.json(loads=json_fast.loads)
+                logger.info(f"Successfully updated story {story_id}")
+                return result
+            else:
+                error_text = await response.text()
+                logger.error(f"Error updating story {story_id}: {response.status} {error_text}")
+                raise Exception(f"Failed to update story: {response.status} - {error_text}")
     
     async def create_comment(self, story_id: str, text: str) -> Dict[str, Any]:
         """Create a comment on a story"""
@@ -99,14 +162,14 @@ class RealShortcutClient:
         
         url = f"{self.base_url}/stories/{story_id}/comments"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=self.headers, json={"text": text}) as response:
-                if response.status == 201:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Error creating comment on story {story_id}: {response.status} {error_text}")
-                    raise Exception(f"Failed to create comment: {response.status}")
+        session = get_http_session()
+        async with session.post(url, headers=self.headers, json={"text": text}) as response:
+            if response.status == 201:
+                return await response.json(loads=json_fast.loads)
+            else:
+                error_text = await response.text()
+                logger.error(f"Error creating comment on story {story_id}: {response.status} {error_text}")
+                raise Exception(f"Failed to create comment: {response.status}")
 
 class MockShortcutClient:
     """Mock implementation of Shortcut client for local development"""
@@ -117,7 +180,7 @@ class MockShortcutClient:
     async def get_story(self, story_id: str) -> Dict[str, Any]:
         """Mock implementation of get_story"""
         logger.info(f"[MOCK] Getting story: {story_id}")
-        time.sleep(0.5)  # Simulate API delay
+        await asyncio.sleep(0.5)  # Simulate API delay without blocking the event loop
         
         # Return a copy of the mock story with the requested ID
         story = MOCK_STORY.copy()
@@ -136,7 +199,7 @@ class MockShortcutClient:
         """Mock implementation of update_story"""
         logger.info(f"[MOCK] Updating story: {story_id}")
         logger.info(f"[MOCK] Update data: {json.dumps(data, indent=2)}")
-        time.sleep(0.5)  # Simulate API delay
+        await asyncio.sleep(0.5)  # Simulate API delay without blocking the event loop
         
         # Return a copy of the mock story with updates applied
         story = MOCK_STORY.copy()
@@ -160,7 +223,7 @@ class MockShortcutClient:
         """Mock implementation of create_comment"""
         logger.info(f"[MOCK] Creating comment on story: {story_id}")
         logger.info(f"[MOCK] Comment text: {text}")
-        time.sleep(0.5)  # Simulate API delay
+        await asyncio.sleep(0.5)  # Simulate API delay without blocking the event loop
         
         # Handle both string and integer IDs
         try:
@@ -348,15 +411,15 @@ async def create_story(api_key: str, story_data: Dict[str, Any]) -> Dict[str, An
         return mock_story
     
     # In production, create a real story
-    async with aiohttp.ClientSession() as session:
-        url = f"{client.base_url}/stories"
-        async with session.post(url, headers=client.headers, json=story_data) as response:
-            if response.status != 201:
-                error_text = await response.text()
-                logger.error(f"Error creating story: {error_text}")
-                raise ValueError(f"Failed to create story: {response.status} - {error_text}")
-            
-            return await response.json()
+    session = get_http_session()
+    url = f"{client.base_url}/stories"
+    async with session.post(url, headers=client.headers, json=story_data) as response:
+        if response.status != 201:
+            error_text = await response.text()
+            logger.error(f"Error creating story: {error_text}")
+            raise ValueError(f"Failed to create story: {response.status} - {error_text}")
+        
+        return await response.json(loads=json_fast.loads)
 
 async def get_workspace_labels(api_key: str) -> List[Dict[str, Any]]:
     """
@@ -381,15 +444,15 @@ async def get_workspace_labels(api_key: str) -> List[Dict[str, Any]]:
         ]
     
     # In production, get real labels
-    async with aiohttp.ClientSession() as session:
-        url = f"{client.base_url}/labels"
-        async with session.get(url, headers=client.headers) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                logger.error(f"Error getting labels: {error_text}")
-                raise ValueError(f"Failed to get labels: {response.status} - {error_text}")
-            
-            return await response.json()
+    session = get_http_session()
+    url = f"{client.base_url}/labels"
+    async with session.get(url, headers=client.headers) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            logger.error(f"Error getting labels: {error_text}")
+            raise ValueError(f"Failed to get labels: {response.status} - {error_text}")
+        
+        return await response.json(loads=json_fast.loads)
 
 async def get_workflows(api_key: str) -> List[Dict[str, Any]]:
     """
@@ -418,15 +481,15 @@ async def get_workflows(api_key: str) -> List[Dict[str, Any]]:
         ]
     
     # In production, get real workflows
-    async with aiohttp.ClientSession() as session:
-        url = f"{client.base_url}/workflows"
-        async with session.get(url, headers=client.headers) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                logger.error(f"Error getting workflows: {error_text}")
-                raise ValueError(f"Failed to get workflows: {response.status} - {error_text}")
-            
-            return await response.json()
+    session = get_http_session()
+    url = f"{client.base_url}/workflows"
+    async with session.get(url, headers=client.headers) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            logger.error(f"Error getting workflows: {error_text}")
+            raise ValueError(f"Failed to get workflows: {response.status} - {error_text}")
+        
+        return await response.json(loads=json_fast.loads)
 
 async def get_projects(api_key: str) -> List[Dict[str, Any]]:
     """
@@ -456,12 +519,12 @@ async def get_projects(api_key: str) -> List[Dict[str, Any]]:
         ]
     
     # In production, get real projects
-    async with aiohttp.ClientSession() as session:
-        url = f"{client.base_url}/projects"
-        async with session.get(url, headers=client.headers) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                logger.error(f"Error getting projects: {error_text}")
-                raise ValueError(f"Failed to get projects: {response.status} - {error_text}")
-            
-            return await response.json()
\ No newline at end of file
+    session = get_http_session()
+    url = f"{client.base_url}/projects"
+    async with session.get(url, headers=client.headers) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            logger.error(f"Error getting projects: {error_text}")
+            raise ValueError(f"Failed to get projects: {response.status} - {error_text}")
+        
+        return await response.json(loads=json_fast.loads)
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+In-memory circuit breaker for calls to downstream services.
+
+When a dependency such as the LLM or the Shortcut API keeps failing,
+callers stop waiting on it for a recovery period and fail fast instead.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Optional, Tuple, Type
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    openai = None
+    OPENAI_AVAILABLE = False
+
+# Set up logging
+logger = logging.getLogger("circuit")
+
+def _downstream_error_types() -> Tuple[Type[BaseException], ...]:
+    """Collect the exception types raised when a downstream service is unreachable or failing."""
+    types = [asyncio.TimeoutError, ConnectionError]
+    if AIOHTTP_AVAILABLE:
+        types.append(aiohttp.ClientError)
+    if OPENAI_AVAILABLE:
+        # Connection errors and timeouts, throttling and 5xx responses; other
+        # API errors (bad requests, auth) are not fixed by backing off
+        types.extend((openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError))
+    return tuple(types)
+
+# Transport and API failures; anything else is a bug or bad input, not an outage
+DOWNSTREAM_ERRORS = _downstream_error_types()
+
+def is_downstream_failure(error: BaseException) -> bool:
+    """
+    Check whether an exception means a downstream service failed.
+
+    Args:
+        error: The exception raised by the protected call
+
+    Returns:
+        True for transport and API failures, which should count against a breaker
+    """
+    return isinstance(error, DOWNSTREAM_ERRORS)
+
+class CircuitBreaker:
+    """
+    Trips after consecutive failures and lets a trial call through after a recovery period.
+
+    The breaker is closed while calls succeed. After failure_threshold
+    consecutive failures it opens, and is_open() reports True for
+    recovery_seconds. It then becomes half-open: a single call is allowed
+    through, and its outcome either closes the breaker or opens it again.
+    State is per process, which is enough to shed load within a warm
+    serverless instance or worker.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Name of the protected dependency, used in log messages
+            failure_threshold: Consecutive failures that open the breaker
+            recovery_seconds: How long the breaker stays open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    def is_open(self) -> bool:
+        """
+        Check whether calls should be short-circuited.
+
+        Returns:
+            True if the call should not be made, False if it may proceed
+        """
+        if self.opened_at is None:
+            return False
+        if self.trial_in_flight or time.monotonic() - self.opened_at < self.recovery_seconds:
+            return True
+        # Half-open: let this one call through to probe the dependency
+        self.trial_in_flight = True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the breaker."""
+        if self.opened_at is not None:
+            logger.info("Circuit %s closed", self.name)
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker once the threshold is reached."""
+        self.failures += 1
+        if self.trial_in_flight or (self.opened_at is None and self.failures >= self.failure_threshold):
+            logger.warning(
+                "Circuit %s open after %d consecutive failures; retrying in %.0fs",
+                self.name, self.failures, self.recovery_seconds
+            )
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def record_inconclusive(self) -> None:
+        """
+        Record a call whose outcome says nothing about the dependency, such as a local error.
+
+        The failure count is left alone; a half-open trial slot is freed so
+        the next call probes the dependency instead.
+        """
+        self.trial_in_flight = False
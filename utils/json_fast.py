@@ -0,0 +1,82 @@
+"""
+Fast JSON helpers.
+
+Uses orjson when it is installed and falls back to the standard library
+json module otherwise, so callers get the same API either way.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so this catches both
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps_bytes(
+    obj: Any,
+    default: Optional[Callable[[Any], Any]] = None,
+    sort_keys: bool = False,
+    indent: bool = False
+) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON, compact unless indent is set.
+
+    Args:
+        obj: Object to serialize
+        default: Optional fallback for objects that are not natively serializable
+        sort_keys: Emit object keys in sorted order, giving a canonical encoding
+        indent: Pretty-print with two-space indentation, for files people read
+
+    Returns:
+        JSON document as bytes
+    """
+    if ORJSON_AVAILABLE:
+        option = (orjson.OPT_SORT_KEYS if sort_keys else 0) | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=default, option=option or None)
+    return json.dumps(
+        obj, default=default, sort_keys=sort_keys, ensure_ascii=False,
+        indent=2 if indent else None, separators=(",", ": ") if indent else (",", ":")
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Serialize an object to a compact JSON string.
+
+    Args:
+        obj: Object to serialize
+        default: Optional fallback for objects that are not natively serializable
+
+    Returns:
+        JSON document as str
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default).decode("utf-8")
+    return json.dumps(obj, default=default, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON document as str or bytes
+
+    Returns:
+        The parsed object
+
+    Raises:
+        JSONDecodeError: If the document is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
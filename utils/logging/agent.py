@@ -16,6 +16,9 @@ update_logger = get_logger("update.agent")
 comment_logger = get_logger("comment.agent")
 notification_logger = get_logger("notification.agent")
 
+# Tool parameters that are redacted before logging
+_SENSITIVE_KEYS = frozenset({"api_key", "token", "password", "secret", "authorization", "bearer"})
+
 def log_agent_start(agent_type: str,
                    agent_name: str,
                    request_id: str,
@@ -183,10 +186,10 @@ def log_tool_use(agent_type: str,
         story_id=story_id
     ):
         # Ensure we're not logging sensitive data
-        safe_params = parameters.copy() if parameters else {}
-        for sensitive_param in ["api_key", "token", "password", "secret"]:
-            if sensitive_param in safe_params:
-                safe_params[sensitive_param] = "[REDACTED]"
+        safe_params = {
+            key: ("[REDACTED]" if key.lower() in _SENSITIVE_KEYS else value)
+            for key, value in (parameters or {}).items()
+        }
         
         # Log tool use
         logger.info(
@@ -5,7 +5,6 @@ Provides structured logging with context and trace correlation.
 
 import os
 import sys
-import json
 import time
 import logging
 import uuid
@@ -15,7 +14,8 @@ from datetime import datetime
 from typing import Dict, Any, Optional, Callable, List, Union, TypeVar, cast
 from contextlib import contextmanager
 
-from openai import OpenAI
+from utils import json_fast
+
 from agents import RunContextWrapper
 try:
     from agents.tracing import add_trace_processor
@@ -68,6 +68,15 @@ os.makedirs(LOG_DIR, exist_ok=True)
 # Type variable for function return types
 T = TypeVar('T')
 
+# Standard LogRecord attributes that JsonFormatter does not copy into the output
+_RESERVED_RECORD_ATTRS = frozenset({
+    "args", "asctime", "created", "exc_info", "exc_text",
+    "filename", "funcName", "id", "levelname", "levelno",
+    "lineno", "module", "msecs", "message", "msg",
+    "name", "pathname", "process", "processName",
+    "relativeCreated", "stack_info", "thread", "threadName"
+})
+
 class JsonFormatter(logging.Formatter):
     """Format log records as JSON strings."""
     
@@ -94,15 +103,11 @@ class JsonFormatter(logging.Formatter):
         
         # Add any extra attributes set on the record
         for key, value in record.__dict__.items():
-            if key not in {"args", "asctime", "created", "exc_info", "exc_text", 
-                          "filename", "funcName", "id", "levelname", "levelno",
-                          "lineno", "module", "msecs", "message", "msg", 
-                          "name", "pathname", "process", "processName", 
-                          "relativeCreated", "stack_info", "thread", "threadName"}:
+            if key not in _RESERVED_RECORD_ATTRS:
                 log_data[key] = value
         
-        # Serialize to JSON
-        return json.dumps(log_data)
+        # Serialize to JSON (orjson when available); unknown types fall back to str
+        return json_fast.dumps(log_data, default=str)
 
 class LoggerContext:
     """
@@ -148,17 +153,23 @@ class StructuredLogger:
         for key, value in self.context.items():
             setattr(record, key, value)
     
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether a message at this level would be emitted, like logging.Logger.isEnabledFor."""
+        return self.logger.isEnabledFor(level)
+    
     def with_context(self, **context) -> LoggerContext:
         """Create a context manager that adds context to all logs."""
         return LoggerContext(self, **context)
     
     def debug(self, msg: str, **kwargs) -> None:
         """Log a debug message with context."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         extra = kwargs.copy()
         for key, value in extra.items():
             # Store complex values as JSON strings
             if not isinstance(value, (str, int, float, bool, type(None))):
-                extra[key] = json.dumps(value)
+                extra[key] = json_fast.dumps(value, default=str)
                 
         record = self.logger.makeRecord(
             self.name, logging.DEBUG, "", 0, msg, (), None, 
@@ -169,11 +180,13 @@ class StructuredLogger:
     
     def info(self, msg: str, **kwargs) -> None:
         """Log an info message with context."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         extra = kwargs.copy()
         for key, value in extra.items():
             # Store complex values as JSON strings
             if not isinstance(value, (str, int, float, bool, type(None))):
-                extra[key] = json.dumps(value)
+                extra[key] = json_fast.dumps(value, default=str)
                 
         record = self.logger.makeRecord(
             self.name, logging.INFO, "", 0, msg, (), None, 
@@ -184,11 +197,13 @@ class StructuredLogger:
     
     def warning(self, msg: str, **kwargs) -> None:
         """Log a warning message with context."""
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         extra = kwargs.copy()
         for key, value in extra.items():
             # Store complex values as JSON strings
             if not isinstance(value, (str, int, float, bool, type(None))):
-                extra[key] = json.dumps(value)
+                extra[key] = json_fast.dumps(value, default=str)
                 
         record = self.logger.makeRecord(
             self.name, logging.WARNING, "", 0, msg, (), None, 
@@ -199,11 +214,13 @@ class StructuredLogger:
     
     def error(self, msg: str, **kwargs) -> None:
         """Log an error message with context."""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         extra = kwargs.copy()
         for key, value in extra.items():
             # Store complex values as JSON strings
             if not isinstance(value, (str, int, float, bool, type(None))):
-                extra[key] = json.dumps(value)
+                extra[key] = json_fast.dumps(value, default=str)
                 
         record = self.logger.makeRecord(
             self.name, logging.ERROR, "", 0, msg, (), None, 
@@ -214,11 +231,16 @@ class StructuredLogger:
     
     def exception(self, msg: str, exc_info=True, **kwargs) -> None:
         """Log an exception message with traceback and context."""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        # makeRecord needs the (type, value, traceback) tuple, as Logger._log builds it
+        if exc_info is True:
+            exc_info = sys.exc_info()
         extra = kwargs.copy()
         for key, value in extra.items():
             # Store complex values as JSON strings
             if not isinstance(value, (str, int, float, bool, type(None))):
-                extra[key] = json.dumps(value)
+                extra[key] = json_fast.dumps(value, default=str)
                 
         record = self.logger.makeRecord(
             self.name, logging.ERROR, "", 0, msg, (), exc_info, 
@@ -229,11 +251,13 @@ class StructuredLogger:
     
     def critical(self, msg: str, **kwargs) -> None:
         """Log a critical message with context."""
+        if not self.logger.isEnabledFor(logging.CRITICAL):
+            return
         extra = kwargs.copy()
         for key, value in extra.items():
             # Store complex values as JSON strings
             if not isinstance(value, (str, int, float, bool, type(None))):
-                extra[key] = json.dumps(value)
+                extra[key] = json_fast.dumps(value, default=str)
                 
         record = self.logger.makeRecord(
             self.name, logging.CRITICAL, "", 0, msg, (), None, 
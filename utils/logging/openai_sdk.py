@@ -8,7 +8,6 @@ from typing import Dict, Any, Optional, List, Callable
 
 # Try to import OpenAI Agent SDK components
 try:
-    from openai import OpenAI
     from shortcut_agents import AgentCompletionParameters, AgentHooks
     from shortcut_agents import RunContextWrapper, AgentResponseInfo, AgentResponse, AgentChatResponse
     from shortcut_agents import FunctionCall, Tool, FunctionTool
@@ -38,6 +37,9 @@ from utils.logging.trace_processor import EnhancementTraceProcessor
 # Create logger for OpenAI SDK
 sdk_logger = get_logger("openai.sdk")
 
+# Function call parameters that are redacted before logging
+_SENSITIVE_KEYS = frozenset({"api_key", "token", "password", "secret", "authorization", "bearer"})
+
 class LoggingAgentHooks(AgentHooks):
     """
     Agent hooks for logging agent execution events.
@@ -189,6 +191,10 @@ class LoggingAgentHooks(AgentHooks):
         Returns:
             Modified function call if needed
         """
+        # Skip context lookup and parameter redaction when INFO is disabled
+        if not self.logger.isEnabledFor(logging.INFO):
+            return function_call
+        
         # Try to extract context values
         request_id = None
         workspace_id = None
@@ -208,12 +214,10 @@ class LoggingAgentHooks(AgentHooks):
         
         # Get parameters (excluding sensitive data)
         parameters = getattr(function_call, 'parameters', {})
-        safe_params = {}
-        for key, value in parameters.items():
-            if key.lower() in ["api_key", "token", "password", "secret"]:
-                safe_params[key] = "[REDACTED]"
-            else:
-                safe_params[key] = value
+        safe_params = {
+            key: ("[REDACTED]" if key.lower() in _SENSITIVE_KEYS else value)
+            for key, value in parameters.items()
+        }
         
         # Log function call
         with trace_context(
@@ -249,6 +253,10 @@ class LoggingAgentHooks(AgentHooks):
         Returns:
             Modified function output if needed
         """
+        # Skip context lookup and output inspection when INFO is disabled
+        if not self.logger.isEnabledFor(logging.INFO):
+            return function_output
+        
         # Try to extract context values
         request_id = None
         workspace_id = None
@@ -3,17 +3,176 @@ Webhook logging adapter for the Shortcut Enhancement System.
 """
 
 import os
-import json
 import time
 import uuid
+import asyncio
+import logging
+import functools
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
+from utils import json_fast
 from utils.logging.logger import get_logger, trace_context
 
 # Create webhook logger
 webhook_logger = get_logger("webhook.handler")
 
+# Write each webhook to a file under logs/ and record receipt/start events.
+# Off by default in production, where the per-webhook file write is pure overhead.
+DETAILED_WEBHOOK_LOGS = os.environ.get(
+    "DETAILED_WEBHOOK_LOGS",
+    "false" if os.environ.get("VERCEL_ENV") == "production" else "true"
+).lower() in ("true", "1", "yes")
+
+@dataclass
+class WebhookTrace:
+    """
+    Collects the lifecycle events of one webhook and logs them as a single record.
+    
+    Use it as a context manager around webhook handling: the receipt,
+    validation, start, triage decision and completion events are buffered and
+    written as one structured "Webhook handled" record on exit. Processing
+    errors are still logged immediately.
+    """
+    
+    request_id: str
+    workspace_id: str
+    story_id: Optional[str] = None
+    events: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    level: int = logging.INFO
+    
+    def __enter__(self) -> "WebhookTrace":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.flush()
+        return False
+    
+    def validation(self, is_valid: bool, reason: Optional[str] = None) -> None:
+        """Record the webhook validation result."""
+        if is_valid:
+            self.events["validation"] = {"valid": True}
+        else:
+            self.events["validation"] = {"valid": False, "reason": reason}
+            self.level = max(self.level, logging.WARNING)
+    
+    def processing_start(self) -> None:
+        """Record the start of webhook processing, when detailed webhook logs are on."""
+        if DETAILED_WEBHOOK_LOGS:
+            self.events["start"] = {"at": time.time()}
+    
+    def triage_decision(self, decision: str, triage_result: Dict[str, Any]) -> None:
+        """Record the triage decision for the webhook."""
+        processed = triage_result.get("processed", False)
+        event = {"decision": decision, "processed": processed}
+        if not processed and "reason" in triage_result:
+            event["reason"] = triage_result["reason"]
+        if "task_info" in triage_result:
+            event["task_key"] = triage_result["task_info"].get("task_key", "unknown")
+        self.events["decision"] = event
+    
+    def processing_complete(self, result: Dict[str, Any], duration_ms: int) -> None:
+        """Record the completion of webhook processing."""
+        self.events["complete"] = {
+            "duration_ms": duration_ms,
+            "processed": result.get("processed", False),
+            "workflow": result.get("workflow", "none")
+        }
+    
+    def processing_error(self, error: str, duration_ms: int) -> None:
+        """Log a processing error right away and record it for the final record."""
+        log_webhook_processing_error(self.request_id, self.workspace_id, self.story_id, error, duration_ms)
+        self.events["error"] = {"error": error, "duration_ms": duration_ms}
+        self.level = max(self.level, logging.ERROR)
+    
+    def flush(self) -> None:
+        """Write the buffered events as one record and clear them."""
+        if not self.events:
+            return
+        if webhook_logger.isEnabledFor(self.level):
+            with trace_context(
+                request_id=self.request_id,
+                workspace_id=self.workspace_id,
+                story_id=self.story_id
+            ):
+                log = webhook_logger.error if self.level >= logging.ERROR else (
+                    webhook_logger.warning if self.level >= logging.WARNING else webhook_logger.info
+                )
+                log(
+                    "Webhook handled",
+                    request_id=self.request_id,
+                    workspace_id=self.workspace_id,
+                    story_id=self.story_id,
+                    event="webhook_handled",
+                    events=self.events
+                )
+        self.events = {}
+
+def begin_webhook_trace(workspace_id: str,
+                        path: str,
+                        client_ip: str,
+                        headers: Dict[str, str],
+                        data: Dict[str, Any]) -> WebhookTrace:
+    """
+    Start a batched trace for a received webhook.
+    
+    Like log_webhook_receipt, this assigns the request ID and saves the
+    webhook data to file, but the receipt is buffered in the returned
+    WebhookTrace instead of being logged on its own. The receipt event and
+    the file are skipped unless DETAILED_WEBHOOK_LOGS is on.
+    
+    Args:
+        workspace_id: Workspace ID from the URL
+        path: Request path
+        client_ip: Client IP address
+        headers: Request headers
+        data: Webhook data
+        
+    Returns:
+        WebhookTrace holding the receipt event
+    """
+    request_id = str(uuid.uuid4())
+    story_id = extract_story_id(data)
+    
+    webhook_trace = WebhookTrace(request_id=request_id, workspace_id=workspace_id, story_id=story_id)
+    if not DETAILED_WEBHOOK_LOGS:
+        return webhook_trace
+    
+    webhook_trace.events["receipt"] = {
+        "path": path,
+        "client_ip": client_ip,
+        "content_type": headers.get("Content-Type", "")
+    }
+    
+    # Log webhook data (limited to avoid huge logs)
+    if webhook_logger.isEnabledFor(logging.DEBUG):
+        data_preview = str(data)
+        webhook_logger.debug(
+            "Webhook data",
+            request_id=request_id,
+            workspace_id=workspace_id,
+            story_id=story_id,
+            data_preview=data_preview[:500] + ("..." if len(data_preview) > 500 else "")
+        )
+    
+    save_log = functools.partial(
+        save_webhook_log,
+        request_id=request_id,
+        workspace_id=workspace_id,
+        story_id=story_id,
+        path=path,
+        client_ip=client_ip,
+        headers=headers,
+        data=data
+    )
+    try:
+        # Write the webhook file on a worker thread so the event loop is not blocked
+        asyncio.get_running_loop().run_in_executor(None, save_log)
+    except RuntimeError:
+        save_log()
+    return webhook_trace
+
 def log_webhook_receipt(workspace_id: str,
                        path: str,
                        client_ip: str,
@@ -56,13 +215,15 @@ def log_webhook_receipt(workspace_id: str,
         )
         
         # Log webhook data (limited to avoid huge logs)
-        webhook_logger.debug(
-            "Webhook data",
-            request_id=request_id,
-            workspace_id=workspace_id,
-            story_id=story_id,
-            data_preview=str(data)[:500] + ("..." if len(str(data)) > 500 else "")
-        )
+        if webhook_logger.isEnabledFor(logging.DEBUG):
+            data_preview = str(data)
+            webhook_logger.debug(
+                "Webhook data",
+                request_id=request_id,
+                workspace_id=workspace_id,
+                story_id=story_id,
+                data_preview=data_preview[:500] + ("..." if len(data_preview) > 500 else "")
+            )
         
         # Save webhook data to file
         save_webhook_log(
@@ -92,6 +253,8 @@ def log_webhook_validation(request_id: str,
         is_valid: Whether the webhook is valid
         reason: Reason for validation failure (if any)
     """
+    if not webhook_logger.isEnabledFor(logging.INFO if is_valid else logging.WARNING):
+        return
     with trace_context(
         request_id=request_id,
         workspace_id=workspace_id,
@@ -125,6 +288,8 @@ def log_webhook_processing_start(request_id: str,
         workspace_id: Workspace ID
         story_id: Story ID
     """
+    if not webhook_logger.isEnabledFor(logging.INFO):
+        return
     with trace_context(
         request_id=request_id,
         workspace_id=workspace_id,
@@ -153,6 +318,8 @@ def log_webhook_processing_complete(request_id: str,
         result: Processing result
         duration_ms: Processing duration in milliseconds
     """
+    if not webhook_logger.isEnabledFor(logging.INFO):
+        return
     with trace_context(
         request_id=request_id,
         workspace_id=workspace_id,
@@ -184,6 +351,8 @@ def log_webhook_processing_error(request_id: str,
         error: Error message
         duration_ms: Processing duration until error (milliseconds)
     """
+    if not webhook_logger.isEnabledFor(logging.ERROR):
+        return
     with trace_context(
         request_id=request_id,
         workspace_id=workspace_id,
@@ -199,6 +368,24 @@ def log_webhook_processing_error(request_id: str,
             duration_ms=duration_ms
         )
 
+# Story ID locations in priority order, as key paths into the webhook data;
+# actions[] (new format) is checked between the two groups
+_ID_PATHS_BEFORE_ACTIONS = (("primary_id",), ("id",))
+_ID_PATHS_AFTER_ACTIONS = (("story_id",), ("resource", "id"))
+
+def _find_id(webhook_data: Dict[str, Any], paths: Tuple[Tuple[str, ...], ...]) -> Optional[str]:
+    """Return the first non-null value found along the given key paths, as a string."""
+    for path in paths:
+        value = webhook_data
+        for key in path:
+            if not isinstance(value, dict):
+                value = None
+                break
+            value = value.get(key)
+        if value is not None:
+            return str(value)
+    return None
+
 def extract_story_id(webhook_data: Dict[str, Any]) -> Optional[str]:
     """
     Extract the story ID from webhook data.
@@ -209,30 +396,18 @@ def extract_story_id(webhook_data: Dict[str, Any]) -> Optional[str]:
     Returns:
         Story ID or None if not found
     """
-    # Extract story ID - exact field name depends on webhook structure
-    # Check primary_id first (new format)
-    if "primary_id" in webhook_data:
-        return str(webhook_data["primary_id"])
+    # primary_id (new format), then id (old format)
+    story_id = _find_id(webhook_data, _ID_PATHS_BEFORE_ACTIONS)
+    if story_id is not None:
+        return story_id
     
-    # Check id directly (old format)
-    if "id" in webhook_data:
-        return str(webhook_data["id"])
+    # actions[].id for story entities (new format)
+    for action in webhook_data.get("actions") or ():
+        if action.get("entity_type") == "story" and action.get("id") is not None:
+            return str(action["id"])
     
-    # Check actions[].id (new format)
-    if "actions" in webhook_data and webhook_data["actions"]:
-        for action in webhook_data["actions"]:
-            if "id" in action and action.get("entity_type") == "story":
-                return str(action["id"])
-    
-    # Check story_id (possible format)
-    if "story_id" in webhook_data:
-        return str(webhook_data["story_id"])
-    
-    # Check resource.id (possible format)
-    if "resource" in webhook_data and "id" in webhook_data["resource"]:
-        return str(webhook_data["resource"]["id"])
-    
-    return None
+    # story_id, then resource.id (possible formats)
+    return _find_id(webhook_data, _ID_PATHS_AFTER_ACTIONS)
 
 def save_webhook_log(request_id: str,
                     workspace_id: str,
@@ -278,8 +453,8 @@ def save_webhook_log(request_id: str,
         }
         
         # Write to file
-        with open(filepath, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(json_fast.dumps_bytes(log_data, default=str, indent=True))
         
         webhook_logger.debug(f"Webhook data saved to {filepath}")
     except Exception as e:
@@ -301,6 +476,8 @@ def log_triage_decision(request_id: str,
         triage_result: Full triage result
     """
     triage_logger = get_logger("triage.agent")
+    if not triage_logger.isEnabledFor(logging.INFO):
+        return
     
     with trace_context(
         request_id=request_id,
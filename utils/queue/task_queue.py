@@ -6,20 +6,46 @@ processing of enhancement and analysis tasks.
 """
 
 import os
-import json
 import time
 import asyncio
 import logging
-import uuid
+import secrets
+import itertools
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Union, Tuple
 
 import redis.asyncio as aioredis
 from pydantic import BaseModel, Field, ConfigDict
 
+from utils import json_fast
+
 # Set up logging
 logger = logging.getLogger("task_queue")
 
+# Per-process part of task IDs; regenerated in forked children so IDs stay unique
+_TASK_ID_PREFIX = secrets.token_hex(4)
+_task_id_counter = itertools.count()
+
+def _reset_task_id_prefix() -> None:
+    """Give a forked process its own task ID prefix and counter."""
+    global _TASK_ID_PREFIX, _task_id_counter
+    _TASK_ID_PREFIX = secrets.token_hex(4)
+    _task_id_counter = itertools.count()
+
+os.register_at_fork(after_in_child=_reset_task_id_prefix)
+
+def new_task_id() -> str:
+    """
+    Generate a unique task ID without reading the system RNG.
+    
+    IDs are a millisecond timestamp, a random per-process prefix and a
+    per-process counter, all hex encoded, so they sort by creation time.
+    
+    Returns:
+        A 32 character hex task ID
+    """
+    return f"{time.time_ns() // 1_000_000:012x}{_TASK_ID_PREFIX}{next(_task_id_counter) & 0xFFFFFFFFFFFF:012x}"
+
 class TaskStatus:
     """Task status constants"""
     PENDING = "pending"
@@ -36,6 +62,7 @@ class TaskPriority:
 
 class TaskType:
     """Task type constants"""
+    WEBHOOK = "webhook"
     TRIAGE = "triage"
     ANALYSIS = "analysis"
     ENHANCEMENT = "enhancement"
@@ -45,7 +72,7 @@ class Task(BaseModel):
     """Task model for queue operations"""
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
-    task_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    task_id: str = Field(default_factory=new_task_id)
     workspace_id: str
     story_id: str
     task_type: str
@@ -162,6 +189,9 @@ class TaskQueueManager:
             
         Returns:
             The task ID
+            
+        Raises:
+            redis.RedisError: If the task could not be written
         """
         redis = await self.get_redis()
         
@@ -170,37 +200,20 @@ class TaskQueueManager:
         task.updated_at = task.created_at
         
         # Convert task to JSON
-        task_data = json.dumps(task.to_dict())
+        task_data = json_fast.dumps_bytes(task.to_dict())
         
         # Get the appropriate queue key
         queue_key = self._get_queue_key(task.task_type)
         task_key = self._get_task_key(task.task_id)
         
-        # Debug logs
-        logger.info(f"Task key: {task_key}")
-        logger.info(f"Queue key: {queue_key}")
-        
-        # Store the task data
-        await redis.set(task_key, task_data)
-        
-        # Before adding, check if the queue already has anything in it
-        existing_count = await redis.zcard(queue_key)
-        logger.info(f"Queue {queue_key} has {existing_count} tasks before adding new task")
-        
-        # Add to the appropriate queue with priority as score (lower = higher priority)
-        try:
-            # Use ZADD NX to prevent duplication
-            result = await redis.zadd(queue_key, {task.task_id: task.priority}, nx=True)
-            logger.info(f"Successfully added task {task.task_id} to queue {queue_key}, result: {result}")
-        
-            # Verify task was added
-            new_count = await redis.zcard(queue_key)
-            if new_count > existing_count:
-                logger.info(f"Task added successfully. Queue now has {new_count} tasks.")
-            else:
-                logger.warning(f"Task might not have been added! Queue size unchanged: {new_count}")
-        except Exception as e:
-            logger.error(f"Error adding task to queue: {str(e)}")
+        # Store the task data and enqueue it in one round trip; the MULTI/EXEC
+        # transaction means a task is never left stored but unqueued, and any
+        # Redis error propagates so the caller never gets an ID for a lost task.
+        # ZADD NX prevents duplication.
+        pipe = redis.pipeline(transaction=True)
+        pipe.set(task_key, task_data)
+        pipe.zadd(queue_key, {task.task_id: task.priority}, nx=True)
+        await pipe.execute()
         
         logger.info(f"Added task {task.task_id} to queue {task.task_type} with priority {task.priority}")
         
@@ -226,7 +239,7 @@ class TaskQueueManager:
             return None
         
         try:
-            task_dict = json.loads(task_data)
+            task_dict = json_fast.loads(task_data)
             task = Task.from_dict(task_dict)
             return task
         except Exception as e:
@@ -249,7 +262,7 @@ class TaskQueueManager:
         task.updated_at = datetime.utcnow().isoformat()
         
         # Convert task to JSON
-        task_data = json.dumps(task.to_dict())
+        task_data = json_fast.dumps_bytes(task.to_dict())
         
         task_key = self._get_task_key(task.task_id)
         
@@ -260,13 +273,38 @@ class TaskQueueManager:
         
         return True
     
-    async def get_next_task(self, task_types: List[str] = None, worker_id: str = "default") -> Optional[Task]:
+    async def _pop_task_id(self, redis: aioredis.Redis, queue_keys: List[str], wait: float) -> Optional[str]:
+        """
+        Pop the highest priority task ID from the given queues.
+        
+        Args:
+            redis: Redis connection
+            queue_keys: Queue keys to check, in order
+            wait: Seconds to block for a task when all queues are empty (0 returns immediately)
+            
+        Returns:
+            The task ID or None if no task was available
+        """
+        if wait > 0:
+            # BZPOPMIN returns as soon as a task is added, instead of waiting out a poll interval
+            popped = await redis.bzpopmin(queue_keys, timeout=wait)
+            return popped[1] if popped else None
+        
+        for queue_key in queue_keys:
+            # Get the task with the highest priority (lowest score)
+            result = await redis.zpopmin(queue_key, 1)
+            if result:
+                return result[0][0]
+        return None
+    
+    async def get_next_task(self, task_types: List[str] = None, worker_id: str = "default", wait: float = 0) -> Optional[Task]:
         """
         Get the next task from the queue based on priority.
         
         Args:
             task_types: List of task types to check, defaults to all types
             worker_id: Worker ID for tracking
+            wait: Seconds to block for a task when the queue is empty (0 returns immediately)
             
         Returns:
             The next task or None if no tasks are available
@@ -275,19 +313,16 @@ class TaskQueueManager:
         
         # Default to all task types if none specified
         if not task_types:
-            task_types = [TaskType.TRIAGE, TaskType.ANALYSIS, TaskType.ENHANCEMENT, TaskType.UPDATE]
+            task_types = [TaskType.WEBHOOK, TaskType.TRIAGE, TaskType.ANALYSIS, TaskType.ENHANCEMENT, TaskType.UPDATE]
         
-        # Check each queue in order of task type
-        for task_type in task_types:
-            queue_key = self._get_queue_key(task_type)
-            
-            # Get the task with the highest priority (lowest score)
-            result = await redis.zpopmin(queue_key, 1)
-            
-            if not result:
-                continue
-            
-            task_id, priority = result[0]
+        # Task types can share a queue, so check each queue key once
+        queue_keys = list(dict.fromkeys(self._get_queue_key(task_type) for task_type in task_types))
+        
+        while True:
+            task_id = await self._pop_task_id(redis, queue_keys, wait)
+            if task_id is None:
+                # No tasks found in any queue
+                return None
             
             # Get the task data
             task = await self.get_task(task_id)
@@ -304,12 +339,9 @@ class TaskQueueManager:
             processing_key = self._get_processing_key(worker_id)
             await redis.sadd(processing_key, task_id)
             
-            logger.info(f"Worker {worker_id} retrieved task {task_id} of type {task_type}")
+            logger.info(f"Worker {worker_id} retrieved task {task_id} of type {task.task_type}")
             
             return task
-        
-        # No tasks found in any queue
-        return None
     
     async def complete_task(self, task: Task, result: Dict[str, Any], worker_id: str = "default") -> bool:
         """
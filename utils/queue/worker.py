@@ -32,12 +32,13 @@ from context.workspace.workspace_context import WorkspaceContext, WorkflowType
 from utils.storage.local_storage import local_storage, get_trace_info
 
 # Import agent functions
+from api.webhook.handler import handle_webhook
 from shortcut_agents.triage.triage_agent import process_webhook
 from shortcut_agents.analysis.analysis_agent import create_analysis_agent
 from shortcut_agents.update.update_agent import create_update_agent
 
 # Import tools
-from tools.shortcut.shortcut_tools import get_story_details, add_comment, update_story
+from tools.shortcut.shortcut_tools import get_story_details, add_comment, update_story, close_http_session
 
 # Set up logging
 logger = logging.getLogger("task_worker")
@@ -63,7 +64,7 @@ class TaskWorker:
         
         Args:
             worker_id: Worker ID for tracking, defaults to hostname
-            polling_interval: Seconds between queue polls
+            polling_interval: Seconds to block waiting for a task before re-checking for shutdown
             shutdown_timeout: Seconds to wait for tasks to complete on shutdown
             task_types: List of task types to process, defaults to all
             config: Additional configuration options
@@ -75,6 +76,7 @@ class TaskWorker:
         self.polling_interval = polling_interval
         self.shutdown_timeout = shutdown_timeout
         self.task_types = task_types or [
+            TaskType.WEBHOOK,
             TaskType.TRIAGE,
             TaskType.ANALYSIS,
             TaskType.ENHANCEMENT,
@@ -163,6 +165,7 @@ class TaskWorker:
         finally:
             # Cleanup
             logger.info("Worker cleanup")
+            await close_http_session()
             await task_queue.close()
     
     async def stop(self):
@@ -188,22 +191,16 @@ class TaskWorker:
     
     async def _run_worker(self):
         """Main worker loop"""
-        logger.info(f"Worker {self.worker_id} running, polling interval: {self.polling_interval}s")
+        logger.info(f"Worker {self.worker_id} running, blocking dequeue timeout: {self.polling_interval}s")
         
         # Initialize Redis connection early to avoid event loop issues
-        redis = await task_queue.get_redis()
+        await task_queue.get_redis()
         logger.debug("Pre-initialized Redis connection for worker")
         
         while self.running:
             try:
-                # Debug: First check if there are any tasks in the queue
-                redis = await task_queue.get_redis()
-                queue_key = task_queue._get_queue_key("pending")  # Just use pending directly
-                pending_count = await redis.zcard(queue_key)
-                logger.info(f"Queue {queue_key} has {pending_count} tasks pending")
-                
-                # Get the next task
-                task = await task_queue.get_next_task(self.task_types, self.worker_id)
+                # Block until a task arrives; the timeout only bounds how long shutdown waits
+                task = await task_queue.get_next_task(self.task_types, self.worker_id, wait=self.polling_interval)
                 
                 if task:
                     # Process the task inline instead of creating a new task
@@ -215,9 +212,7 @@ class TaskWorker:
                     finally:
                         self.active_tasks.discard(task.task_id)
                 else:
-                    # No tasks available, wait before polling again
-                    logger.debug(f"No tasks available, waiting {self.polling_interval}s...")
-                    await asyncio.sleep(self.polling_interval)
+                    logger.debug(f"No tasks arrived within {self.polling_interval}s")
             
             except Exception as e:
                 logger.error(f"Error in worker loop: {str(e)}")
@@ -237,6 +232,12 @@ class TaskWorker:
         
         # Process the task with tracing if available
         try:
+            # Queued webhooks run the full webhook pipeline, which opens its own trace
+            if task.task_type == TaskType.WEBHOOK:
+                result = await self._process_webhook_task(task)
+                await self._complete_task(task, result)
+                return
+            
             # Get saved trace info if available for cross-process correlation
             trace_info = get_trace_info(task.workspace_id, task.story_id)
             
@@ -291,27 +292,7 @@ class TaskWorker:
                 else:
                     raise ValueError(f"Unsupported task type: {task.task_type}")
                 
-                # For simplicity, convert any non-dict results to dict
-                if not isinstance(result, dict):
-                    if hasattr(result, "model_dump") and callable(getattr(result, "model_dump")):
-                        result = result.model_dump() 
-                    elif hasattr(result, "dict") and callable(getattr(result, "dict")):
-                        result = result.dict()
-                    else:
-                        result = {"result": str(result)}
-                
-                # Add task completion metadata
-                result["completed_at"] = datetime.utcnow().isoformat()
-                result["worker_id"] = self.worker_id
-                
-                try:
-                    # Mark the task as completed
-                    await task_queue.complete_task(task, result, self.worker_id)
-                    self.stats["tasks_succeeded"] += 1
-                    logger.info(f"Task {task.task_id} completed successfully")
-                except Exception as completion_error:
-                    logger.error(f"Error marking task {task.task_id} as complete: {str(completion_error)}")
-                    # Continue since the task was processed
+                await self._complete_task(task, result)
         except Exception as e:
             logger.error(f"Error processing task {task.task_id}: {str(e)}")
             traceback.print_exc()
@@ -324,6 +305,60 @@ class TaskWorker:
                 logger.error(f"Error marking task {task.task_id} as failed: {str(fail_error)}")
                 # Continue execution
     
+    async def _complete_task(self, task: Task, result: Any):
+        """
+        Record a task's result and mark it as completed.
+        
+        Args:
+            task: The processed task
+            result: The processing result
+        """
+        # For simplicity, convert any non-dict results to dict
+        if not isinstance(result, dict):
+            if hasattr(result, "model_dump") and callable(getattr(result, "model_dump")):
+                result = result.model_dump() 
+            elif hasattr(result, "dict") and callable(getattr(result, "dict")):
+                result = result.dict()
+            else:
+                result = {"result": str(result)}
+        
+        # Add task completion metadata
+        result["completed_at"] = datetime.utcnow().isoformat()
+        result["worker_id"] = self.worker_id
+        
+        try:
+            # Mark the task as completed
+            await task_queue.complete_task(task, result, self.worker_id)
+            self.stats["tasks_succeeded"] += 1
+            logger.info(f"Task {task.task_id} completed successfully")
+        except Exception as completion_error:
+            logger.error(f"Error marking task {task.task_id} as complete: {str(completion_error)}")
+            # Continue since the task was processed
+    
+    async def _process_webhook_task(self, task: Task) -> Dict[str, Any]:
+        """
+        Process a webhook queued by the webhook endpoint.
+        
+        Args:
+            task: The webhook task
+            
+        Returns:
+            The webhook handler result
+        """
+        payload = task.payload
+        received_at = payload.get("received_at")
+        if received_at:
+            logger.info(f"Webhook task {task.task_id} waited {(time.time() - received_at) * 1000:.0f}ms in queue")
+        
+        # Triage runs here; queueing a separate triage task would add another queue hop
+        return await handle_webhook(
+            workspace_id=task.workspace_id,
+            webhook_data=payload.get("webhook_data", {}),
+            request_path=payload.get("request_path", ""),
+            client_ip=payload.get("client_ip", ""),
+            process_inline=True
+        )
+    
     def _create_context_from_task(self, task: Task) -> WorkspaceContext:
         """
         Create a workspace context from a task.
@@ -402,8 +437,7 @@ class TaskWorker:
         
         try:
             # First try to import the new triage agent
-            from shortcut_agents.triage.triage_agent import create_triage_agent, process_webhook
-            agent = create_triage_agent()
+            from shortcut_agents.triage.triage_agent import process_webhook
             
             # Check if webhook_data contains a nested 'data' field (common in webhook logs)
             if "data" in webhook_data and isinstance(webhook_data["data"], dict):
@@ -934,7 +968,7 @@ async def run_worker(worker_id: str = None, polling_interval: float = 1.0):
     
     Args:
         worker_id: Worker ID for tracking
-        polling_interval: Seconds between queue polls
+        polling_interval: Seconds to block waiting for a task before re-checking for shutdown
     """
     worker = TaskWorker(worker_id=worker_id, polling_interval=polling_interval)
     
@@ -951,7 +985,7 @@ def main():
     
     parser = argparse.ArgumentParser(description="Task Worker for Shortcut Enhancement System")
     parser.add_argument("--worker-id", help="Worker ID for tracking")
-    parser.add_argument("--polling-interval", type=float, default=1.0, help="Seconds between queue polls")
+    parser.add_argument("--polling-interval", type=float, default=1.0, help="Seconds to block waiting for a task before re-checking for shutdown")
     parser.add_argument("--task-types", help="Comma-separated list of task types to process")
     
     args = parser.parse_args()
@@ -8,7 +8,6 @@ import logging
 from typing import Dict, Any, Optional
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("local_storage")
 
 class LocalStorage:
@@ -31,7 +30,8 @@ class LocalStorage:
         
         # Log the saved task for debugging
         logger.info(f"Saved task: {task_key}")
-        logger.debug(f"Task data: {json.dumps(task_data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Task data: {json.dumps(task_data, indent=2)}")
         
         return task_key
     
@@ -57,7 +57,8 @@ class LocalStorage:
             # Update the existing task
             self.storage[task_key].update(task_data)
             logger.info(f"Updated task: {task_key}")
-            logger.debug(f"Updated task data: {json.dumps(self.storage[task_key], indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Updated task data: {json.dumps(self.storage[task_key], indent=2)}")
             return self.storage[task_key]
         else:
             logger.warning(f"Tried to update non-existent task: {task_key}")
@@ -93,6 +94,9 @@ def save_trace_info(workspace_id: str, story_id: str, trace_data: Dict[str, Any]
     """
     Save trace information for cross-process correlation.
     
+    This is a plain in-memory dict store and does no I/O, so it is safe to
+    call inline from async handlers.
+    
     Args:
         workspace_id: The workspace ID
         story_id: The story ID
@@ -100,7 +104,7 @@ def save_trace_info(workspace_id: str, story_id: str, trace_data: Dict[str, Any]
     """
     key = f"trace:{workspace_id}:{story_id}"
     local_storage.data[key] = trace_data
-    logger.info(f"Saved trace info: {key}")
+    logger.info("Saved trace info: %s", key)
 
 def get_trace_info(workspace_id: str, story_id: str) -> Dict[str, Any]:
     """
@@ -116,9 +120,9 @@ def get_trace_info(workspace_id: str, story_id: str) -> Dict[str, Any]:
     key = f"trace:{workspace_id}:{story_id}"
     trace_info = local_storage.data.get(key, {})
     if trace_info:
-        logger.info(f"Retrieved trace info: {key}")
+        logger.info("Retrieved trace info: %s", key)
     else:
-        logger.debug(f"Trace info not found: {key}")
+        logger.debug("Trace info not found: %s", key)
     return trace_info
 
 # Create a singleton instance for use throughout the application